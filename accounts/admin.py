@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group  # Importiere das Group-Modell
-from .models import User, Review  # Importiere das Review-Modell
+from .models import User, Review, BusinessStats  # Importiere das Review-Modell
 
 # Deregistriere das Group-Modell, um es aus dem Admin zu entfernen
 admin.site.unregister(Group)
@@ -56,6 +56,23 @@ class ReviewAdmin(admin.ModelAdmin):
         return obj.description or "Keine Beschreibung"
     get_description.short_description = "Description"
 
+class BusinessStatsAdmin(admin.ModelAdmin):
+    """
+    Admin-Klasse für die Business-Statistiken.
+    - Nur lesend, die Werte werden über Signale bzw. `rebuild_business_stats` gepflegt.
+    """
+    model = BusinessStats
+    list_display = ('business_user', 'in_progress_order_count', 'completed_order_count', 'review_count', 'average_rating', 'offer_count')
+    ordering = ('-avg_rating',)
+    search_fields = ('business_user__username',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 # Registriere die Modelle im Admin
 admin.site.register(User, UserAdmin)
 admin.site.register(Review, ReviewAdmin)
+admin.site.register(BusinessStats, BusinessStatsAdmin)
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Avg, Count
+from backend.db_router import primary_reads
+from offers.models import Offer
+from .models import Review
+
+BASE_INFO_CACHE_KEY = 'base-info:data'
+BASE_INFO_VERSION_KEY = 'base-info:version'
+BASE_INFO_LOCK_KEY = 'base-info:lock'
+
+# Upper bound for a single recomputation; a crashed worker releases the lock after this.
+LOCK_TIMEOUT = 10
+# How long a request waits on a cold cache for another worker's recomputation.
+COLD_WAIT_SECONDS = 0.5
+COLD_WAIT_STEP = 0.05
+
+
+def get_cache_timeout():
+    """
+    Returns the TTL of the cached statistics in seconds.
+    """
+    return getattr(settings, 'BASE_INFO_CACHE_TIMEOUT', 60)
+
+
+def compute_base_info():
+    """
+    Computes the general statistics from the database.
+    """
+    reviews = Review.objects.aggregate(review_count=Count('id'), average_rating=Avg('rating'))
+    return {
+        "review_count": reviews['review_count'],
+        "average_rating": round(reviews['average_rating'] or 0, 1),
+        "business_profile_count": get_user_model().objects.filter(type='business').count(),
+        "offer_count": Offer.objects.count(),
+    }
+
+
+async def acompute_base_info():
+    """
+    Async `compute_base_info()`, issuing the three queries with `asyncio.gather`.
+    - The queries overlap as far as the database driver allows; Django's
+      async ORM currently runs them on the request's database thread.
+    """
+    reviews, business_profile_count, offer_count = await asyncio.gather(
+        Review.objects.aaggregate(review_count=Count('id'), average_rating=Avg('rating')),
+        get_user_model().objects.filter(type='business').acount(),
+        Offer.objects.acount(),
+    )
+    return {
+        "review_count": reviews['review_count'],
+        "average_rating": round(reviews['average_rating'] or 0, 1),
+        "business_profile_count": business_profile_count,
+        "offer_count": offer_count,
+    }
+
+
+def build_entry(data, version):
+    """
+    Returns the cache entry of the statistics together with their ETag.
+    """
+    return {
+        'data': data,
+        'etag': '"%s"' % hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest(),
+        'version': version,
+        'expires_at': time.time() + get_cache_timeout(),
+    }
+
+
+def refresh_base_info(version):
+    """
+    Recomputes the statistics and stores them together with their ETag.
+    - Reads from the primary, a lagging replica would store outdated
+      statistics under the current version.
+    """
+    with primary_reads():
+        entry = build_entry(compute_base_info(), version)
+    # Kept past its TTL so other workers can serve it while one worker refreshes.
+    cache.set(BASE_INFO_CACHE_KEY, entry, get_cache_timeout() * 2)
+    return entry
+
+
+async def arefresh_base_info(version):
+    """
+    Async `refresh_base_info()`.
+    """
+    with primary_reads():
+        entry = build_entry(await acompute_base_info(), version)
+    await cache.aset(BASE_INFO_CACHE_KEY, entry, get_cache_timeout() * 2)
+    return entry
+
+
+def get_base_info():
+    """
+    Returns the cached statistics entry with `data` and `etag`.
+    - Only the worker holding the lock recomputes an expired or invalidated entry.
+    - Other workers serve the stale entry meanwhile, or briefly wait on a cold cache.
+    """
+    cached = cache.get_many([BASE_INFO_CACHE_KEY, BASE_INFO_VERSION_KEY])
+    entry = cached.get(BASE_INFO_CACHE_KEY)
+    version = cached.get(BASE_INFO_VERSION_KEY, 0)
+
+    if entry and entry['version'] == version and entry['expires_at'] > time.time():
+        return entry
+
+    if cache.add(BASE_INFO_LOCK_KEY, True, LOCK_TIMEOUT):
+        try:
+            return refresh_base_info(version)
+        finally:
+            cache.delete(BASE_INFO_LOCK_KEY)
+
+    if entry:
+        return entry
+
+    waited = 0
+    while waited < COLD_WAIT_SECONDS:
+        time.sleep(COLD_WAIT_STEP)
+        waited += COLD_WAIT_STEP
+        entry = cache.get(BASE_INFO_CACHE_KEY)
+        if entry:
+            return entry
+    return refresh_base_info(version)
+
+
+async def aget_base_info():
+    """
+    Async `get_base_info()`, with the same locking and stale-serving rules.
+    """
+    cached = await cache.aget_many([BASE_INFO_CACHE_KEY, BASE_INFO_VERSION_KEY])
+    entry = cached.get(BASE_INFO_CACHE_KEY)
+    version = cached.get(BASE_INFO_VERSION_KEY, 0)
+
+    if entry and entry['version'] == version and entry['expires_at'] > time.time():
+        return entry
+
+    if await cache.aadd(BASE_INFO_LOCK_KEY, True, LOCK_TIMEOUT):
+        try:
+            return await arefresh_base_info(version)
+        finally:
+            await cache.adelete(BASE_INFO_LOCK_KEY)
+
+    if entry:
+        return entry
+
+    waited = 0
+    while waited < COLD_WAIT_SECONDS:
+        await asyncio.sleep(COLD_WAIT_STEP)
+        waited += COLD_WAIT_STEP
+        entry = await cache.aget(BASE_INFO_CACHE_KEY)
+        if entry:
+            return entry
+    return await arefresh_base_info(version)
+
+
+def invalidate_base_info():
+    """
+    Marks the cached statistics as outdated.
+    """
+    try:
+        cache.incr(BASE_INFO_VERSION_KEY)
+    except ValueError:
+        cache.set(BASE_INFO_VERSION_KEY, 1, None)
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import BusinessStats
+from accounts.stats import compute_stats, rebuild_stats
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the denormalized business statistics from the source tables.
+    - With --check, only reports rows that drifted from the source tables.
+    """
+    help = "Rebuilds BusinessStats from orders, reviews and offers and reports drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Only report drift, don't write anything.")
+
+    def handle(self, *args, **options):
+        computed = compute_stats()
+        stored = {stats.pk: stats for stats in BusinessStats.objects.all()}
+
+        drifted = []
+        for user_id, values in computed.items():
+            stats = stored.get(user_id)
+            if stats is None:
+                continue
+            differences = {
+                field: (getattr(stats, field), value)
+                for field, value in values.items() if getattr(stats, field) != value
+            }
+            if differences:
+                drifted.append(user_id)
+                details = ', '.join(f"{field}: {old} != {new}" for field, (old, new) in differences.items())
+                self.stdout.write(f"Drift for business user {user_id}: {details}")
+
+        missing = set(computed) - set(stored)
+        if missing:
+            self.stdout.write(f"{len(missing)} business user(s) without statistics row.")
+
+        if options['check']:
+            if drifted:
+                raise CommandError(f"{len(drifted)} statistics row(s) drifted.")
+            self.stdout.write(self.style.SUCCESS("No drift detected."))
+            return
+
+        count = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {count} statistics row(s), {len(drifted)} had drifted."
+        ))
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from accounts.stats import compute_stats
+
+# Counters of BusinessStats at this migration
+FIELDS = ('in_progress_order_count', 'completed_order_count', 'review_count', 'rating_sum', 'offer_count')
+
+
+def backfill_business_stats(apps, schema_editor):
+    """
+    Creates the statistics rows of the existing users from the source tables.
+    - Later writes only adjust existing rows, so every business needs one.
+    """
+    BusinessStats = apps.get_model('accounts', 'BusinessStats')
+    computed = compute_stats(app_registry=apps, fields=FIELDS)
+    BusinessStats.objects.bulk_create(
+        [BusinessStats(business_user_id=user_id, **values) for user_id, values in computed.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_rename_comment_review_description_remove_review_user_and_more'),
+        ('offers', '0001_initial'),
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='business_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress_order_count', models.PositiveIntegerField(default=0)),
+                ('completed_order_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('offer_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_business_stats, migrations.RunPython.noop),
+    ]
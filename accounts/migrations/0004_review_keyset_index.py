@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_businessstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-updated_at', '-id'], name='review_updated_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='file_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
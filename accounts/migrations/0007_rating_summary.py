@@ -0,0 +1,74 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:08
+
+from django.db import migrations, models
+from accounts.stats import RATING_FIELDS, compute_stats
+
+# Counters of BusinessStats at this migration
+FIELDS = (
+    'in_progress_order_count', 'completed_order_count', 'review_count', 'rating_sum', 'offer_count',
+    *RATING_FIELDS.values(),
+)
+
+
+def backfill_rating_summary(apps, schema_editor):
+    """
+    Computes the rating summary of every business from the source tables.
+    - Also creates the rows of businesses without one yet: the offer list
+      joins the row, a missing one shows no ratings and sorts last.
+    """
+    BusinessStats = apps.get_model('accounts', 'BusinessStats')
+    computed = compute_stats(app_registry=apps, fields=FIELDS)
+    existing = set(BusinessStats.objects.values_list('pk', flat=True))
+    rows = []
+    for user_id, values in computed.items():
+        values['avg_rating'] = values['rating_sum'] / values['review_count'] if values['review_count'] else 0
+        rows.append(BusinessStats(business_user_id=user_id, **values))
+    BusinessStats.objects.bulk_update(
+        [row for row in rows if row.pk in existing], [*FIELDS, 'avg_rating'], batch_size=1000,
+    )
+    BusinessStats.objects.bulk_create([row for row in rows if row.pk not in existing], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_user_file_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessstats',
+            name='avg_rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessstats',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessstats',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessstats',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessstats',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='businessstats',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='businessstats',
+            index=models.Index(fields=['-avg_rating'], name='stats_avg_rating_idx'),
+        ),
+        migrations.RunPython(backfill_rating_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:12
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def remove_duplicate_reviews(apps, schema_editor):
+    """
+    Keeps the latest review per business profile and reviewer, so the constraint can be created.
+    - Recomputes the review counters of the affected business users, as
+      deletes in migrations don't run the statistics signals.
+    """
+    Review = apps.get_model('accounts', 'Review')
+    BusinessStats = apps.get_model('accounts', 'BusinessStats')
+
+    duplicates = (
+        Review.objects.filter(business_user__isnull=False, reviewer__isnull=False)
+        .values('business_user', 'reviewer').annotate(count=Count('id'), keep=Max('id')).filter(count__gt=1)
+    )
+    business_ids = set()
+    for row in duplicates:
+        Review.objects.filter(business_user=row['business_user'], reviewer=row['reviewer']).exclude(
+            pk=row['keep']
+        ).delete()
+        business_ids.add(row['business_user'])
+
+    for business_id in business_ids:
+        values = Review.objects.filter(business_user=business_id).aggregate(
+            review_count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{f'rating_{rating}_count': Count('id', filter=Q(rating=rating)) for rating in range(1, 6)},
+        )
+        values['rating_sum'] = values['rating_sum'] or 0
+        values['avg_rating'] = values['rating_sum'] / values['review_count'] if values['review_count'] else 0
+        BusinessStats.objects.filter(pk=business_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_rating_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('business_user', 'reviewer'), name='review_business_reviewer_unique'),
+        ),
+    ]
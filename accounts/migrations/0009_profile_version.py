@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_review_unique_reviewer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessstats',
+            name='rating_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
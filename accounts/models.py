@@ -11,11 +11,23 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES, default='customer')
     file = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    # Rendition name -> storage name, filled by `backend.images`
+    file_renditions = models.JSONField(default=dict, blank=True)
     location = models.CharField(max_length=255, blank=True, null=True)
     tel = models.CharField(max_length=20, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
     working_hours = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Version of the profile for conditional requests, see `backend.conditional`
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Profile lists by type
+            models.Index(fields=['type'], name='user_type_idx'),
+            # Business profile count
+            models.Index(fields=['id'], condition=models.Q(type='business'), name='user_business_idx'),
+        ]
 
     def __str__(self):
         return self.username
@@ -44,5 +56,58 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination
+            models.Index(fields=['-updated_at', '-id'], name='review_updated_id_idx'),
+            # Reviews of a business user, latest first
+            models.Index(fields=['business_user', '-updated_at'], name='review_business_updated_idx'),
+        ]
+        constraints = [
+            # One review per business profile and reviewer
+            models.UniqueConstraint(fields=['business_user', 'reviewer'], name='review_business_reviewer_unique'),
+        ]
+
     def __str__(self):
-        return f"Review by {self.reviewer} for {self.business_user}"
\ No newline at end of file
+        return f"Review by {self.reviewer} for {self.business_user}"
+
+
+class BusinessStats(models.Model):
+    """
+    Denormalized statistics of a business profile.
+    - Kept current incrementally by the signal handlers in `accounts.signals`.
+    - Can be rebuilt from scratch with `manage.py rebuild_business_stats`.
+    """
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='business_stats',
+        primary_key=True
+    )
+    in_progress_order_count = models.PositiveIntegerField(default=0)
+    completed_order_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    # Reviews per star rating
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    # rating_sum / review_count, stored so offers and profiles can be sorted by it
+    avg_rating = models.FloatField(default=0)
+    # Last change of the rating summary, part of the profile version
+    rating_updated_at = models.DateTimeField(null=True, blank=True)
+    offer_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-avg_rating'], name='stats_avg_rating_idx'),
+        ]
+
+    def __str__(self):
+        return f"Stats for {self.business_user_id}"
+
+    @property
+    def average_rating(self):
+        return round(self.avg_rating, 1)
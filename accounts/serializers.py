@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
+from backend.compiled_serializers import CompiledSerializer
+from backend.images import RenditionImageField, rendition_url
 from .models import Review
+from .stats import rating_summary
 
 User = get_user_model()
 
@@ -76,14 +79,16 @@ class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for user management.
     - Used to display and update user details.
+    - Business profiles include their rating summary, customers get null.
     """
     user = serializers.IntegerField(source='id', read_only=True) 
+    rating_summary = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = [
             'user', 'username', 'first_name', 'last_name', 'file', 'location',
-            'tel', 'description', 'working_hours', 'type', 'email', 'created_at'
+            'tel', 'description', 'working_hours', 'type', 'email', 'created_at', 'rating_summary'
         ]
         read_only_fields = ['pk', 'username', 'created_at']
         extra_kwargs = {
@@ -96,14 +101,35 @@ class UserSerializer(serializers.ModelSerializer):
             'working_hours': {'required': False, 'allow_null': True, 'default': 'no_working_hours'},
         }
 
+    def get_rating_summary(self, obj):
+        """
+        Returns the average rating, review count and 1-5 star histogram of a business user.
+        - Read from the precomputed statistics row, see `accounts.stats`.
+        """
+        if obj.type != 'business':
+            return None
+        return rating_summary(getattr(obj, 'business_stats', None))
+
+
+# Profile list values for null columns
+PROFILE_DEFAULTS = {
+    'file': 'no_file',
+    'location': 'no_address',
+    'tel': 'no_phone_number',
+    'description': 'no_description',
+    'working_hours': 'no_working_hours',
+}
+
 
 class ProfileListSerializer(serializers.ModelSerializer):
     """
     Serializer for listing user profiles.
     - Used to display basic information about users.
     - Includes nested user information.
+    - Returns the thumbnail rendition of the profile picture once it exists.
     """
     user = serializers.SerializerMethodField()  
+    file = RenditionImageField('file_renditions', default_size='thumbnail', read_only=True)
 
     class Meta:
         model = User
@@ -131,21 +157,66 @@ class ProfileListSerializer(serializers.ModelSerializer):
         - Sets default values for fields that are null.
         """
         representation = super().to_representation(instance)
+        for field, default in PROFILE_DEFAULTS.items():
+            if representation.get(field) is None:
+                representation[field] = default
+        return representation
 
-        representation['file'] = representation.get('file') if representation.get('file') is not None else 'no_file'
-        representation['location'] = representation.get('location') if representation.get('location') is not None else 'no_address'
-        representation['tel'] = representation.get('tel') if representation.get('tel') is not None else 'no_phone_number'
-        representation['description'] = representation.get('description') if representation.get('description') is not None else 'no_description'
-        representation['working_hours'] = representation.get('working_hours') if representation.get('working_hours') is not None else 'no_working_hours'
 
-        return representation
+class CompiledProfileListSerializer(CompiledSerializer):
+    """
+    Compiled `ProfileListSerializer` for the profile lists.
+    """
+    serializer_class = ProfileListSerializer
+    columns = (
+        'pk', 'username', 'first_name', 'last_name', 'file', 'file_renditions',
+        'location', 'tel', 'description', 'working_hours', 'type',
+    )
+
+    def compile(self, related):
+        file_field = self.fields['file']
+        storage = User._meta.get_field('file').storage
+        request = self.context.get('request')
+        size = file_field.get_size(request)
+        defaults = PROFILE_DEFAULTS
+
+        def build(row):
+            pk, username, first_name, last_name, file, renditions, location, tel, description, working_hours, user_type = row
+            return {
+                'user': {
+                    'pk': pk,
+                    'username': username or "Unknown",
+                    'first_name': first_name or "Unknown",
+                    'last_name': last_name or "Unknown",
+                },
+                'file': rendition_url(storage, file, renditions, size, request) if file else defaults['file'],
+                'location': defaults['location'] if location is None else location,
+                'tel': defaults['tel'] if tel is None else tel,
+                'description': defaults['description'] if description is None else description,
+                'working_hours': defaults['working_hours'] if working_hours is None else working_hours,
+                'type': user_type,
+            }
+        return build
 
 
 class ReviewSerializer(serializers.ModelSerializer):
     """
     Serializer for managing reviews.
     - Supports creating and displaying reviews.
+    - Only business users can be reviewed; the check is part of the lookup
+      of the business user, so it costs no extra query.
+    - One review per business profile and reviewer is enforced by the
+      database constraint when saving, see `ReviewViewSet`.
     """
+    business_user = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.filter(type='business').only('pk'),
+        allow_null=True,
+        required=False,
+        error_messages={'does_not_exist': 'User "{pk_value}" is not a business profile.'},
+    )
+
     class Meta:
         model = Review
         fields = '__all__'
+        # Uniqueness is left to the constraint instead of a validator query
+        validators = []
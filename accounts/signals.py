@@ -0,0 +1,176 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from rest_framework.authtoken.models import Token
+from backend.authentication import invalidate_token, invalidate_user_tokens
+from backend.images import renditions_ready, track_renditions
+from backend.response_cache import invalidate_tags
+from offers.models import Offer
+from orders.models import Order
+from .base_info import invalidate_base_info
+from .models import Review, User
+from .stats import ORDER_STATUS_FIELDS, RATING_FIELDS, adjust_stats
+
+
+def order_contribution(order):
+    """
+    Returns the business user and counters an order contributes to.
+    """
+    field = ORDER_STATUS_FIELDS.get(order.__dict__.get('status'))
+    return order.__dict__.get('business_user_id'), ({field: 1} if field else {})
+
+
+def review_contribution(review):
+    """
+    Returns the business user and counters a review contributes to.
+    """
+    rating = int(review.__dict__.get('rating') or 0)
+    counts = {'review_count': 1, 'rating_sum': rating}
+    if rating in RATING_FIELDS:
+        counts[RATING_FIELDS[rating]] = 1
+    return review.__dict__.get('business_user_id'), counts
+
+
+def offer_contribution(offer):
+    """
+    Returns the business user and counters an offer contributes to.
+    """
+    return offer.__dict__.get('user_id'), {'offer_count': 1}
+
+
+def remember_contribution(sender, instance, **kwargs):
+    """
+    Stores the loaded state so later saves and deletes can compute deltas.
+    """
+    instance._stats_contribution = CONTRIBUTIONS[sender](instance)
+
+
+def apply_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Moves the counters from the previous state of the instance to the new one.
+    """
+    if raw:
+        return
+    new_user, new_counts = CONTRIBUTIONS[sender](instance)
+    old_user, old_counts = (None, {}) if created else instance._stats_contribution
+
+    if old_user == new_user:
+        fields = set(old_counts) | set(new_counts)
+        adjust_stats(new_user, {f: new_counts.get(f, 0) - old_counts.get(f, 0) for f in fields})
+    else:
+        adjust_stats(old_user, {f: -value for f, value in old_counts.items()}, create=False)
+        adjust_stats(new_user, new_counts)
+    instance._stats_contribution = (new_user, new_counts)
+
+
+def apply_delete(sender, instance, **kwargs):
+    """
+    Removes the counters of a deleted instance.
+    - Never creates rows, so cascading user deletes don't resurrect them.
+    """
+    old_user, old_counts = instance._stats_contribution
+    adjust_stats(old_user, {f: -value for f, value in old_counts.items()}, create=False)
+
+
+CONTRIBUTIONS = {
+    Order: order_contribution,
+    Review: review_contribution,
+    Offer: offer_contribution,
+}
+
+for model in CONTRIBUTIONS:
+    post_init.connect(remember_contribution, sender=model, dispatch_uid=f'stats_init_{model.__name__}')
+    post_save.connect(apply_save, sender=model, dispatch_uid=f'stats_save_{model.__name__}')
+    post_delete.connect(apply_delete, sender=model, dispatch_uid=f'stats_delete_{model.__name__}')
+
+
+def invalidate_base_info_on_write(sender, signal, instance, created=False, update_fields=None, **kwargs):
+    """
+    Invalidates the cached /api/base-info/ statistics once the write is committed.
+    - Ignores user saves that can't change the business profile count (e.g. last_login).
+    - Ignores offer updates, only creating or deleting changes the offer count.
+    """
+    if signal is post_save and not created:
+        if sender is Offer:
+            return
+        if sender is User and update_fields is not None and 'type' not in update_fields:
+            return
+    transaction.on_commit(invalidate_base_info)
+
+
+for model in (Review, User, Offer):
+    post_save.connect(invalidate_base_info_on_write, sender=model, dispatch_uid=f'base_info_save_{model.__name__}')
+    post_delete.connect(invalidate_base_info_on_write, sender=model, dispatch_uid=f'base_info_delete_{model.__name__}')
+
+
+track_renditions(User, 'file', 'file_renditions')
+
+
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Drops a deleted token from the authentication cache.
+    """
+    invalidate_token(instance.key)
+
+
+# User fields the cached authentication of a token depends on
+AUTH_FIELDS = {'is_active', 'is_staff', 'is_superuser', 'password', 'type'}
+
+
+def invalidate_changed_user_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Drops the cached tokens of a user whose permissions or credentials may have changed.
+    """
+    if created or (update_fields is not None and not AUTH_FIELDS & set(update_fields)):
+        return
+    invalidate_user_tokens(instance.pk)
+
+
+post_delete.connect(invalidate_deleted_token, sender=Token, dispatch_uid='token_auth_token_deleted')
+post_save.connect(invalidate_changed_user_tokens, sender=User, dispatch_uid='token_auth_user_saved')
+
+
+def invalidate_user_responses(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Invalidates cached responses showing the user, e.g. the profile and their offers.
+    - Ignores saves that only record a login.
+    """
+    if raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    invalidate_tags(f'user:{instance.pk}')
+
+
+def invalidate_user_renditions(sender, pk, **kwargs):
+    invalidate_tags(f'user:{pk}')
+
+
+def remember_review_business(sender, instance, **kwargs):
+    """
+    Stores the business the review belonged to before the write.
+    - Read before `apply_save` replaces the loaded contribution with the new one.
+    """
+    instance._previous_business_user_id = instance._stats_contribution[0]
+
+
+def invalidate_review_responses(sender, instance, raw=False, **kwargs):
+    """
+    Invalidates the cached review lists containing the review, before and after the write.
+    - Also invalidates the responses showing the rating summary of the
+      business, i.e. its profile and offers, and the lists sorted by rating.
+    """
+    if not raw:
+        business_ids = {instance.business_user_id, instance._previous_business_user_id}
+        invalidate_tags(
+            'reviews',
+            'ratings',
+            *(f'business:{business_id}' for business_id in business_ids),
+            *(f'user:{business_id}' for business_id in business_ids if business_id is not None),
+        )
+
+
+post_save.connect(invalidate_user_responses, sender=User, dispatch_uid='response_cache_user_saved')
+post_delete.connect(invalidate_user_responses, sender=User, dispatch_uid='response_cache_user_deleted')
+pre_save.connect(remember_review_business, sender=Review, dispatch_uid='response_cache_review_saving')
+pre_delete.connect(remember_review_business, sender=Review, dispatch_uid='response_cache_review_deleting')
+post_save.connect(invalidate_review_responses, sender=Review, dispatch_uid='response_cache_review_saved')
+post_delete.connect(invalidate_review_responses, sender=Review, dispatch_uid='response_cache_review_deleted')
+renditions_ready.connect(invalidate_user_renditions, sender=User, dispatch_uid='response_cache_user_renditions')
@@ -0,0 +1,180 @@
+from collections import defaultdict
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+from .models import BusinessStats, User
+
+RATINGS = range(1, 6)
+
+# Star rating -> counter of the rating histogram in BusinessStats
+RATING_FIELDS = {rating: f'rating_{rating}_count' for rating in RATINGS}
+
+# Columns of a statistics row read by `rating_summary_values()`
+RATING_SUMMARY_COLUMNS = ('avg_rating', 'review_count', *RATING_FIELDS.values())
+
+# Counters shown in the rating summary
+RATING_SUMMARY_FIELDS = {'review_count', 'rating_sum', *RATING_FIELDS.values()}
+
+STAT_FIELDS = (
+    'in_progress_order_count', 'completed_order_count', 'review_count', 'rating_sum', 'offer_count',
+    *RATING_FIELDS.values(),
+)
+
+# Order status -> counter in BusinessStats
+ORDER_STATUS_FIELDS = {
+    'in_progress': 'in_progress_order_count',
+    'completed': 'completed_order_count',
+}
+
+
+def compute_stats(business_user_ids=None, app_registry=apps, fields=STAT_FIELDS):
+    """
+    Computes business statistics from the source tables.
+    - Returns a dict mapping business user IDs to their counter values.
+    - Limited to the given user IDs, otherwise covers all business users
+      and every user referenced by an order, review or offer.
+    - Migrations pass their historical `app_registry` and the counters
+      their BusinessStats state has.
+    """
+    Order = app_registry.get_model('orders', 'Order')
+    Offer = app_registry.get_model('offers', 'Offer')
+    Review = app_registry.get_model('accounts', 'Review')
+    User = app_registry.get_model('accounts', 'User')
+    rating_fields = {rating: field for rating, field in RATING_FIELDS.items() if field in fields}
+
+    orders = Order.objects.all()
+    reviews = Review.objects.filter(business_user__isnull=False)
+    offers = Offer.objects.all()
+    users = User.objects.filter(type='business')
+    if business_user_ids is not None:
+        orders = orders.filter(business_user_id__in=business_user_ids)
+        reviews = reviews.filter(business_user_id__in=business_user_ids)
+        offers = offers.filter(user_id__in=business_user_ids)
+        users = User.objects.filter(pk__in=business_user_ids)
+
+    stats = defaultdict(lambda: dict.fromkeys(fields, 0))
+    for user_id in users.values_list('pk', flat=True):
+        stats[user_id]
+
+    order_counts = orders.values('business_user_id').annotate(
+        **{field: Count('id', filter=Q(status=status)) for status, field in ORDER_STATUS_FIELDS.items()}
+    )
+    for row in order_counts:
+        for field in ORDER_STATUS_FIELDS.values():
+            stats[row['business_user_id']][field] = row[field]
+
+    review_counts = reviews.values('business_user_id').annotate(
+        review_count=Count('id'),
+        rating_sum=Sum('rating'),
+        **{field: Count('id', filter=Q(rating=rating)) for rating, field in rating_fields.items()},
+    )
+    for row in review_counts:
+        stats[row['business_user_id']]['review_count'] = row['review_count']
+        stats[row['business_user_id']]['rating_sum'] = row['rating_sum'] or 0
+        for field in rating_fields.values():
+            stats[row['business_user_id']][field] = row[field]
+
+    for row in offers.values('user_id').annotate(offer_count=Count('id')):
+        stats[row['user_id']]['offer_count'] = row['offer_count']
+
+    return dict(stats)
+
+
+def rebuild_stats(business_user_ids=None):
+    """
+    Recomputes the statistics rows from scratch.
+    - Returns the number of rows written.
+    """
+    computed = compute_stats(business_user_ids)
+    for user_id, values in computed.items():
+        values['avg_rating'] = values['rating_sum'] / values['review_count'] if values['review_count'] else 0
+        values['rating_updated_at'] = timezone.now()
+        BusinessStats.objects.update_or_create(business_user_id=user_id, defaults=values)
+    return len(computed)
+
+
+def average_rating_expression(rating_sum_delta, review_count_delta):
+    """
+    Returns the average rating after applying the deltas, for the same UPDATE.
+    - Computed from the old column values plus the deltas, as the right-hand
+      side of an UPDATE reads the row before the update.
+    """
+    count = F('review_count') + review_count_delta
+    return Coalesce(
+        Cast(F('rating_sum') + rating_sum_delta, FloatField()) / NullIf(count, 0), Value(0.0),
+    )
+
+
+def adjust_stats(business_user_id, deltas, create=True):
+    """
+    Applies counter deltas to the statistics row of a business user.
+    - Uses F() expressions so concurrent writes don't lose updates.
+    - A missing row is rebuilt from the source tables when `create` is set,
+      which already reflects the write that triggered the adjustment.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if business_user_id is None or not deltas:
+        return
+    values = {field: F(field) + delta for field, delta in deltas.items()}
+    if 'rating_sum' in deltas or 'review_count' in deltas:
+        values['avg_rating'] = average_rating_expression(deltas.get('rating_sum', 0), deltas.get('review_count', 0))
+    if RATING_SUMMARY_FIELDS.intersection(deltas):
+        values['rating_updated_at'] = timezone.now()
+    updated = BusinessStats.objects.filter(pk=business_user_id).update(**values)
+    if not updated and create:
+        rebuild_stats([business_user_id])
+
+
+def get_business_stats(business_user_id):
+    """
+    Returns the statistics row of a user with a single primary-key lookup.
+    - Builds the row on first access.
+    - Returns None if the user does not exist.
+    """
+    stats = BusinessStats.objects.filter(pk=business_user_id).first()
+    if stats is None and User.objects.filter(pk=business_user_id).exists():
+        rebuild_stats([business_user_id])
+        stats = BusinessStats.objects.get(pk=business_user_id)
+    return stats
+
+
+
+async def aget_business_stats(business_user_id):
+    """
+    Async `get_business_stats()`; a missing row is built on the sync path.
+    """
+    stats = await BusinessStats.objects.filter(pk=business_user_id).afirst()
+    if stats is None:
+        stats = await sync_to_async(get_business_stats)(business_user_id)
+    return stats
+
+
+def rating_summary(stats):
+    """
+    Returns the rating summary of a business profile from its statistics row.
+    - `stats` may be None for businesses without a row yet.
+    """
+    if stats is None:
+        return {'average': 0, 'count': 0, 'histogram': {str(rating): 0 for rating in RATINGS}}
+    return {
+        'average': stats.average_rating,
+        'count': stats.review_count,
+        'histogram': {str(rating): getattr(stats, field) for rating, field in RATING_FIELDS.items()},
+    }
+
+
+def rating_summary_values(values):
+    """
+    `rating_summary()` from the RATING_SUMMARY_COLUMNS of a statistics row, e.g. read with values_list().
+    - All values are None for businesses without a row yet.
+    """
+    avg_rating, review_count, *histogram = values
+    if review_count is None:
+        return rating_summary(None)
+    return {
+        'average': round(avg_rating, 1),
+        'count': review_count,
+        'histogram': {str(rating): count for rating, count in zip(RATINGS, histogram)},
+    }
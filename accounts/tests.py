@@ -1,3 +1,620 @@
-from django.test import TestCase
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from backend.authentication import cache_key, local_cache
+from backend.response_cache import tag_key
+from offers.models import Offer, OfferDetail
+from orders.models import Order
+from .models import BusinessStats, Review, User
+from .stats import rating_summary, rebuild_stats
 
-# Create your tests here.
+
+class BusinessStatsTests(TestCase):
+    """
+    Ensures the denormalized business statistics follow order, review and offer writes.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=['Logo'], offer_type='basic',
+        )
+
+    def create_order(self, status='in_progress'):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=self.business, offer_detail=self.detail,
+            title="Basic", revisions=1, delivery_time_in_days=5, price=100,
+            features=['Logo'], offer_type='basic', status=status,
+        )
+
+    def stats(self):
+        return BusinessStats.objects.get(pk=self.business.pk)
+
+    def test_order_status_changes_move_counters(self):
+        order = self.create_order()
+        self.create_order()
+        self.assertEqual(self.stats().in_progress_order_count, 2)
+
+        order = Order.objects.get(pk=order.pk)
+        order.status = 'completed'
+        order.save()
+        stats = self.stats()
+        self.assertEqual((stats.in_progress_order_count, stats.completed_order_count), (1, 1))
+
+        order.delete()
+        self.assertEqual(self.stats().completed_order_count, 0)
+
+    def test_review_rating_updates_average(self):
+        review = Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4)
+        self.assertEqual(self.stats().average_rating, 4)
+
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 2
+        review.save()
+        stats = self.stats()
+        self.assertEqual((stats.review_count, stats.rating_sum), (1, 2))
+
+    def test_offer_count(self):
+        self.assertEqual(self.stats().offer_count, 1)
+        self.offer.delete()
+        self.assertEqual(self.stats().offer_count, 0)
+
+    def test_order_count_endpoints_use_single_lookup(self):
+        self.create_order()
+        self.create_order(status='completed')
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.data, {"order_count": 1})
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/completed-order-count/{self.business.pk}/')
+        self.assertEqual(response.data, {"completed_order_count": 1})
+        self.assertEqual(self.client.get('/api/order-count/9999/').status_code, 404)
+
+    def test_rebuild_command_detects_and_fixes_drift(self):
+        self.create_order()
+        BusinessStats.objects.filter(pk=self.business.pk).update(in_progress_order_count=5)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_business_stats', '--check', stdout=StringIO())
+        call_command('rebuild_business_stats', stdout=StringIO())
+        self.assertEqual(self.stats().in_progress_order_count, 1)
+        call_command('rebuild_business_stats', '--check', stdout=StringIO())
+
+
+class RatingSummaryTests(TestCase):
+    """
+    Ensures the per-business rating summary follows review writes and is exposed on profiles and offers.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.other_business = User.objects.create_user(
+            username='other', email='other@example.com', password='pass', type='business'
+        )
+        self.customers = [
+            User.objects.create_user(
+                username=f'customer{index}', email=f'customer{index}@example.com', password='pass', type='customer'
+            )
+            for index in range(3)
+        ]
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        self.other_offer = Offer.objects.create(user=self.other_business, title="Web", description="Web design")
+        cache.clear()
+
+    def review(self, customer, rating, business=None):
+        return Review.objects.create(business_user=business or self.business, reviewer=customer, rating=rating)
+
+    def summary(self):
+        return rating_summary(BusinessStats.objects.get(pk=self.business.pk))
+
+    def test_histogram_follows_creates_updates_and_deletes(self):
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 4)
+        review = self.review(self.customers[2], 2)
+        self.assertEqual(self.summary(), {
+            'average': 3.7, 'count': 3, 'histogram': {'1': 0, '2': 1, '3': 0, '4': 1, '5': 1},
+        })
+
+        self.client.force_authenticate(self.customers[2])
+        response = self.client.patch(f'/api/reviews/{review.pk}/', {'rating': 5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.summary()['histogram'], {'1': 0, '2': 0, '3': 0, '4': 1, '5': 2})
+        self.assertEqual(self.summary()['average'], 4.7)
+
+        Review.objects.get(pk=review.pk).delete()
+        self.assertEqual(self.summary(), {
+            'average': 4.5, 'count': 2, 'histogram': {'1': 0, '2': 0, '3': 0, '4': 1, '5': 1},
+        })
+        call_command('rebuild_business_stats', '--check', stdout=StringIO())
+
+    def test_profile_shows_summary(self):
+        self.client.force_authenticate(self.customers[0])
+        self.assertEqual(self.client.get(f'/api/profile/{self.business.pk}/').data['rating_summary']['count'], 0)
+        self.review(self.customers[0], 4)
+        response = self.client.get(f'/api/profile/{self.business.pk}/')
+        self.assertEqual(response.data['rating_summary']['average'], 4.0)
+        self.assertIsNone(self.client.get(f'/api/profile/{self.customers[0].pk}/').data['rating_summary'])
+
+    def test_offers_sort_by_average_rating(self):
+        self.review(self.customers[0], 3)
+        self.review(self.customers[1], 5, business=self.other_business)
+        response = self.client.get('/api/offers/?ordering=-avg_rating')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.other_offer.pk, self.offer.pk])
+        self.assertEqual(response.data['results'][0]['rating_summary']['average'], 5.0)
+        response = self.client.get('/api/offers/?ordering=avg_rating')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [self.offer.pk, self.other_offer.pk])
+
+
+class ReviewCreateTests(TestCase):
+    """
+    Ensures duplicate reviews are rejected by the unique constraint.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.other_business = User.objects.create_user(
+            username='other', email='other@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        self.client.force_authenticate(self.customer)
+
+    def post_review(self, business, rating=4):
+        return self.client.post('/api/reviews/', {'business_user': business.pk, 'rating': rating}, format='json')
+
+    def test_create(self):
+        response = self.post_review(self.business)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['business_user'], response.data['reviewer']), (self.business.pk, self.customer.pk))
+
+    def test_duplicate_review_is_rejected(self):
+        self.post_review(self.business)
+        response = self.post_review(self.business, rating=1)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"detail": ["You have already reviewed this business profile."]})
+        self.assertEqual(Review.objects.get().rating, 4)
+        self.assertEqual(BusinessStats.objects.get(pk=self.business.pk).review_count, 1)
+
+    def test_duplicate_by_update_is_rejected(self):
+        self.post_review(self.business)
+        review = Review.objects.get(pk=self.post_review(self.other_business).data['id'])
+        response = self.client.patch(f'/api/reviews/{review.pk}/', {'business_user': self.business.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Review.objects.get(pk=review.pk).business_user, self.other_business)
+
+    def test_only_business_users_can_be_reviewed(self):
+        other_customer = User.objects.create_user(
+            username='customer2', email='customer2@example.com', password='pass', type='customer'
+        )
+        response = self.post_review(other_customer)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('business_user', response.data['detail'])
+
+    def test_create_queries(self):
+        rebuild_stats([self.business.pk])
+        with self.assertNumQueries(5):
+            # Business user, savepoint, insert, statistics update, release; no duplicate check
+            self.post_review(self.business)
+
+
+class CompiledProfileListTests(TestCase):
+    """
+    Ensures the compiled profile lists produce the same JSON as the DRF serializer.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer',
+            first_name='Zoë', location='Zürich', tel='',
+        )
+        User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business',
+            file='profiles/logo.jpg', file_renditions={'thumbnail': 'profiles/renditions/logo_thumbnail.webp'},
+            description='Design', working_hours='9-17',
+        )
+        User.objects.create_user(
+            username='studio', email='studio@example.com', password='pass', type='business',
+            file='profiles/studio.png',
+        )
+        self.client.force_authenticate(self.customer)
+
+    def test_lists(self):
+        for url, count in (('/api/profiles/business/', 2), ('/api/profiles/customer/', 1)):
+            response = self.client.get(url)
+            with override_settings(COMPILED_LIST_SERIALIZERS=False):
+                expected = self.client.get(url)
+            self.assertEqual(response.content, expected.content)
+            self.assertEqual(len(response.data), count)
+
+        profile = self.client.get('/api/profiles/customer/').data[0]
+        self.assertEqual((profile['file'], profile['tel'], profile['description']), ('no_file', '', 'no_description'))
+
+
+class ProfileConditionalGetTests(TestCase):
+    """
+    Ensures profiles and profile lists answer conditional GETs with 304 until they change.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        self.client.force_authenticate(self.customer)
+        self.url = f'/api/profile/{self.business.pk}/'
+
+    def test_retrieve(self):
+        response = self.client.get(self.url)
+        self.assertIn('Last-Modified', response)
+        not_modified = self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+        self.business.location = 'Berlin'
+        self.business.save()
+        response = self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.data['location'], 'Berlin')
+
+    def test_new_review_changes_the_profile(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.post('/api/reviews/', {'business_user': self.business.pk, 'rating': 5}, format='json')
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rating_summary']['count'], 1)
+
+    def test_lists(self):
+        response = self.client.get('/api/profiles/business/')
+        self.assertTrue(response['ETag'].startswith('W/'))
+        not_modified = self.client.get('/api/profiles/business/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        customers = self.client.get('/api/profiles/customer/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(customers.status_code, 200)
+
+
+class BaseInfoCacheTests(TestCase):
+    """
+    Ensures /api/base-info/ is cached, invalidated on writes and supports conditional requests.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+
+    def test_cached_response_skips_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4)
+        response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['review_count'], 1)
+        self.assertEqual(response.data['business_profile_count'], 1)
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/base-info/')
+
+    def test_write_invalidates_cache(self):
+        self.client.get('/api/base-info/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5)
+        response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data['review_count'], 1)
+        self.assertEqual(response.data['average_rating'], 5)
+
+    def test_etag_returns_not_modified(self):
+        etag = self.client.get('/api/base-info/')['ETag']
+        response = self.client.get('/api/base-info/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """
+    Ensures authenticated requests skip the token query and see invalidations immediately.
+    """
+
+    def setUp(self):
+        local_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    @override_settings(RESPONSE_CACHE={'ENABLED': False})
+    def test_token_is_cached(self):
+        self.assertEqual(self.client.get('/api/reviews/').status_code, 200)
+        # Only the review query is left
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/reviews/').status_code, 200)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get('/api/reviews/')
+        self.token.delete()
+        self.assertEqual(self.client.get('/api/reviews/').status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/reviews/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/reviews/').status_code, 401)
+
+    def test_changed_permissions_are_applied(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass')
+        url = f'/api/profile/{other.pk}/'
+        self.assertEqual(self.client.patch(url, {'location': 'Berlin'}, format='json').status_code, 403)
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        self.assertEqual(self.client.patch(url, {'location': 'Berlin'}, format='json').status_code, 200)
+
+    @override_settings(TOKEN_AUTH_CACHE={'SHARED_CACHE': 'default'})
+    def test_password_hash_is_not_cached(self):
+        cache.clear()
+        self.client.get('/api/reviews/')
+        payload = cache.get(cache_key(self.token.key))
+        self.assertNotIn(self.user.password.encode(), payload)
+
+        response = self.client.get('/api/reviews/')
+        user = response.wsgi_request.user
+        self.assertEqual((user.pk, response.wsgi_request.auth.key), (self.user.pk, self.token.key))
+        self.assertEqual(user.get_deferred_fields(), {'password'})
+        # Never overwritten by saves of the cached user, read on access
+        user.first_name = 'Anna'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('pass'))
+        self.assertTrue(user.check_password('pass'))
+
+    @override_settings(TOKEN_AUTH_CACHE={'SHARED_CACHE': 'default'})
+    def test_shared_cache_replaces_local_cache(self):
+        cache.clear()
+        self.client.get('/api/reviews/')
+        key = cache_key(self.token.key)
+        self.assertIsNone(local_cache.get(key))
+        self.assertIsNotNone(cache.get(key))
+
+        # An invalidation by another worker only reaches the shared cache
+        cache.delete(key)
+        Token.objects.filter(pk=self.token.pk).delete()
+        self.assertEqual(self.client.get('/api/reviews/').status_code, 401)
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Ensures cached profile and review responses are invalidated by their tags.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        self.client.force_authenticate(self.customer)
+
+    def test_profile_is_cached_until_saved(self):
+        url = f'/api/profile/{self.business.pk}/'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        # Only the version of the profile, see `backend.conditional`
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.business.location = 'Berlin'
+        self.business.save()
+        response = self.client.get(url)
+        self.assertEqual((response['X-Cache'], response.data['location']), ('MISS', 'Berlin'))
+
+    def test_evicted_tag_counts_as_invalidated(self):
+        url = f'/api/reviews/?business_user_id={self.business.pk}'
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5)
+        # The cache evicts the tag holding the invalidation
+        cache.delete(tag_key(f'business:{self.business.pk}'))
+        response = self.client.get(url)
+        self.assertEqual((response['X-Cache'], len(response.data)), ('MISS', 1))
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    def test_review_list_is_invalidated_per_business(self):
+        other = User.objects.create_user(username='other', email='o@example.com', password='pass', type='business')
+        url = f'/api/reviews/?business_user_id={self.business.pk}'
+        self.client.get(url)
+        self.client.get(f'/api/reviews/?business_user_id={other.pk}')
+
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5, description="Top")
+        self.assertEqual(len(self.client.get(url).data), 1)
+        self.assertEqual(self.client.get(f'/api/reviews/?business_user_id={other.pk}')['X-Cache'], 'HIT')
+
+    def test_moved_review_invalidates_previous_business(self):
+        other = User.objects.create_user(username='other', email='o@example.com', password='pass', type='business')
+        review = Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5)
+        url = f'/api/reviews/?business_user_id={self.business.pk}'
+        self.assertEqual(len(self.client.get(url).data), 1)
+        self.client.get(f'/api/reviews/?business_user_id={other.pk}')
+
+        review.business_user = other
+        review.save()
+        response = self.client.get(url)
+        self.assertEqual((response['X-Cache'], response.data), ('MISS', []))
+        self.assertEqual(len(self.client.get(f'/api/reviews/?business_user_id={other.pk}').data), 1)
+
+    def test_cached_response_requires_authentication(self):
+        url = f'/api/profile/{self.business.pk}/'
+        self.client.get(url)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+
+class ReviewKeysetPaginationTests(TestCase):
+    """
+    Ensures cursor pages of reviews neither skip nor repeat reviews, also with equal update times.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        businesses = [
+            User.objects.create_user(username=f'business{index}', email=f'b{index}@example.com', password='pass', type='business')
+            for index in range(5)
+        ]
+        reviews = [Review.objects.create(business_user=business, reviewer=self.customer, rating=4) for business in businesses]
+        # Ties on the sort key are broken by the primary key
+        Review.objects.filter(pk__in=[review.pk for review in reviews[:3]]).update(updated_at=reviews[0].updated_at)
+        self.client.force_authenticate(self.customer)
+
+    def walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [review['id'] for review in response.data['results']]
+            url = response.data['next']
+        return seen
+
+    def test_walks_all_reviews(self):
+        for ordering, order_by in (('-updated_at', ('-updated_at', '-pk')), ('updated_at', ('updated_at', 'pk'))):
+            expected = list(Review.objects.order_by(*order_by).values_list('pk', flat=True))
+            for page_size in (1, 2, 5):
+                url = f'/api/reviews/?pagination=cursor&page_size={page_size}&ordering={ordering}'
+                self.assertEqual(self.walk(url), expected)
+
+    def test_unsupported_ordering(self):
+        response = self.client.get('/api/reviews/?pagination=cursor&ordering=rating')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.client.get('/api/reviews/?ordering=rating').data), 5)
+
+    async def test_unsupported_ordering_async(self):
+        token = await Token.objects.acreate(user=self.customer)
+        response = await AsyncClient().get(
+            '/api/reviews/?pagination=cursor&ordering=rating', headers={'Authorization': f'Token {token.key}'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncViewTests(TestCase):
+    """
+    Ensures the async base info and review list views answer like the sync views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description="Gut")
+        self.token = Token.objects.create(user=self.customer)
+
+    async def test_base_info(self):
+        response = await AsyncClient().get('/api/base-info/')
+        self.assertEqual(response.json(), {
+            'review_count': 1, 'average_rating': 4.0, 'business_profile_count': 1, 'offer_count': 0,
+        })
+        cached = await AsyncClient().get('/api/base-info/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+    async def test_review_list_requires_authentication(self):
+        self.assertEqual((await AsyncClient().get('/api/reviews/')).status_code, 401)
+
+        response = await AsyncClient().get(
+            f'/api/reviews/?business_user_id={self.business.pk}', headers={'Authorization': f'Token {self.token.key}'}
+        )
+        self.assertEqual([review['rating'] for review in response.json()], [4])
+
+
+class BusinessStatsMigrationTests(TransactionTestCase):
+    """
+    Ensures the migrations build the statistics rows of existing businesses from the source tables.
+    """
+
+    def migrate(self, *targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(list(targets))
+        return executor.loader.project_state(list(targets)).apps
+
+    def tearDown(self):
+        # Rows of the old schema may not fit the later migrations
+        call_command('flush', verbosity=0, interactive=False)
+        self.migrate(*MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def create_business_data(self, apps):
+        User = apps.get_model('accounts', 'User')
+        business = User.objects.create(username='business', email='business@example.com', type='business')
+        idle = User.objects.create(username='idle', email='idle@example.com', type='business')
+        customer = User.objects.create(username='customer', email='customer@example.com')
+        for rating in (5, 5, 3):
+            apps.get_model('accounts', 'Review').objects.create(business_user=business, reviewer=customer, rating=rating)
+        apps.get_model('offers', 'Offer').objects.create(user=business, title="Logo", description="Logo")
+        for status in ('in_progress', 'completed', 'completed'):
+            apps.get_model('orders', 'Order').objects.create(
+                customer_user=customer, business_user=business, title="Basic", revisions=1,
+                delivery_time_in_days=5, price=100, features=[], offer_type='basic', status=status,
+            )
+        return business, idle
+
+    def test_businessstats_is_backfilled(self):
+        apps = self.migrate(
+            ('accounts', '0002_rename_comment_review_description_remove_review_user_and_more'),
+            ('offers', '0001_initial'), ('orders', '0001_initial'),
+        )
+        business, idle = self.create_business_data(apps)
+        apps = self.migrate(('accounts', '0003_businessstats'))
+        BusinessStats = apps.get_model('accounts', 'BusinessStats')
+        stats = BusinessStats.objects.get(pk=business.pk)
+        self.assertEqual(
+            (stats.in_progress_order_count, stats.completed_order_count, stats.review_count, stats.rating_sum, stats.offer_count),
+            (1, 2, 3, 13, 1),
+        )
+        self.assertEqual(BusinessStats.objects.get(pk=idle.pk).review_count, 0)
+
+
+    def test_rating_summary_creates_missing_rows(self):
+        apps = self.migrate(('accounts', '0006_user_file_renditions'), ('offers', '0001_initial'), ('orders', '0001_initial'))
+        # Written without signals, as before the statistics existed
+        business, idle = self.create_business_data(apps)
+        self.assertFalse(apps.get_model('accounts', 'BusinessStats').objects.exists())
+        apps = self.migrate(('accounts', '0007_rating_summary'))
+        stats = apps.get_model('accounts', 'BusinessStats').objects.get(pk=business.pk)
+        self.assertEqual(
+            (stats.review_count, stats.avg_rating, stats.rating_3_count, stats.rating_5_count, stats.completed_order_count),
+            (3, 13 / 3, 1, 2, 2),
+        )
+        self.assertEqual(apps.get_model('accounts', 'BusinessStats').objects.get(pk=idle.pk).avg_rating, 0)
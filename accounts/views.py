@@ -1,3 +1,5 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -5,10 +7,22 @@ from rest_framework import status, viewsets
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from .models import User, Review
-from offers.models import Offer
-from django.db.models import Avg
-from .serializers import RegistrationSerializer, LoginSerializer, UserSerializer, ReviewSerializer, ProfileListSerializer
+from django.utils.cache import patch_cache_control
+from .serializers import (
+    RegistrationSerializer, LoginSerializer, UserSerializer, ReviewSerializer, ProfileListSerializer,
+    CompiledProfileListSerializer,
+)
+from backend.async_views import FALLBACK, AsyncReadMixin
+from backend.compiled_serializers import compiled_serializers_enabled
+from backend.conditional import Version, conditional_get
+from backend.db_router import ReplicaReadMixin
+from backend.metrics import SerializerTimingMixin
+from backend.pagination import KeysetPaginationMixin
+from backend.response_cache import cache_response
+from backend.streaming import StreamingListMixin
+from .base_info import aget_base_info, get_base_info, get_cache_timeout
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
@@ -74,18 +88,56 @@ class LoginView(APIView):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+def profile_tags(view, data):
+    return [f"user:{view.kwargs['pk']}"]
+
+
+def profile_version(view, request):
+    return Version(User.objects.filter(pk=view.kwargs['pk']), 'updated_at', 'business_stats__rating_updated_at')
+
+
+def profile_list_version(user_type):
+    """
+    Returns the version function of a profile list: count and latest changes of the profiles of a type.
+    """
+    def version(view, request):
+        return Version(
+            User.objects.filter(type=user_type),
+            count=Count('pk'),
+            updated_at=Max('updated_at'),
+            rating_updated_at=Max('business_stats__rating_updated_at'),
+        )
+    return version
+
+
+def review_list_tags(view, data):
+    """
+    Tags of a review list: the reviews of one business if filtered, else all reviews.
+    """
+    business_user_id = view.request.query_params.get('business_user_id')
+    if business_user_id and business_user_id != 'undefined':
+        return [f'business:{business_user_id}']
+    return ['reviews']
+
+
+class UserViewSet(SerializerTimingMixin, ReplicaReadMixin, StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user profiles.
     - Supports CRUD operations for users.
     - Includes additional endpoints for business users and customers.
+    - Profile lists can be streamed with `?stream=json` or `?stream=ndjson`.
+    - Profiles and profile lists answer conditional GETs with 304, see `backend.conditional`.
     """
-    queryset = get_user_model().objects.all()
+    queryset = get_user_model().objects.select_related('business_stats')
     serializer_class = UserSerializer  
+    replica_actions = ('retrieve', 'list_business', 'list_customer')
 
+    @conditional_get(profile_version)
+    @cache_response(profile_tags)
     def retrieve(self, request, *args, **kwargs):
         """
         GET /profile/<int:pk>/ - Retrieves the profile details of a user.
+        - Cached until the user changes, see `backend.response_cache`.
         """
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -109,76 +161,116 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='business', permission_classes=[IsAuthenticated])
+    @conditional_get(profile_list_version('business'), weak=True)
     def list_business(self, request):
         """
         GET /profiles/business/ - Returns a list of all business users.
         """
         business_users = self.queryset.filter(type='business')
+        stream_format = self.get_stream_format()
+        if stream_format:
+            return self.streaming_response(business_users, stream_format, ProfileListSerializer, context={})
+        if compiled_serializers_enabled():
+            return Response(CompiledProfileListSerializer().data(business_users))
         serializer = ProfileListSerializer(business_users, many=True)  
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='customer', permission_classes=[IsAuthenticated])
+    @conditional_get(profile_list_version('customer'), weak=True)
     def list_customer(self, request):
         """
         GET /profiles/customer/ - Returns a list of all customer profiles.
         """
         customer_users = self.queryset.filter(type='customer')
+        stream_format = self.get_stream_format()
+        if stream_format:
+            return self.streaming_response(customer_users, stream_format, ProfileListSerializer, context={})
+        if compiled_serializers_enabled():
+            return Response(CompiledProfileListSerializer().data(customer_users))
         serializer = ProfileListSerializer(customer_users, many=True)  
         return Response(serializer.data)
 
 
-class BaseInfoView(APIView):
+class BaseInfoView(ReplicaReadMixin, AsyncReadMixin, APIView):
     """
     API endpoint for general statistics and information.
     - Returns statistics about reviews, business users, and offers.
+    - Cached with a configurable TTL (`BASE_INFO_CACHE_TIMEOUT`).
+    - Runs natively async under ASGI, see `backend.async_views`.
     """
     permission_classes = [AllowAny]
 
     def get(self, request, *args, **kwargs):
         """
         GET /base-info/ - Retrieves general statistics.
+        - Served from a shared cache, see `accounts.base_info`.
+        - Answers a matching If-None-Match with 304 Not Modified.
         """
-        
-        User = get_user_model()
-
-        
-        review_count = Review.objects.count()
+        return self.base_info_response(request, get_base_info())
 
-       
-        average_rating = Review.objects.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
-        average_rating = round(average_rating, 1)
-
-        
-        business_profile_count = User.objects.filter(type='business').count()
+    async def aget(self, request, *args, **kwargs):
+        """
+        Async `get()` for ASGI.
+        """
+        return self.base_info_response(request, await aget_base_info())
 
-        
-        offer_count = Offer.objects.count()
+    def base_info_response(self, request, entry):
+        if entry['etag'] in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry['data'])
 
-        
-        return Response({
-            "review_count": review_count,
-            "average_rating": average_rating,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count,
-        })
+        response['ETag'] = entry['etag']
+        patch_cache_control(response, public=True, max_age=get_cache_timeout())
+        return response
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+def save_unique_review(serializer, **kwargs):
+    """
+    Saves a review in its own transaction and maps a violated
+    (business_user, reviewer) constraint to the duplicate review error.
+    - Replaces a lookup before the insert, which costs a query and lets
+      concurrent submissions both pass.
+    """
+    try:
+        with transaction.atomic():
+            return serializer.save(**kwargs)
+    except IntegrityError:
+        data = {**serializer.validated_data, **kwargs}
+        instance = serializer.instance
+        business_user = data.get('business_user', getattr(instance, 'business_user', None))
+        reviewer = data.get('reviewer', getattr(instance, 'reviewer', None))
+        duplicates = Review.objects.filter(business_user=business_user, reviewer=reviewer)
+        if instance is not None and instance.pk is not None:
+            duplicates = duplicates.exclude(pk=instance.pk)
+        if not duplicates.exists():
+            raise
+        raise ValidationError({"detail": ["You have already reviewed this business profile."]})
+
+
+class ReviewViewSet(SerializerTimingMixin, ReplicaReadMixin, AsyncReadMixin, StreamingListMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing reviews.
     - Supports CRUD operations for reviews.
     - Includes filtering and ordering options.
+    - Keyset pagination on (updated_at, id) with `?pagination=cursor`.
+    - Streams the list with `?stream=json` or `?stream=ndjson`.
+    - The list runs natively async under ASGI, see `backend.async_views`.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = None
+    keyset_ordering_field = 'updated_at'
 
     def perform_create(self, serializer):
         """
         Sets the current user as the reviewer.
         """
-        serializer.save(reviewer=self.request.user)
+        save_unique_review(serializer, reviewer=self.request.user)
+
+    def perform_update(self, serializer):
+        save_unique_review(serializer)
 
     def get_queryset(self):
         """
@@ -193,34 +285,49 @@ class ReviewViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by(ordering)
 
+    @cache_response(review_list_tags)
     def list(self, request, *args, **kwargs):
         """
         GET /reviews/ - Retrieves a list of all reviews.
+        - Cached until a review of the listed business changes.
+        - Paginated only if requested with `?pagination=cursor`.
+        - Streams the reviews with `?stream=json|ndjson`.
         """
         queryset = self.get_queryset()
+        stream_format = self.get_stream_format()
+        if stream_format:
+            return self.streaming_response(queryset, stream_format)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serialized = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serialized.data)
         serialized = self.get_serializer(queryset, many=True)
         return Response(serialized.data)
 
+    @cache_response(review_list_tags)
+    async def alist(self, request, *args, **kwargs):
+        """
+        Async `list()` for ASGI; streamed lists run through the sync action.
+        """
+        if self.get_stream_format():
+            return FALLBACK
+        return await super().alist(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         """
         POST /reviews/ - Creates a new review.
         - Ensures only customers can create reviews.
-        - Prevents duplicate reviews for the same business profile.
+        - Prevents duplicate reviews for the same business profile with the
+          unique constraint, which also holds for concurrent submissions.
         """
         if request.user.type != 'customer':
             return Response({
                 "detail": ["Only customers can create reviews."]
             }, status=status.HTTP_403_FORBIDDEN)
 
-        business_user_id = request.data.get('business_user')
-        if Review.objects.filter(business_user_id=business_user_id, reviewer=request.user).exists():
-            return Response({
-                "detail": ["You have already reviewed this business profile."]
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(reviewer=request.user)
+            self.perform_create(serializer)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response({
             "detail": serializer.errors
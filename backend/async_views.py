@@ -0,0 +1,153 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+# Returned by async handlers for requests only the sync action covers
+FALLBACK = object()
+
+# Renderer formats that only encode the response data
+DATA_FORMATS = ('json', 'msgpack')
+
+
+class AsyncReadMixin:
+    """
+    View mixin serving read requests with native async handlers under ASGI.
+    - `as_async_view()` returns an async Django view running `a<action>`
+      (viewsets) or `a<method>` (API views) as a coroutine.
+    - Authentication, permissions, content negotiation and exception handling
+      run like in `APIView.dispatch`.
+    - Handlers return `FALLBACK` for requests they don't cover (e.g. the
+      browsable API); those run through the regular sync view.
+    """
+
+    @classmethod
+    def as_async_view(cls, actions=None, **initkwargs):
+        sync_view = cls.as_view(actions, **initkwargs) if actions else cls.as_view(**initkwargs)
+        sync_view = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            method = request.method.lower()
+            if actions:
+                self.action_map = actions
+                handler = getattr(self, f'a{actions[method]}', None) if method in actions else None
+            else:
+                handler = getattr(self, f'a{method}', None)
+            if handler is None:
+                return await sync_view(request, *args, **kwargs)
+
+            self.args, self.kwargs = args, kwargs
+            self.request = self.initialize_request(request, *args, **kwargs)
+            self.headers = self.default_response_headers
+            try:
+                await sync_to_async(self.initial)(self.request, *args, **kwargs)
+                response = await handler(self.request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+            if response is FALLBACK:
+                return await sync_view(request, *args, **kwargs)
+            self.response = self.finalize_response(self.request, response, *args, **kwargs)
+            return self.response
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        view.csrf_exempt = True
+        return view
+
+    def renders_json(self):
+        """
+        Returns whether the negotiated renderer is JSON (or MessagePack); other
+        renderers such as the browsable API may query the database while rendering.
+        """
+        return self.request.accepted_renderer.format in DATA_FORMATS
+
+    async def aget_object(self):
+        """
+        Async `get_object()`, raising Http404 like `get_object_or_404`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Async `paginate_queryset()` for page number pagination.
+        - Returns None without pagination and FALLBACK for other paginators.
+        """
+        paginator = self.paginator
+        if paginator is None:
+            return None
+        if not isinstance(paginator, PageNumberPagination):
+            return FALLBACK
+        page_size = paginator.get_page_size(self.request)
+        if not page_size:
+            return None
+
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(self.request, django_paginator)
+        try:
+            page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        page.object_list = [obj async for obj in page.object_list]
+        paginator.page = page
+        paginator.request = self.request
+        return page.object_list
+
+    async def alist(self, request, *args, **kwargs):
+        """
+        Async `list()`.
+        - Serializers run on the fetched (and prefetched) rows, so they must
+          not query the database themselves.
+        """
+        if not self.renders_json():
+            return FALLBACK
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is FALLBACK:
+            return FALLBACK
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer([obj async for obj in queryset], many=True).data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """
+        Async `retrieve()`.
+        """
+        if not self.renders_json():
+            return FALLBACK
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+
+class AsyncURLConfMiddleware:
+    """
+    Routes ASGI requests through `ASYNC_URLCONF`, so async views only serve
+    ASGI deployments while WSGI keeps the sync views.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        urlconf = getattr(settings, 'ASYNC_URLCONF', None)
+        if urlconf and isinstance(request, ASGIRequest):
+            request.urlconf = urlconf
+        return self.get_response(request)
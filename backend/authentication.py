@@ -0,0 +1,167 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULTS = {
+    # Entries kept in the in-process LRU, used only without a shared cache
+    'LOCAL_MAX_SIZE': 1024,
+    # Seconds an in-process entry is trusted
+    'LOCAL_TIMEOUT': 30,
+    # Alias of a CACHES entry shared by all workers, or None; replaces the in-process LRU
+    'SHARED_CACHE': None,
+    'SHARED_TIMEOUT': 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'TOKEN_AUTH_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU with per-entry expiry.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > get_setting('LOCAL_MAX_SIZE'):
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_cache = LRUCache()
+
+
+def cache_key(key):
+    """
+    Cache key of a token, hashed so raw tokens never reach the shared cache.
+    """
+    return 'token-auth:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_shared_cache():
+    alias = get_setting('SHARED_CACHE')
+    return caches[alias] if alias else None
+
+
+def invalidate_token(key):
+    """
+    Drops a token from the in-process and the shared cache.
+    """
+    cache_key_ = cache_key(key)
+    local_cache.delete(cache_key_)
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(cache_key_)
+
+
+def invalidate_user_tokens(user_id):
+    """
+    Drops all cached tokens of a user.
+    """
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+def cache_payload(user, token):
+    """
+    Pickles a token and its user for the cache, without the password hash.
+    - The password becomes a deferred field of the cached user: loaded from
+      the database if read, and left alone by `save()`.
+    """
+    fields = [field for field in user._meta.concrete_fields if field.attname != 'password']
+    user = type(user).from_db(
+        user._state.db,
+        [field.attname for field in fields],
+        # Plain values, file fields would otherwise carry the original instance
+        [field.get_prep_value(field.value_from_object(user)) for field in fields],
+    )
+    return pickle.dumps((user, token.key, token.created))
+
+
+def load_payload(payload):
+    user, key, created = pickle.loads(payload)
+    return user, Token(key=key, user=user, created=created)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token and its user.
+    - Looks up the shared cache if one is configured, else an in-process
+      LRU, and only then the database.
+    - Invalidations can't reach the in-process LRUs of other workers, so
+      deployments with several workers need `SHARED_CACHE` for tokens to be
+      rejected immediately.
+    - Cached entries are pickled, so every request gets its own user instance.
+    - Entries are invalidated when a token is deleted or a field deciding
+      what its user may do changes (see `accounts.signals`).
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key_ = cache_key(key)
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            payload = shared_cache.get(cache_key_)
+        else:
+            payload = local_cache.get(cache_key_)
+
+        if payload is None:
+            user, token = super().authenticate_credentials(key)
+            payload = cache_payload(user, token)
+            if shared_cache is not None:
+                shared_cache.set(cache_key_, payload, get_setting('SHARED_TIMEOUT'))
+            else:
+                local_cache.set(cache_key_, payload, get_setting('LOCAL_TIMEOUT'))
+            return user, token
+
+        user, token = load_payload(payload)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return user, token
+
+
+class QueryTokenAuthentication(CachedTokenAuthentication):
+    """
+    `CachedTokenAuthentication` also accepting the token as `?token=`, for
+    clients that can't send headers, such as the browser's EventSource.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        token = request.query_params.get('token')
+        if result is None and token:
+            return self.authenticate_credentials(token)
+        return result
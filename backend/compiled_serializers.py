@@ -0,0 +1,190 @@
+import decimal
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+from .async_views import FALLBACK
+from .metrics import timed_serialization
+
+
+def compiled_serializers_enabled():
+    return getattr(settings, 'COMPILED_LIST_SERIALIZERS', True)
+
+
+def identity(value):
+    return value
+
+
+def decimal_converter(field):
+    """
+    Returns a function formatting decimals like a DRF DecimalField.
+    """
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.normalize_output or field.localize or not coerce_to_string or field.decimal_places is None:
+        return field.to_representation
+    quantum = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(quantum, rounding=rounding, context=context))
+    return convert
+
+
+def datetime_converter(field):
+    """
+    Returns a function formatting aware datetimes like a DRF DateTimeField in ISO 8601.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not value:
+            return None
+        if not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def field_converter(field):
+    """
+    Returns the function converting a database value into the output of a DRF field.
+    - Values already in their output type (ints, strings, primary keys,
+      decoded JSON) are passed through, decimals and datetimes get a fast
+      path, anything else uses the field itself.
+    """
+    if isinstance(field, (serializers.IntegerField, serializers.CharField, serializers.BooleanField)):
+        return identity
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return identity
+    if isinstance(field, serializers.JSONField) and not field.binary:
+        return identity
+    if isinstance(field, serializers.DecimalField):
+        return decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field)
+    return field.to_representation
+
+
+class CompiledSerializer:
+    """
+    Read-only list serializer building rows straight from values_list() tuples.
+    - Produces the same output as `serializer_class`, without model
+      instances and without the per-row field machinery of DRF.
+    - Subclasses select `columns` and return a function turning a tuple of
+      them into a row from `compile()`; converters and column positions are
+      looked up there once per list, not per row.
+    - `prefetch()` / `aprefetch()` load related rows for a whole list.
+    """
+    serializer_class = None
+    columns = ()
+
+    def __init__(self, context=None):
+        self.context = {} if context is None else context
+        self.fields = self.serializer_class(context=self.context).fields
+
+    def select(self, queryset):
+        """
+        Returns the queryset as values_list() tuples of `columns`.
+        """
+        return queryset.values_list(*self.columns)
+
+    def converter(self, name):
+        return field_converter(self.fields[name])
+
+    def prefetch(self, rows):
+        return None
+
+    async def aprefetch(self, rows):
+        return self.prefetch(rows)
+
+    def compile(self, related):
+        raise NotImplementedError
+
+    def represent(self, rows, related=None):
+        build = self.compile(related)
+        return [build(row) for row in rows]
+
+    def serialize(self, rows):
+        """
+        Returns the serialized list of values_list() tuples.
+        """
+        rows = list(rows)
+        return self.represent(rows, self.prefetch(rows))
+
+    async def aserialize(self, rows):
+        rows = [row async for row in rows] if hasattr(rows, '__aiter__') else list(rows)
+        return self.represent(rows, await self.aprefetch(rows))
+
+    def data(self, queryset):
+        """
+        Returns the serialized rows of a model queryset.
+        """
+        return self.serialize(self.select(queryset))
+
+
+class CompiledListMixin:
+    """
+    Viewset mixin serving list actions through a `compiled_serializer_class`.
+    - Covers unpaginated lists and page number pagination; other paginators
+      (e.g. keyset pagination) use the regular serializer.
+    - Can be switched off with `COMPILED_LIST_SERIALIZERS = False`.
+    - `alist()` needs `AsyncReadMixin`.
+    """
+    compiled_serializer_class = None
+
+    def get_compiled_serializer(self):
+        """
+        Returns the compiled serializer for the current list request, or None.
+        """
+        if self.compiled_serializer_class is None or not compiled_serializers_enabled():
+            return None
+        paginator = self.paginator
+        if paginator is not None and not isinstance(paginator, PageNumberPagination):
+            return None
+        return self.compiled_serializer_class(context=self.get_serializer_context())
+
+    def compiled_list(self, queryset):
+        """
+        Returns the list response of a queryset, or None if the compiled serializer doesn't cover the request.
+        """
+        serializer = self.get_compiled_serializer()
+        if serializer is None:
+            return None
+        rows = serializer.select(queryset)
+        page = self.paginate_queryset(rows)
+        with timed_serialization():
+            data = serializer.serialize(rows if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        response = self.compiled_list(self.filter_queryset(self.get_queryset()))
+        if response is None:
+            return super().list(request, *args, **kwargs)
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        serializer = self.get_compiled_serializer()
+        if serializer is None or not self.renders_json():
+            return await super().alist(request, *args, **kwargs)
+        rows = serializer.select(self.filter_queryset(self.get_queryset()))
+        page = await self.apaginate_queryset(rows)
+        if page is FALLBACK:
+            return FALLBACK
+        with timed_serialization():
+            data = await serializer.aserialize(rows if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
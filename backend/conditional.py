@@ -0,0 +1,157 @@
+import functools
+import hashlib
+import json
+from datetime import datetime
+from asgiref.sync import iscoroutinefunction
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import parse_etags, patch_cache_control, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class Version:
+    """
+    Query returning the version of a response: a row of `values_list()`
+    fields, or of aggregates over the queryset (e.g. of a list).
+    - The first value must be None if there is nothing to serve, e.g. for
+      an unknown primary key; the action then runs as usual.
+    - The datetimes among the values give the Last-Modified date.
+    """
+
+    def __init__(self, queryset, *fields, **aggregates):
+        self.queryset = queryset.order_by()
+        self.fields = fields
+        self.aggregates = aggregates
+
+    def get(self):
+        """
+        Returns the version, or None if the lookup is invalid (e.g. a non-numeric ID).
+        """
+        try:
+            return self.query()
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    async def aget(self):
+        try:
+            return await self.aquery()
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def query(self):
+        if self.aggregates:
+            return tuple(self.queryset.aggregate(**self.aggregates).values())
+        return self.queryset.values_list(*self.fields).first()
+
+    async def aquery(self):
+        if self.aggregates:
+            return tuple((await self.queryset.aaggregate(**self.aggregates)).values())
+        return await self.queryset.values_list(*self.fields).afirst()
+
+
+def make_etag(request, values, weak=False):
+    """
+    Returns the ETag of a response from its version and the representation
+    it was rendered in (host, negotiated media type and query params).
+    """
+    raw = json.dumps([
+        request.get_host(), request.accepted_media_type, sorted(request.query_params.lists()), values,
+    ], cls=DjangoJSONEncoder)
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    return f'W/{etag}' if weak else etag
+
+
+def last_modified(values):
+    dates = [value for value in values if isinstance(value, datetime)]
+    return max(dates) if dates else None
+
+
+def is_not_modified(request, etag, modified):
+    """
+    Returns whether the client's copy is current.
+    - If-None-Match takes precedence over If-Modified-Since (RFC 9110) and
+      uses the weak comparison, so weak list ETags match as well.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+        return '*' in tags or etag.removeprefix('W/') in tags
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+    return bool(modified and if_modified_since) and int(modified.timestamp()) <= if_modified_since
+
+
+def add_validators(response, etag, modified):
+    response['ETag'] = etag
+    if modified is not None:
+        response['Last-Modified'] = http_date(modified.timestamp())
+    # Clients may store the response but must revalidate it
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def validators_of(request, values, weak):
+    """
+    Returns the ETag and Last-Modified date of a version, or None if there is nothing to serve.
+    """
+    if values is None or values[0] is None:
+        return None
+    return make_etag(request, values, weak), last_modified(values)
+
+
+def conditional_response(request, values, weak):
+    """
+    Returns (304 response, None) if the client's copy is current, else (None, validators).
+    """
+    validators = validators_of(request, values, weak)
+    if validators is not None and is_not_modified(request, *validators):
+        return add_validators(Response(status=status.HTTP_304_NOT_MODIFIED), *validators), None
+    return None, validators
+
+
+def conditional_get(version, weak=False):
+    """
+    Answers conditional GET requests of a viewset method with 304 Not Modified.
+    - `version(view, request)` returns the `Version` of the response, or
+      None to run the action unconditionally; it is read before the
+      action, so a 304 costs one cheap query and no serialization.
+    - Successful responses get an ETag (weak for lists) and a Last-Modified
+      header, and must be revalidated by clients. A version without a
+      value before the action may give one for its response with
+      `of_response(response)`, see `backend.response_cache.CachedVersion`.
+    - Runs inside the method after authentication and permission checks;
+      wrap `cache_response` with it, so 304s skip the response cache.
+    - Supports async handlers, see `backend.async_views`.
+    """
+    def finish(request, query, response, validators):
+        if getattr(response, 'status_code', None) != status.HTTP_200_OK:
+            return response
+        if validators is None and hasattr(query, 'of_response'):
+            validators = validators_of(request, query.of_response(response), weak)
+        if validators is not None:
+            add_validators(response, *validators)
+        return response
+
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                query = version(view, request)
+                values = None if query is None else await query.aget()
+                not_modified, validators = conditional_response(request, values, weak)
+                if not_modified is not None:
+                    return not_modified
+                return finish(request, query, await method(view, request, *args, **kwargs), validators)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            query = version(view, request)
+            values = None if query is None else query.get()
+            not_modified, validators = conditional_response(request, values, weak)
+            if not_modified is not None:
+                return not_modified
+            return finish(request, query, method(view, request, *args, **kwargs), validators)
+        return wrapper
+    return decorator
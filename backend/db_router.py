@@ -0,0 +1,265 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+DEFAULTS = {
+    # Seconds a client keeps reading from the primary after a write (read-your-writes)
+    'PIN_SECONDS': 5,
+    # Seconds between health checks of a replica, and how long a failed replica is skipped
+    'HEALTH_CHECK_INTERVAL': 10,
+}
+
+current_routing = contextvars.ContextVar('current_routing', default=None)
+
+
+def get_setting(name):
+    return getattr(settings, 'DATABASE_REPLICA_ROUTING', {}).get(name, DEFAULTS[name])
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def read_alias(alias):
+    """
+    Returns the alias to read a replica through.
+    - Replicas pointing at the primary's database, like test mirrors, read
+      through the primary's connection; this keeps the data of test
+      transactions visible.
+    """
+    keys = ('ENGINE', 'NAME', 'HOST', 'PORT')
+    replica, primary = connections[alias].settings_dict, connections['default'].settings_dict
+    if all(replica.get(key) == primary.get(key) for key in keys):
+        return 'default'
+    return alias
+
+
+class RoutingState:
+    """
+    Routing decisions of a single request.
+    """
+
+    def __init__(self):
+        self.use_replica = False
+        self.replica = None
+        self.primary_reads = 0
+
+
+def check_connection(alias):
+    """
+    Returns whether the database behind an alias answers a trivial query.
+    """
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        return False
+    return True
+
+
+class ReplicaPool:
+    """
+    Round-robin over the healthy replicas.
+    - A replica is checked at most once per `HEALTH_CHECK_INTERVAL`.
+    - Failed replicas, by check or by a query error during a request, are
+      skipped for `HEALTH_CHECK_INTERVAL` seconds.
+    """
+
+    def __init__(self, aliases, check=check_connection):
+        self.aliases = list(aliases)
+        self.check = check
+        self.lock = threading.Lock()
+        self.position = 0
+        self.checked_at = {}
+        self.down_until = {}
+
+    def choose(self):
+        """
+        Returns the alias of the next healthy replica, or None if there is none.
+        """
+        with self.lock:
+            start = self.position
+            self.position += 1
+        for offset in range(len(self.aliases)):
+            alias = self.aliases[(start + offset) % len(self.aliases)]
+            if self.is_healthy(alias):
+                return alias
+        return None
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        if self.down_until.get(alias, 0) > now:
+            return False
+        checked_at = self.checked_at.get(alias)
+        if checked_at is not None and now - checked_at < get_setting('HEALTH_CHECK_INTERVAL'):
+            return True
+        self.checked_at[alias] = now
+        if self.check(alias):
+            return True
+        self.mark_down(alias)
+        return False
+
+    def mark_down(self, alias):
+        self.down_until[alias] = time.monotonic() + get_setting('HEALTH_CHECK_INTERVAL')
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the replica pool of the configured `DATABASE_REPLICAS`.
+    """
+    global _pool
+    replicas = [read_alias(alias) for alias in get_replicas()]
+    with _pool_lock:
+        if _pool is None or _pool.aliases != replicas:
+            _pool = ReplicaPool(replicas)
+        return _pool
+
+
+@contextmanager
+def primary_reads():
+    """
+    Sends the reads inside the block to the primary.
+    - Used when filling shared caches: a replica lagging behind an
+      invalidation would otherwise store stale data for the whole TTL.
+    """
+    state = current_routing.get()
+    if state is None:
+        yield
+        return
+    state.primary_reads += 1
+    try:
+        yield
+    finally:
+        state.primary_reads -= 1
+
+
+def pin_key(user_id):
+    return f'db-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """
+    Sends the reads of a user to the primary for `PIN_SECONDS`, so they see their own writes.
+    - Pins are stored in the default cache; with several workers it must be
+      shared (`REDIS_URL` or `CACHE_DIR`), or other workers miss the pin.
+    """
+    cache.set(pin_key(user_id), True, get_setting('PIN_SECONDS'))
+
+
+def is_pinned(user_id):
+    return cache.get(pin_key(user_id)) is not None
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads of replica-enabled requests to the replicas.
+    - Only requests marked by `ReplicaReadMixin` read from a replica, every
+      other read and all writes use the primary (`default`).
+    - The replica is chosen once per request, so all its reads see the same state.
+    - After a write the rest of the request reads from the primary.
+    - Cache fills read from the primary, see `primary_reads()`.
+    - Replicas get their schema from the primary, migrations only run there.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_routing.get()
+        if state is None or not state.use_replica or state.primary_reads:
+            return None
+        if state.replica is None:
+            state.replica = get_pool().choose() or 'default'
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.use_replica = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in get_replicas() else None
+
+
+class ReplicaReadMixin:
+    """
+    View mixin reading from the replicas in read-only actions.
+    - Viewsets list their read actions in `replica_actions`, API views read
+      from replicas for safe methods.
+    - Authentication and permission checks still read from the primary.
+    - Users who wrote within `PIN_SECONDS` keep reading from the primary.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = current_routing.get()
+        if state is not None and get_replicas() and self.reads_from_replica(request):
+            state.use_replica = True
+
+    def reads_from_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        action = getattr(self, 'action', None)
+        if action is not None and action not in self.replica_actions:
+            return False
+        user = request.user
+        return not (user and user.is_authenticated and is_pinned(user.pk))
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Scopes the replica routing to a request.
+    - Pins users to the primary after successful writes.
+    - Takes a replica out of rotation when a request fails on it with a database error.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = current_routing.set(RoutingState())
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        self.pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = current_routing.set(RoutingState())
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        self.pin_writer(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        state = current_routing.get()
+        if isinstance(exception, DatabaseError) and state is not None and state.replica in get_pool().aliases:
+            get_pool().mark_down(state.replica)
+
+    def pin_writer(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400 or not get_replicas():
+            return
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
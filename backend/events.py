@@ -0,0 +1,235 @@
+import asyncio
+import threading
+from collections import defaultdict
+from functools import cached_property, lru_cache
+import orjson
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+DEFAULTS = {
+    # Delivers events to the subscribers of all workers, see `LocalBackend` and `RedisBackend`
+    'BACKEND': 'backend.events.LocalBackend',
+    'OPTIONS': {},
+    # Events buffered per connection; a client falling further behind is disconnected
+    'QUEUE_SIZE': 100,
+    # Seconds between keep-alive comments on idle streams
+    'KEEPALIVE': 15,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'EVENT_STREAM', {}).get(name, DEFAULTS[name])
+
+
+class Event:
+    """
+    Server-sent event, encoded once and shared by all subscribers.
+    """
+
+    def __init__(self, name, data, event_id=None):
+        self.name = name
+        self.data = data
+        self.id = event_id
+
+    @cached_property
+    def encoded(self):
+        lines = []
+        if self.id is not None:
+            lines.append(f'id: {self.id}')
+        lines.append(f'event: {self.name}')
+        lines.append(f"data: {orjson.dumps(self.data).decode()}")
+        return ('\n'.join(lines) + '\n\n').encode()
+
+    def to_dict(self):
+        return {'name': self.name, 'data': self.data, 'id': self.id}
+
+    @classmethod
+    def from_dict(cls, value):
+        return cls(value['name'], value['data'], value.get('id'))
+
+
+class Subscription:
+    """
+    Bounded queue of the events of some channels for one connection.
+    - Events are put from any thread and read in the event loop that subscribed.
+    - Never blocks the publisher: if the queue is full the subscription is
+      marked as overflowed and the stream ends, so a slow client can't
+      grow memory; the client reconnects and catches up (`Last-Event-ID`).
+    """
+
+    def __init__(self, hub, channels, maxsize):
+        self.hub = hub
+        self.channels = tuple(channels)
+        self.queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self.put_nowait, event)
+        except RuntimeError:
+            # The event loop of the connection is closed
+            self.close()
+
+    def put_nowait(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+
+    async def get(self, timeout):
+        """
+        Returns the next event, or None after `timeout` seconds without one.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """
+    In-process fan-out of events to the subscriptions of a channel, e.g. `user:42`.
+    """
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, channels, maxsize=None):
+        """
+        Subscribes the running event loop to the channels.
+        """
+        subscription = Subscription(self, channels, maxsize or get_setting('QUEUE_SIZE'))
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscribers = self.subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.subscriptions[channel]
+
+    def deliver(self, channels, event):
+        """
+        Puts the event into the queue of every local subscription of the channels, once per subscription.
+        """
+        with self.lock:
+            subscriptions = set().union(*(self.subscriptions.get(channel, ()) for channel in channels))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+hub = EventHub()
+
+
+class LocalBackend:
+    """
+    Delivers events to the subscribers of the publishing process only.
+    - Enough for a single ASGI worker and for tests.
+    """
+
+    def __init__(self, hub, **options):
+        self.hub = hub
+
+    def publish(self, channels, event):
+        self.hub.deliver(channels, event)
+
+
+class RedisBackend:
+    """
+    Delivers events to the subscribers of all workers through Redis pub/sub.
+    - Every worker listens on a background thread and hands the events of
+      its subscribers to the local hub; publishing doesn't deliver locally.
+    - Options: `url` of the Redis server and the `channel` used.
+    """
+
+    def __init__(self, hub, url, channel='coderr-events'):
+        if redis is None:
+            raise ImproperlyConfigured("RedisBackend requires the redis package to be installed.")
+        self.hub = hub
+        self.channel = channel
+        self.client = redis.Redis.from_url(url)
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def publish(self, channels, event):
+        self.client.publish(self.channel, orjson.dumps({'channels': list(channels), 'event': event.to_dict()}))
+
+    def start(self):
+        """
+        Starts listening, once per process.
+        """
+        with self.lock:
+            if self.listener is None:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self.receive})
+                self.listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def receive(self, message):
+        payload = orjson.loads(message['data'])
+        self.hub.deliver(payload['channels'], Event.from_dict(payload['event']))
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(get_setting('BACKEND'))(hub, **get_setting('OPTIONS'))
+
+
+def subscribe(channels, maxsize=None):
+    """
+    Subscribes the running event loop to the channels, also receiving the events of other workers.
+    """
+    backend = get_backend()
+    if hasattr(backend, 'start'):
+        backend.start()
+    return hub.subscribe(channels, maxsize)
+
+
+def publish(channels, event):
+    """
+    Publishes an event to the subscribers of the channels in all workers.
+    """
+    get_backend().publish(channels, event)
+
+
+async def event_stream(subscription, events=(), keepalive=None):
+    """
+    Yields a text/event-stream: `events` (e.g. replayed ones), then the events of the subscription.
+    - Events with an ID not above the last one sent are skipped, so replayed
+      and live events may overlap.
+    - Sends a comment when idle, so proxies keep the connection open.
+    - Ends when the subscription overflowed; unsubscribes when the client disconnects.
+    """
+    keepalive = keepalive or get_setting('KEEPALIVE')
+    last_id = None
+    try:
+        yield b'retry: 3000\n\n'
+        for event in events:
+            last_id = event.id
+            yield event.encoded
+        while not subscription.overflowed:
+            event = await subscription.get(keepalive)
+            if event is None:
+                yield b': keepalive\n\n'
+            elif last_id is None or event.id is None or event.id > last_id:
+                yield event.encoded
+    finally:
+        subscription.close()
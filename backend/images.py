@@ -0,0 +1,188 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Sent with the model as sender and `pk` once the renditions of an instance are recorded
+renditions_ready = Signal()
+
+# Rendition name -> bounding box in pixels
+RENDITIONS = {
+    'thumbnail': (160, 160),
+    'card': (480, 360),
+    'full': (1600, 1600),
+}
+WEBP_QUALITY = 80
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the shared worker pool for image processing.
+    - Pillow releases the GIL while decoding, resizing and encoding, so threads scale.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_PROCESSING_WORKERS, thread_name_prefix='image-renditions'
+            )
+    return _executor
+
+
+def rendition_name(name, size):
+    """
+    Returns the storage name of a rendition, e.g. offers/renditions/logo_card.webp.
+    """
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'renditions', f'{stem}_{size}.webp')
+
+
+def render(image, box):
+    """
+    Resizes an image into the bounding box and encodes it as WebP.
+    - Pillow only writes EXIF data when asked to, so the metadata is stripped.
+    """
+    image = image.copy()
+    image.thumbnail(box, Image.Resampling.LANCZOS)
+    output = BytesIO()
+    image.save(output, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return output.getvalue()
+
+
+def create_renditions(name):
+    """
+    Creates all renditions of a stored image.
+    Returns a dict mapping rendition names to storage names.
+    """
+    with default_storage.open(name, 'rb') as file:
+        image = Image.open(file)
+        # Apply the EXIF orientation before the metadata is dropped
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    renditions = {}
+    for size, box in RENDITIONS.items():
+        target = rendition_name(name, size)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        renditions[size] = default_storage.save(target, ContentFile(render(image, box)))
+    return renditions
+
+
+def process_image(model, pk, field_name, renditions_field, name):
+    """
+    Creates the renditions of an uploaded image and records them on the instance.
+    - Skipped if the image was replaced in the meantime.
+    - Renditions of the previous image are deleted.
+    """
+    try:
+        renditions = create_renditions(name)
+    except Exception:
+        logger.exception("Creating renditions of %s failed.", name)
+        return
+
+    previous = model.objects.filter(pk=pk).values_list(renditions_field, flat=True).first() or {}
+    values = {renditions_field: renditions}
+    # update() skips auto_now fields, the image URLs in responses change with the renditions
+    values.update({field.name: timezone.now() for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)})
+    updated = model.objects.filter(pk=pk, **{field_name: name}).update(**values)
+    stale = set(previous.values()) - set(renditions.values()) if updated else set(renditions.values())
+    if updated:
+        renditions_ready.send(sender=model, pk=pk)
+    for stale_name in stale:
+        default_storage.delete(stale_name)
+
+
+def run_in_worker(function, *args):
+    """
+    Runs a job on a pool thread and closes the thread's database connections afterwards.
+    - Pool threads live on without requests, so nothing else would close
+      them; an idle worker would hold its connections open indefinitely.
+    """
+    try:
+        function(*args)
+    finally:
+        connections.close_all()
+
+
+def schedule_renditions(model, pk, field_name, renditions_field, name):
+    """
+    Hands an image to the worker pool once the upload is committed.
+    - Runs inline if IMAGE_PROCESSING_WORKERS is 0 (e.g. in tests).
+    """
+    def submit():
+        if settings.IMAGE_PROCESSING_WORKERS:
+            get_executor().submit(run_in_worker, process_image, model, pk, field_name, renditions_field, name)
+        else:
+            process_image(model, pk, field_name, renditions_field, name)
+    transaction.on_commit(submit)
+
+
+def track_renditions(model, field_name, renditions_field):
+    """
+    Connects the signal handlers creating renditions for uploads to `field_name`.
+    """
+    def remember_upload(sender, instance, raw=False, **kwargs):
+        field_file = getattr(instance, field_name)
+        # Uploads are written to the storage after the pre_save signal
+        instance._pending_rendition = not raw and bool(field_file) and not field_file._committed
+
+    def process_upload(sender, instance, **kwargs):
+        if getattr(instance, '_pending_rendition', False):
+            instance._pending_rendition = False
+            schedule_renditions(model, instance.pk, field_name, renditions_field, getattr(instance, field_name).name)
+
+    uid = f'renditions_{model.__name__}_{field_name}'
+    pre_save.connect(remember_upload, sender=model, weak=False, dispatch_uid=f'{uid}_pre')
+    post_save.connect(process_upload, sender=model, weak=False, dispatch_uid=f'{uid}_post')
+
+
+def rendition_url(storage, name, renditions, size, request=None):
+    """
+    Returns the URL of the `size` rendition of a stored image, or of the
+    original until the renditions have been created.
+    - Absolute if a request is given, like DRF's file fields.
+    """
+    rendition = (renditions or {}).get(size)
+    url = default_storage.url(rendition) if rendition else storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+class RenditionImageField(serializers.ImageField):
+    """
+    Image field returning the URL of a rendition instead of the original.
+    - The size is taken from `?image_size=` (thumbnail, card, full or original),
+      falling back to `default_size`.
+    - Returns the original until the renditions have been created.
+    """
+
+    def __init__(self, renditions_field, default_size='original', **kwargs):
+        self.renditions_field = renditions_field
+        self.default_size = default_size
+        super().__init__(**kwargs)
+
+    def get_size(self, request):
+        return request.query_params.get('image_size', self.default_size) if request else self.default_size
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        renditions = getattr(value.instance, self.renditions_field, None)
+        return rendition_url(value.storage, value.name, renditions, self.get_size(request), request)
@@ -0,0 +1,294 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float('inf'))
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, float('inf'))
+
+current_metrics = contextvars.ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Timings collected while handling a single request.
+    """
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+def record_sql(execute, sql, params, many, context):
+    """
+    Execute wrapper recording queries for the request of the current context.
+    - Installed on every connection, as async views run their queries on
+      another thread's connection; the context variable follows them there.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_time += time.perf_counter() - start
+        metrics.sql_count += 1
+
+
+def install_sql_recorder(sender, connection, **kwargs):
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+class Histogram:
+    """
+    Cumulative histogram in the Prometheus sense.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    In-memory per-route aggregates of the request metrics.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def observe(self, route, method, status, metrics, duration):
+        with self.lock:
+            entry = self.routes.get((route, method))
+            if entry is None:
+                entry = self.routes[(route, method)] = {
+                    'duration': Histogram(DURATION_BUCKETS),
+                    'queries': Histogram(QUERY_BUCKETS),
+                    'sql_seconds': 0.0,
+                    'serializer_seconds': 0.0,
+                    'budget_exceeded': 0,
+                    'statuses': {},
+                }
+            entry['duration'].observe(duration)
+            entry['queries'].observe(metrics.sql_count)
+            entry['sql_seconds'] += metrics.sql_time
+            entry['serializer_seconds'] += metrics.serializer_time
+            entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+            if metrics.sql_count > get_query_budget(route, method):
+                entry['budget_exceeded'] += 1
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+    def render(self):
+        """
+        Renders all aggregates in the Prometheus text exposition format.
+        """
+        lines = []
+        with self.lock:
+            routes = sorted(self.routes.items())
+
+            def histogram(name, help_text, key):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (route, method), entry in routes:
+                    labels = f'route="{escape(route)}",method="{method}"'
+                    data = entry[key]
+                    for bound, count in zip(data.buckets, data.counts):
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f'{name}_sum{{{labels}}} {data.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {data.count}')
+
+            def counter(name, help_text, value):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for (route, method), entry in routes:
+                    lines.append(f'{name}{{route="{escape(route)}",method="{method}"}} {value(entry)}')
+
+            histogram('coderr_request_duration_seconds', 'Total request duration.', 'duration')
+            histogram('coderr_request_sql_queries', 'SQL queries per request.', 'queries')
+            counter('coderr_request_sql_seconds_total', 'Time spent in SQL queries.', lambda e: e['sql_seconds'])
+            counter('coderr_request_serializer_seconds_total', 'Time spent in serializers.',
+                    lambda e: e['serializer_seconds'])
+            counter('coderr_query_budget_exceeded_total', 'Requests exceeding the SQL query budget.',
+                    lambda e: e['budget_exceeded'])
+
+            lines.append('# HELP coderr_responses_total Responses by status code.')
+            lines.append('# TYPE coderr_responses_total counter')
+            for (route, method), entry in routes:
+                for status, count in sorted(entry['statuses'].items()):
+                    lines.append(
+                        f'coderr_responses_total{{route="{escape(route)}",method="{method}",status="{status}"}} {count}'
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def get_query_budget(route, method):
+    """
+    Returns the SQL query budget of a request: `SQL_QUERY_BUDGETS` of
+    "<method> <route>", else of the route, else `SQL_QUERY_BUDGET`.
+    """
+    budgets = getattr(settings, 'SQL_QUERY_BUDGETS', {})
+    default = getattr(settings, 'SQL_QUERY_BUDGET', 20)
+    return budgets.get(f'{method} {route}', budgets.get(route, default))
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Adds the time spent in the block to the serializer time of the current request.
+    - Nested blocks, e.g. serializers calling other serializers, count once.
+    """
+    metrics = current_metrics.get()
+    if metrics is None or metrics.serializer_depth:
+        yield
+        return
+    metrics.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics.serializer_depth -= 1
+
+
+class TimedRepresentationMixin:
+    def to_representation(self, instance):
+        with timed_serialization():
+            return super().to_representation(instance)
+
+
+@lru_cache(maxsize=None)
+def timed_serializer_class(serializer_class):
+    """
+    Returns a subclass of a serializer recording its `to_representation()` time, once per class.
+    """
+    return type(serializer_class.__name__, (TimedRepresentationMixin, serializer_class), {
+        '__module__': serializer_class.__module__, '__qualname__': serializer_class.__qualname__,
+    })
+
+
+class SerializerTimingMixin:
+    """
+    Viewset mixin recording the time spent in `get_serializer()` serializers as serializer time.
+    - List serializers time each item, so only the representation is measured.
+    - Serializers an action creates itself can use `timed_serialization()`.
+    """
+
+    def get_serializer_class(self):
+        return timed_serializer_class(super().get_serializer_class())
+
+
+class InstrumentationMiddleware:
+    """
+    Records SQL count, SQL time, serializer time and total time per request.
+    - Serializer time is recorded by the views, see `SerializerTimingMixin`.
+    - Exposes them in a `Server-Timing` header.
+    - Aggregates them per route for `/api/_metrics`.
+    - Logs a warning for requests exceeding the SQL query budget of their route.
+    - Works in sync (WSGI) and async (ASGI) middleware chains.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_sql_recorder, dispatch_uid='metrics_sql_recorder')
+        for connection in connections.all(initialized_only=True):
+            install_sql_recorder(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token, start = self.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics, token, start = self.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    def begin(self):
+        metrics = RequestMetrics()
+        return metrics, current_metrics.set(metrics), time.perf_counter()
+
+    def finish(self, request, response, metrics, start):
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        route = match.view_name if match else 'unmatched'
+        registry.observe(route, request.method, response.status_code, metrics, duration)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.sql_count} queries"',
+            f'ser;dur={metrics.serializer_time * 1000:.1f}',
+            f'total;dur={duration * 1000:.1f}',
+        ])
+        budget = get_query_budget(route, request.method)
+        if metrics.sql_count > budget:
+            logger.warning(
+                "%s %s ran %d SQL queries (budget %d).", request.method, request.path, metrics.sql_count, budget
+            )
+        return response
+
+
+def metrics_view(request):
+    """
+    GET /api/_metrics - Per-route request metrics in the Prometheus text format.
+    - Disabled unless `METRICS_ENABLED` or a `METRICS_TOKEN` is configured.
+    - Only reachable from `METRICS_ALLOWED_IPS`, and only for staff users or
+      with `Authorization: Bearer <METRICS_TOKEN>`.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not (token or getattr(settings, 'METRICS_ENABLED', False)):
+        raise Http404
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1']):
+        return HttpResponseForbidden()
+    user = getattr(request, 'user', None)
+    if not (user and user.is_staff) and not (
+        token and constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}')
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,129 @@
+import base64
+from datetime import datetime
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination on a timestamp and the primary key.
+    - Each page continues after the last row of the previous one, so deep
+      pages cost the same as the first page and no COUNT(*) is needed.
+    - Responses have the shape {"next": <url or null>, "results": [...]}.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering_field='created_at', descending=True):
+        self.ordering_field = ordering_field
+        self.descending = descending
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 10
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns the rows following the cursor of the request.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        prefix = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.ordering_field}', f'{prefix}pk')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            value, pk = self.decode_cursor(cursor)
+            lookup = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.ordering_field}__{lookup}': value})
+                | Q(**{self.ordering_field: value, f'pk__{lookup}': pk})
+            )
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, row):
+        value = getattr(row, self.ordering_field).isoformat()
+        return base64.urlsafe_b64encode(f'{value}|{row.pk}'.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            value, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            return datetime.fromisoformat(value), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_row))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Viewset mixin that makes keyset pagination opt-in per request.
+    - `?pagination=cursor` (or a `cursor` parameter) enables keyset pagination.
+    - Without it, the viewset's `pagination_class` keeps the legacy response shape.
+    - The cursor only covers `keyset_ordering_field`: other `?ordering=`
+      values are rejected with 400 instead of being silently ignored.
+    """
+    keyset_ordering_field = 'created_at'
+    pagination_query_param = 'pagination'
+
+    def use_keyset_pagination(self):
+        params = self.request.query_params
+        return params.get(self.pagination_query_param) == 'cursor' or KeysetPagination.cursor_query_param in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_keyset_pagination():
+                self._paginator = KeysetPagination(self.keyset_ordering_field, descending=self.keyset_descending())
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def keyset_descending(self):
+        """
+        Returns whether the requested ordering is descending, the default.
+        """
+        ordering = self.request.query_params.get('ordering') or f'-{self.keyset_ordering_field}'
+        if ordering not in (self.keyset_ordering_field, f'-{self.keyset_ordering_field}'):
+            raise ValidationError({'ordering': [
+                f"Cursor pagination only supports ordering by {self.keyset_ordering_field} "
+                f"or -{self.keyset_ordering_field}."
+            ]})
+        return ordering.startswith('-')
@@ -0,0 +1,127 @@
+import orjson
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Types orjson and msgpack don't handle natively (Decimal, lazy strings,
+# querysets, ...) are converted like DRF's JSONEncoder does
+default = JSONEncoder().default
+
+# Compact output, UTC as "Z" like DRF, non-string dict keys converted like the json module
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """
+    Encodes data to JSON bytes like DRF's JSONRenderer with its default settings.
+    - Line and paragraph separators are escaped like DRF does, so the output
+      stays a strict JavaScript subset.
+    """
+    content = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson.
+    - Produces the same bytes as DRF's JSONRenderer for compact UTF-8 output.
+    - Indented output (`Accept: application/json; indent=4`, the browsable
+      API) and data orjson rejects, e.g. integers beyond 64 bits, are
+      rendered by DRF's renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None and self.compact and not self.ensure_ascii:
+            try:
+                return dumps(data)
+            except orjson.JSONEncodeError:
+                pass
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser decoding UTF-8 request bodies with orjson.
+    - orjson rejects NaN and Infinity like DRF's strict parser.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+def require_msgpack(cls):
+    if msgpack is None:
+        raise ImproperlyConfigured(f"{cls.__name__} requires msgpack to be installed.")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders MessagePack for `Accept: application/msgpack` or `?format=msgpack`.
+    - Values are converted like in JSON responses: decimals and datetimes
+      arrive as the same strings, so clients can switch formats freely.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def __init__(self):
+        require_msgpack(type(self))
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses `Content-Type: application/msgpack` request bodies.
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def __init__(self):
+        require_msgpack(type(self))
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Accepts `Accept: text/event-stream` in content negotiation.
+    - Event streams are StreamingHttpResponses and bypass rendering; errors
+      raised before the stream starts are rendered as JSON.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
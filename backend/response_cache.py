@@ -0,0 +1,242 @@
+import functools
+import hashlib
+import json
+import math
+import time
+from datetime import datetime, timezone
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+from .db_router import primary_reads
+
+DEFAULTS = {
+    # Alias of the CACHES entry holding responses and tag versions
+    'ALIAS': 'default',
+    # Seconds a response is kept unless one of its tags is invalidated first
+    'TIMEOUT': 300,
+    'ENABLED': True,
+}
+
+# Key scopes: responses shared by everyone, split by anonymous/authenticated, or per user
+PUBLIC = 'public'
+AUTHENTICATED = 'authenticated'
+USER = 'user'
+
+
+def get_setting(name):
+    return getattr(settings, 'RESPONSE_CACHE', {}).get(name, DEFAULTS[name])
+
+
+def get_cache():
+    return caches[get_setting('ALIAS')]
+
+
+def tag_key(tag):
+    return f'response-tag:{tag}'
+
+
+def scope_key(request, scope):
+    if scope == PUBLIC:
+        return PUBLIC
+    if not request.user or not request.user.is_authenticated:
+        return 'anonymous'
+    return f'user:{request.user.pk}' if scope == USER else AUTHENTICATED
+
+
+def response_cache_key(request, scope=PUBLIC):
+    """
+    Cache key of a response, built from the route, the query params and the auth scope.
+    """
+    raw = json.dumps([
+        request.get_host(), request.path, sorted(request.query_params.lists()), scope_key(request, scope),
+    ])
+    return 'response:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def invalidate_tags(*tags):
+    """
+    Invalidates every cached response carrying one of the tags, e.g. `offer:42`.
+    - A tag stores the time of its last invalidation; responses computed
+      before that time are discarded on read, so no key scan is needed.
+    - Runs immediately and again on commit, so a response computed from
+      the old rows while the transaction commits is discarded as well.
+    """
+    def invalidate():
+        now = time.time()
+        get_cache().set_many({tag_key(tag): now for tag in tags}, timeout=None)
+
+    if tags and get_setting('ENABLED'):
+        invalidate()
+        transaction.on_commit(invalidate)
+
+
+def is_current(entry, keys, versions):
+    """
+    Returns whether none of the tags of an entry was invalidated after it was computed.
+    - A missing tag, e.g. evicted by the cache, counts as invalidated: the
+      invalidations it stored are lost.
+    """
+    if len(versions) < len(keys):
+        return False
+    return all(invalidated_at < entry['started'] for invalidated_at in versions.values())
+
+
+def get_current_entry(key):
+    """
+    Returns the cache entry of a response, or None if it is missing or invalidated.
+    """
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    keys = {tag_key(tag) for tag in entry['tags']}
+    return entry if is_current(entry, keys, cache.get_many(keys)) else None
+
+
+async def aget_current_entry(key):
+    """
+    Async `get_current_entry()`.
+    """
+    cache = get_cache()
+    entry = await cache.aget(key)
+    if entry is None:
+        return None
+    keys = {tag_key(tag) for tag in entry['tags']}
+    return entry if is_current(entry, keys, await cache.aget_many(keys)) else None
+
+
+def get_cached_response(key):
+    """
+    Returns the cached data of a response, or None if it is missing or invalidated.
+    """
+    entry = get_current_entry(key)
+    return None if entry is None else entry['data']
+
+
+async def aget_cached_response(key):
+    entry = await aget_current_entry(key)
+    return None if entry is None else entry['data']
+
+
+def computed_at(started):
+    return (datetime.fromtimestamp(started, timezone.utc),)
+
+
+class CachedVersion:
+    """
+    Version of a response cached with `cache_response`: the time it was
+    computed, while none of its tags was invalidated since.
+    - For `conditional_get`: a 304 costs the cache reads of the response
+      and its tags, no database query. Without a current entry the action
+      runs and the response gets the version of the entry it stores.
+    - Use the `scope` of the `cache_response` it pairs with.
+    """
+
+    def __init__(self, request, scope=PUBLIC):
+        self.key = response_cache_key(request, scope)
+
+    def get(self):
+        entry = get_current_entry(self.key) if get_setting('ENABLED') else None
+        return None if entry is None else computed_at(entry['started'])
+
+    async def aget(self):
+        entry = await aget_current_entry(self.key) if get_setting('ENABLED') else None
+        return None if entry is None else computed_at(entry['started'])
+
+    def of_response(self, response):
+        """
+        Returns the version of a response computed by the action, None if it wasn't cached.
+        """
+        started = getattr(response, 'cache_started', None)
+        return None if started is None else computed_at(started)
+
+
+def cache_entry(view, response, tags, started):
+    """
+    Returns the cache entry of a response, or None if it must not be cached.
+    """
+    if not isinstance(response, Response) or response.status_code != 200:
+        return None
+    response['X-Cache'] = 'MISS'
+    response.cache_started = started
+    return {'data': response.data, 'tags': list(tags(view, response.data)), 'started': started}
+
+
+def store_entry(key, entry):
+    """
+    Stores a response entry and creates its missing tags.
+    - New tags are marked invalidated just before the response was
+      computed, so entries computed before a tag was evicted stay invalid;
+      `add()` never overwrites a concurrent invalidation.
+    """
+    cache = get_cache()
+    invalidated_at = math.nextafter(entry['started'], 0)
+    for tag in entry['tags']:
+        cache.add(tag_key(tag), invalidated_at, timeout=None)
+    cache.set(key, entry, get_setting('TIMEOUT'))
+
+
+async def astore_entry(key, entry):
+    cache = get_cache()
+    invalidated_at = math.nextafter(entry['started'], 0)
+    for tag in entry['tags']:
+        await cache.aadd(tag_key(tag), invalidated_at, timeout=None)
+    await cache.aset(key, entry, get_setting('TIMEOUT'))
+
+
+def cached_hit(data):
+    response = Response(data)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def cache_response(tags, scope=PUBLIC):
+    """
+    Caches the data of successful responses of a viewset method.
+    - `tags(view, data)` returns the tags the response depends on.
+    - Runs inside the method, so authentication and permission checks
+      happen before a cached response is served.
+    - Only the data is cached, content negotiation and rendering still
+      happen per request.
+    - Misses read from the primary, so a lagging replica can't refill the
+      cache with data from before an invalidation.
+    - Supports async handlers, see `backend.async_views`.
+    """
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if not get_setting('ENABLED'):
+                    return await method(view, request, *args, **kwargs)
+                key = response_cache_key(request, scope)
+                data = await aget_cached_response(key)
+                if data is not None:
+                    return cached_hit(data)
+                started = time.time()
+                with primary_reads():
+                    response = await method(view, request, *args, **kwargs)
+                entry = cache_entry(view, response, tags, started)
+                if entry is not None:
+                    await astore_entry(key, entry)
+                return response
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not get_setting('ENABLED'):
+                return method(view, request, *args, **kwargs)
+            key = response_cache_key(request, scope)
+            data = get_cached_response(key)
+            if data is not None:
+                return cached_hit(data)
+            started = time.time()
+            with primary_reads():
+                response = method(view, request, *args, **kwargs)
+            entry = cache_entry(view, response, tags, started)
+            if entry is not None:
+                store_entry(key, entry)
+            return response
+        return wrapper
+    return decorator
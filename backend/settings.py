@@ -10,7 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
+from backend.database import database_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -20,13 +23,50 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 AUTH_USER_MODEL = 'accounts.User'
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
+# Datenbank über DATABASE_URL (Standard: SQLite im Projektordner), persistente
+# Verbindungen, Pool und SQLite-Pragmas über Umgebungsvariablen, siehe backend/database.py
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(os.environ.get('DATABASE_URL') or f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+}
+# Lese-Replikas, lokal als SQLite-Dateien (kommagetrennt) testbar, z.B.
+# SQLITE_REPLICAS=db_replica.sqlite3 nach `python3 manage.py sync_sqlite_replicas`
+for index, path in enumerate(filter(None, os.environ.get('SQLITE_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = database_config(
+        f"sqlite:///{BASE_DIR / path.strip()}", TEST={'MIRROR': 'default'},
+    )
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['backend.db_router.ReplicaRouter']
+# Nach einem Schreibzugriff liest ein Benutzer PIN_SECONDS lang von der Primärdatenbank
+DATABASE_REPLICA_ROUTING = {
+    'PIN_SECONDS': 5,
+    'HEALTH_CHECK_INTERVAL': 10,
 }
+# Cache für alle Worker: Redis-kompatibler Server über REDIS_URL,
+# Datei-Cache über CACHE_DIR, sonst lokaler Speicher (pro Prozess)
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'coderr',
+        }
+    }
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -51,6 +91,7 @@ INSTALLED_APPS = [
     'accounts',
     'orders',
     'offers',
+    'benchmarks',
     'rest_framework',
     'corsheaders',
     'django_filters',
@@ -58,6 +99,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.metrics.InstrumentationMiddleware',
+    'backend.async_views.AsyncURLConfMiddleware',
+    'backend.db_router.DatabaseRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -69,6 +113,8 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'backend.urls'
+# URLs für ASGI-Requests mit asynchronen Lese-Views
+ASYNC_URLCONF = 'backend.urls_async'
 
 TEMPLATES = [
     {
@@ -141,12 +187,84 @@ from datetime import timedelta
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'backend.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,  # Anzahl der Ergebnisse pro Seite
+    # JSON über orjson, siehe backend/renderers.py
+    'DEFAULT_RENDERER_CLASSES': [
+        'backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'backend.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+# MessagePack per "Accept: application/msgpack", wenn msgpack installiert ist
+if find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].insert(1, 'backend.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].insert(1, 'backend.renderers.MessagePackParser')
+
+
+# Cache-Dauer der /api/base-info/ Statistiken in Sekunden
+BASE_INFO_CACHE_TIMEOUT = 60
+
+# Worker-Threads für Bild-Renditions (0 = synchron im Request)
+IMAGE_PROCESSING_WORKERS = 2
+
+# Cache für die Token-Authentifizierung, siehe backend/authentication.py
+TOKEN_AUTH_CACHE = {
+    'LOCAL_MAX_SIZE': 1024,
+    'LOCAL_TIMEOUT': 30,
+    'SHARED_CACHE': None,
+    'SHARED_TIMEOUT': 300,
+}
+# Mehrere Worker: gemeinsamer Cache, damit gelöschte Tokens sofort überall abgelehnt werden
+if os.environ.get('REDIS_URL') or os.environ.get('CACHE_DIR'):
+    TOKEN_AUTH_CACHE['SHARED_CACHE'] = 'default'
+
+# Maximale Anzahl SQL-Queries pro Request, darüber wird eine Warnung geloggt
+SQL_QUERY_BUDGET = 20
+# Abweichende Budgets pro Route (view name) oder pro Methode und Route, z.B. {'GET offers-list': 3}
+SQL_QUERY_BUDGETS = {
+    # Listen dürfen nicht mit der Seitengröße wachsen (N+1)
+    'GET offers-list': 5,
+    'GET orders-list': 5,
+}
+
+# /api/_metrics (Prometheus) ist abgeschaltet, solange weder METRICS_ENABLED noch METRICS_TOKEN gesetzt ist
+METRICS_ENABLED = False
+# Bearer-Token für den Scraper (Authorization: Bearer <Token>), alternativ reicht ein Staff-Login
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+# IP-Adressen, die /api/_metrics abrufen dürfen
+METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+# Wie lange ein Idempotency-Key bei Bestellungen wiederholt wird, in Sekunden
+ORDER_IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Listen direkt aus values_list()-Zeilen serialisieren, siehe backend/compiled_serializers.py
+COMPILED_LIST_SERIALIZERS = True
+
+# Response-Cache der Lese-Endpunkte, siehe backend/response_cache.py
+RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'ENABLED': True,
 }
 
+# Server-Sent Events (/api/orders/events/), siehe backend/events.py
+# Mit REDIS_URL erreichen Events die Verbindungen aller Worker, sonst nur die des eigenen Prozesses
+EVENT_STREAM = {
+    'BACKEND': 'backend.events.LocalBackend',
+    'OPTIONS': {},
+    'QUEUE_SIZE': 100,
+    'KEEPALIVE': 15,
+}
+if os.environ.get('REDIS_URL'):
+    EVENT_STREAM['BACKEND'] = 'backend.events.RedisBackend'
+    EVENT_STREAM['OPTIONS'] = {'url': os.environ['REDIS_URL']}
@@ -20,6 +20,7 @@ from accounts.views import RegisterView, LoginView, BaseInfoView, UserViewSet, R
 from offers.views import OfferDetailViewSet
 from orders.views import OrderViewSet, OrderCountView, CompletedOrderCountView 
 from rest_framework.authtoken.views import obtain_auth_token
+from backend.metrics import metrics_view
 
 urlpatterns = [
 
@@ -51,4 +52,8 @@ urlpatterns = [
     # Token Authentication #
 
     path('api/token/', obtain_auth_token, name='api_token_auth'),
+
+    # Monitoring #
+
+    path('api/_metrics', metrics_view, name='metrics'),
 ]
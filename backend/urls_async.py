@@ -0,0 +1,37 @@
+"""
+URL configuration for ASGI requests (see `ASYNC_URLCONF`).
+
+Serves the public read paths with async views and falls back to the
+regular URL configuration for everything else.
+"""
+from django.urls import path
+from accounts.views import BaseInfoView, ReviewViewSet
+from offers.views import OfferViewSet, OfferDetailViewSet
+from orders.views import OrderCountView, CompletedOrderCountView, OrderEventsView
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+
+    # Accounts #
+
+    path('api/base-info/', BaseInfoView.as_async_view(), name='base-info'),
+    path('api/reviews/', ReviewViewSet.as_async_view({'get': 'list', 'post': 'create'}), name='reviews'),
+
+    # Orders / Offers #
+
+    path('api/order-count/<int:business_user_id>/', OrderCountView.as_async_view(), name='order-count'),
+    path('api/completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_async_view(), name='completed-order-count'),
+    # Server-sent events, only served under ASGI
+    path('api/orders/events/', OrderEventsView.as_async_view(), name='order-events'),
+
+    # Same init kwargs as the routes of the router in offers.urls
+    path('api/offers/', OfferViewSet.as_async_view(
+        {'get': 'list', 'post': 'create'}, basename='offers', detail=False, suffix='List',
+    ), name='offers-list'),
+    path('api/offers/<int:pk>/', OfferViewSet.as_async_view(
+        {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+        basename='offers', detail=True, suffix='Instance',
+    ), name='offers-detail'),
+    path('api/offerdetails/<int:pk>/', OfferDetailViewSet.as_async_view({'get': 'retrieve'}), name='offerdetails'),
+
+] + sync_urlpatterns
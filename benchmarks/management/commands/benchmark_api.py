@@ -0,0 +1,66 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.workload import WorkloadContext, dataset_size, run_http, run_in_process
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """
+    Replays a mixed workload against every API route and reports latencies.
+    - In-process through the test client (default), including SQL query counts.
+    - Against a running server with --url, optionally with concurrent clients.
+    """
+    help = "Benchmarks all API routes and writes p50/p95/p99 latency, query counts and throughput as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help="Measured requests (default: 1000).")
+        parser.add_argument('--warmup', type=int, default=50, help="Unmeasured warm-up requests (default: 50).")
+        parser.add_argument('--url', help="Base URL of a running server, e.g. http://localhost:8000.")
+        parser.add_argument('--concurrency', type=int, default=1, help="Client threads for --url (default: 1).")
+        parser.add_argument('--random-seed', type=int, default=0, help="Seed for the request mix (default: 0).")
+        parser.add_argument('--output', default='bench_output.json', help="JSON report file.")
+
+    def handle(self, *args, **options):
+        try:
+            context = WorkloadContext(options['random_seed'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        if options['url']:
+            mode = 'http'
+            result = run_http(context, options['url'], options['requests'], options['concurrency'], options['warmup'])
+        else:
+            mode = 'in-process'
+            result = run_in_process(context, options['requests'], options['warmup'])
+
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'mode': mode,
+            'concurrency': options['concurrency'] if options['url'] else 1,
+            'dataset': dataset_size(),
+            **result,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        self.stdout.write(f"{'route':<24}{'reqs':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}")
+        for name, route in report['routes'].items():
+            queries = f"{route['mean_queries']:.1f}" if route['mean_queries'] is not None else '-'
+            self.stdout.write(
+                f"{name:<24}{route['requests']:>6}{route['p50_ms']:>9.2f}{route['p95_ms']:>9.2f}"
+                f"{route['p99_ms']:>9.2f}{queries:>9}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['requests']} requests, {report['throughput_rps']:.1f} req/s, report written to {options['output']}."
+        ))
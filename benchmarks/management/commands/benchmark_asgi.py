@@ -0,0 +1,74 @@
+import json
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from benchmarks.workload import ASYNC_ROUTES, WorkloadContext, dataset_size, run_asgi, run_http, run_wsgi
+from .benchmark_api import current_commit
+
+
+class Command(BaseCommand):
+    """
+    Compares the throughput of the public read routes under WSGI and ASGI.
+    - In-process (default): Django's WSGI handler with N threads against its
+      ASGI handler with N concurrent tasks, using the same request plan.
+    - Against running servers with --wsgi-url and --asgi-url, started with
+      the same number of workers.
+    """
+    help = "Benchmarks the public read routes under WSGI and ASGI at equal concurrency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help="Measured requests per mode (default: 1000).")
+        parser.add_argument('--warmup', type=int, default=50, help="Unmeasured warm-up requests (default: 50).")
+        parser.add_argument('--concurrency', type=int, default=4, help="Threads/tasks per mode (default: 4).")
+        parser.add_argument('--wsgi-url', help="Base URL of a running WSGI server.")
+        parser.add_argument('--asgi-url', help="Base URL of a running ASGI server.")
+        parser.add_argument('--response-cache', action='store_true',
+                            help="Keep the response cache enabled (disabled by default to measure the views).")
+        parser.add_argument('--random-seed', type=int, default=0, help="Seed for the request mix (default: 0).")
+        parser.add_argument('--output', default='bench_asgi.json', help="JSON report file.")
+
+    def handle(self, *args, **options):
+        if bool(options['wsgi_url']) != bool(options['asgi_url']):
+            raise CommandError("--wsgi-url and --asgi-url must be given together.")
+
+        results = {}
+        for mode in ('wsgi', 'asgi'):
+            try:
+                context = WorkloadContext(options['random_seed'])
+            except ValueError as error:
+                raise CommandError(str(error))
+            arguments = (context, options['requests'], options['concurrency'], options['warmup'])
+            if options['wsgi_url']:
+                results[mode] = run_http(context, options[f'{mode}_url'], *arguments[1:], routes=ASYNC_ROUTES)
+                continue
+            with override_settings(
+                RESPONSE_CACHE={'ENABLED': options['response_cache']},
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'localhost', 'testserver'],
+            ):
+                results[mode] = (run_wsgi if mode == 'wsgi' else run_asgi)(*arguments)
+
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'mode': 'http' if options['wsgi_url'] else 'in-process',
+            'concurrency': options['concurrency'],
+            'dataset': dataset_size(),
+            **results,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        self.stdout.write(f"{'route':<24}{'wsgi p50':>10}{'asgi p50':>10}{'wsgi p95':>10}{'asgi p95':>10}")
+        for name, route in results['wsgi']['routes'].items():
+            other = results['asgi']['routes'].get(name)
+            if other is None:
+                continue
+            self.stdout.write(
+                f"{name:<24}{route['p50_ms']:>10.2f}{other['p50_ms']:>10.2f}"
+                f"{route['p95_ms']:>10.2f}{other['p95_ms']:>10.2f}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"WSGI {results['wsgi']['throughput_rps']:.1f} req/s, ASGI {results['asgi']['throughput_rps']:.1f} req/s "
+            f"at concurrency {options['concurrency']}, report written to {options['output']}."
+        ))
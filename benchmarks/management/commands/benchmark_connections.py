@@ -0,0 +1,97 @@
+import json
+import threading
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from benchmarks.workload import WorkloadContext, dataset_size, run_wsgi
+from .benchmark_api import current_commit
+
+
+class Command(BaseCommand):
+    """
+    Compares per-request database connections with persistent connections.
+    - Replays the read routes through the WSGI handler twice with the same
+      request plan: CONN_MAX_AGE=0 (a new connection, including the SQLite
+      pragmas, per request) and the configured persistent CONN_MAX_AGE.
+    - Connections are closed between requests like a WSGI server does.
+    - Counts the connections opened in each mode.
+    """
+    help = "Benchmarks request latency with per-request vs. persistent database connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help="Measured requests per mode (default: 1000).")
+        parser.add_argument('--warmup', type=int, default=50, help="Unmeasured warm-up requests (default: 50).")
+        parser.add_argument('--concurrency', type=int, default=4, help="Client threads (default: 4).")
+        parser.add_argument('--max-age', type=int, default=600,
+                            help="CONN_MAX_AGE of the persistent mode (default: 600).")
+        parser.add_argument('--random-seed', type=int, default=0, help="Seed for the request mix (default: 0).")
+        parser.add_argument('--output', default='bench_connections.json', help="JSON report file.")
+
+    def handle(self, *args, **options):
+        if connection.settings_dict['OPTIONS'].get('pool'):
+            raise CommandError("The database uses a connection pool, disable DB_POOL_MAX_SIZE to compare.")
+
+        lock = threading.Lock()
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            with lock:
+                opened.append(connection.alias)
+
+        results = {}
+        config = connections.settings['default']
+        original_max_age = config['CONN_MAX_AGE']
+        connection_created.connect(count_connection, dispatch_uid='benchmark_connections')
+        try:
+            for mode, max_age in (('per_request', 0), ('persistent', options['max_age'])):
+                try:
+                    context = WorkloadContext(options['random_seed'])
+                except ValueError as error:
+                    raise CommandError(str(error))
+                config['CONN_MAX_AGE'] = max_age
+                connections.close_all()
+                opened.clear()
+                with override_settings(
+                    RESPONSE_CACHE={'ENABLED': False},
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'localhost'],
+                ):
+                    results[mode] = run_wsgi(
+                        context, options['requests'], options['concurrency'], options['warmup'],
+                        close_connections=True,
+                    )
+                results[mode]['conn_max_age'] = max_age
+                results[mode]['connections_opened'] = len(opened)
+        finally:
+            config['CONN_MAX_AGE'] = original_max_age
+            connection_created.disconnect(dispatch_uid='benchmark_connections')
+            connections.close_all()
+
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'vendor': connection.vendor,
+            'options': {key: str(value) for key, value in connection.settings_dict['OPTIONS'].items()},
+            'concurrency': options['concurrency'],
+            'dataset': dataset_size(),
+            **results,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        self.stdout.write(f"{'route':<24}{'new p50':>10}{'kept p50':>10}{'new p95':>10}{'kept p95':>10}")
+        for name, route in results['per_request']['routes'].items():
+            other = results['persistent']['routes'].get(name)
+            if other is None:
+                continue
+            self.stdout.write(
+                f"{name:<24}{route['p50_ms']:>10.2f}{other['p50_ms']:>10.2f}"
+                f"{route['p95_ms']:>10.2f}{other['p95_ms']:>10.2f}"
+            )
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode}: {result['throughput_rps']:.1f} req/s, {result['connections_opened']} connections opened"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
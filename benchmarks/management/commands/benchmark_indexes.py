@@ -0,0 +1,104 @@
+import json
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from accounts.models import Review, User
+from offers.models import Offer
+from orders.models import Order
+from benchmarks.seed import seed_dataset
+
+# Indexes that back the hot filter/order paths of the API
+BENCHMARKED_INDEXES = {
+    User: ['user_type_idx', 'user_business_idx'],
+    Review: ['review_business_updated_idx'],
+    Offer: ['offer_min_price_idx', 'offer_max_price_idx', 'offer_min_delivery_idx', 'offer_user_created_idx'],
+    Order: ['order_business_status_idx', 'order_customer_created_idx', 'order_business_created_idx'],
+}
+
+
+def endpoint_queries():
+    """
+    Returns the queries the API endpoints run, keyed by endpoint.
+    - Uses the busiest business user and customer of the dataset.
+    """
+    business_id = Order.objects.values_list('business_user_id', flat=True).first()
+    customer_id = Order.objects.values_list('customer_user_id', flat=True).first()
+    return {
+        'order-count': Order.objects.filter(business_user_id=business_id, status='in_progress'),
+        'orders (customer)': Order.objects.filter(customer_user_id=customer_id).order_by('-created_at')[:10],
+        'orders (business)': Order.objects.filter(business_user_id=business_id).order_by('-created_at')[:10],
+        'offers ?min_price': Offer.objects.filter(min_price__gte=2000).order_by('min_price')[:10],
+        'offers ?price_min': Offer.objects.filter(max_price__gte=20000).order_by('-created_at', '-id')[:10],
+        'offers ?max_delivery_time': Offer.objects.filter(min_delivery_time__lte=5).order_by('min_delivery_time')[:10],
+        'offers ?creator_id': Offer.objects.filter(user_id=business_id).order_by('-created_at')[:10],
+        'reviews ?business_user_id': Review.objects.filter(business_user_id=business_id).order_by('-updated_at'),
+        'profiles/business': User.objects.filter(type='business'),
+        'base-info business count': User.objects.filter(type='business').values('id'),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the endpoint queries with and without the hot-path indexes.
+    - Optionally seeds a large dataset first.
+    - Temporarily drops the indexes for the "before" run, so use a benchmark database.
+    """
+    help = "Reports EXPLAIN plans and latencies of the endpoint queries before/after the hot-path indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help="Seed a dataset before benchmarking.")
+        parser.add_argument('--orders', type=int, default=1_000_000, help="Orders to seed (default: 1000000).")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per query (default: 5).")
+        parser.add_argument('--output', help="Write the report as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            orders = options['orders']
+            seed_dataset(
+                business_users=max(orders // 1000, 10), customers=max(orders // 50, 100),
+                offers=max(orders // 100, 100), orders=orders, reviews=orders // 10,
+                log=self.stdout.write,
+            )
+
+        queries = endpoint_queries()
+        report = {'after': self.run_queries(queries, options['repeat'])}
+
+        self.stdout.write("Dropping hot-path indexes for the baseline run...")
+        self.alter_indexes('remove_index')
+        try:
+            report['before'] = self.run_queries(queries, options['repeat'])
+        finally:
+            self.alter_indexes('add_index')
+
+        for name in queries:
+            before, after = report['before'][name], report['after'][name]
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(f"  before: {before['median_ms']:.2f} ms  {before['plan']}")
+            self.stdout.write(f"  after:  {after['median_ms']:.2f} ms  {after['plan']}")
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+    def alter_indexes(self, operation):
+        with connection.schema_editor() as editor:
+            for model, names in BENCHMARKED_INDEXES.items():
+                for index in model._meta.indexes:
+                    if index.name in names:
+                        getattr(editor, operation)(model, index)
+
+    def run_queries(self, queries, repeat):
+        results = {}
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {
+                'median_ms': statistics.median(timings),
+                'plan': ' | '.join(queryset.explain().splitlines()),
+            }
+        return results
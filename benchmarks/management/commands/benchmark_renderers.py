@@ -0,0 +1,82 @@
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from backend.renderers import FastJSONParser, FastJSONRenderer, MessagePackParser, MessagePackRenderer, msgpack
+from benchmarks.workload import dataset_size
+from offers.models import Offer
+from offers.serializers import OfferSerializer
+from orders.models import Order
+from orders.serializers import OrderSerializer
+from .benchmark_api import current_commit
+
+
+class Command(BaseCommand):
+    """
+    Compares DRF's JSON renderer and parser with the orjson and MessagePack ones.
+    - Payloads are lists of `OfferSerializer` and `OrderSerializer` data, the
+      shape of the list and detail responses.
+    - Fails if the orjson output differs from DRF's.
+    - Reports the median time of `--repeat` runs and the payload size.
+    """
+    help = "Benchmarks the JSON and MessagePack renderers and parsers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help="Rows per payload (default: 500).")
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per renderer (default: 20).")
+        parser.add_argument('--output', default='bench_renderers.json', help="JSON report file.")
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            timings.append(time.perf_counter() - start)
+        return result, statistics.median(timings) * 1000
+
+    def handle(self, *args, **options):
+        if msgpack is None:
+            raise CommandError("msgpack is not installed.")
+        rows, repeat = options['rows'], options['repeat']
+        payloads = {
+            'offers': OfferSerializer(Offer.objects.for_detail().order_by('-pk')[:rows], many=True).data,
+            'orders': OrderSerializer(Order.objects.order_by('-pk')[:rows], many=True).data,
+        }
+        formats = {
+            'drf_json': (JSONRenderer(), JSONParser()),
+            'orjson': (FastJSONRenderer(), FastJSONParser()),
+            'msgpack': (MessagePackRenderer(), MessagePackParser()),
+        }
+
+        results = {}
+        for name, payload in payloads.items():
+            results[name] = {'rows': len(payload)}
+            for format_name, (renderer, parser) in formats.items():
+                content, render_ms = self.measure(lambda: renderer.render(payload), repeat)
+                _, parse_ms = self.measure(lambda: parser.parse(BytesIO(content)), repeat)
+                results[name][format_name] = {'render_ms': render_ms, 'parse_ms': parse_ms, 'bytes': len(content)}
+            if FastJSONRenderer().render(payload) != JSONRenderer().render(payload):
+                raise CommandError(f"The orjson renderer produced different JSON for {name}.")
+
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'repeat': repeat,
+            'dataset': dataset_size(),
+            'payloads': results,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        self.stdout.write(f"{'payload':<10}{'format':<10}{'render ms':>12}{'parse ms':>12}{'bytes':>12}")
+        for name, result in results.items():
+            for format_name in formats:
+                entry = result[format_name]
+                self.stdout.write(
+                    f"{name:<10}{format_name:<10}{entry['render_ms']:>12.2f}{entry['parse_ms']:>12.2f}{entry['bytes']:>12}"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.authtoken.models import Token
+from accounts.models import Review, User
+from benchmarks.workload import percentile
+from .benchmark_api import current_commit
+
+
+class Command(BaseCommand):
+    """
+    Submits the same review concurrently to check the duplicate protection.
+    - Every round creates a fresh customer whose `--concurrency` threads
+      post a review for the same business profile at once.
+    - Exactly one request per round may succeed, the others must get a 400;
+      the report counts the statuses, duplicate rows, latencies and queries.
+    - The customers and their reviews are deleted afterwards.
+    """
+    help = "Benchmarks concurrent submissions of the same review."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=50, help="Contested review submissions (default: 50).")
+        parser.add_argument('--concurrency', type=int, default=8, help="Requests per round (default: 8).")
+        parser.add_argument('--output', default='bench_reviews.json', help="JSON report file.")
+
+    def handle(self, *args, **options):
+        business = User.objects.filter(type='business').first()
+        if business is None:
+            raise CommandError("No business profiles found, run seed_data first.")
+
+        concurrency = options['concurrency']
+        barrier = threading.Barrier(concurrency)
+        local = threading.local()
+        lock = threading.Lock()
+        statuses = Counter()
+        latencies = []
+        created_queries = []
+
+        def send(key):
+            if not hasattr(local, 'client'):
+                local.client = Client(HTTP_HOST='localhost')
+            barrier.wait()
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                response = local.client.post(
+                    '/api/reviews/', {'business_user': business.pk, 'rating': 5},
+                    content_type='application/json', HTTP_AUTHORIZATION=f'Token {key}',
+                )
+            latency = (time.perf_counter() - start) * 1000
+            close_old_connections()
+            with lock:
+                statuses[response.status_code] += 1
+                latencies.append(latency)
+                if response.status_code == 201:
+                    created_queries.append(len(queries))
+
+        prefix = f'bench-review-{uuid.uuid4().hex[:8]}'
+        customers = []
+        started = time.perf_counter()
+        try:
+            with override_settings(
+                RESPONSE_CACHE={'ENABLED': False},
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'localhost'],
+            ), ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for number in range(options['rounds']):
+                    customer = User.objects.create_user(
+                        username=f'{prefix}-{number}', email=f'{prefix}-{number}@example.com',
+                        password='bench', type='customer',
+                    )
+                    customers.append(customer.pk)
+                    key = Token.objects.create(user=customer).key
+                    list(executor.map(send, [key] * concurrency))
+            elapsed = time.perf_counter() - started
+            duplicates = (
+                Review.objects.filter(reviewer__in=customers)
+                .values('business_user', 'reviewer').annotate(count=Count('id')).filter(count__gt=1).count()
+            )
+            reviews = Review.objects.filter(reviewer__in=customers).count()
+        finally:
+            User.objects.filter(pk__in=customers).delete()
+            connections.close_all()
+
+        latencies.sort()
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'vendor': connection.vendor,
+            'rounds': options['rounds'],
+            'concurrency': concurrency,
+            'elapsed_s': elapsed,
+            'statuses': {str(code): count for code, count in sorted(statuses.items())},
+            'reviews_created': reviews,
+            'duplicate_pairs': duplicates,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'mean_queries_per_create': sum(created_queries) / len(created_queries) if created_queries else None,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        self.stdout.write(f"statuses: {report['statuses']}")
+        self.stdout.write(f"reviews created: {reviews} of {options['rounds']} rounds, {duplicates} duplicate pairs")
+        self.stdout.write(f"p50 {report['p50_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms, "
+                          f"{report['mean_queries_per_create']} queries per created review")
+        style = self.style.SUCCESS if duplicates == 0 and reviews == options['rounds'] else self.style.ERROR
+        self.stdout.write(style(f"Report written to {options['output']}."))
@@ -0,0 +1,93 @@
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from accounts.serializers import CompiledProfileListSerializer, ProfileListSerializer
+from backend.renderers import dumps
+from benchmarks.workload import dataset_size
+from offers.models import Offer
+from offers.serializers import CompiledOfferListSerializer, OfferListSerializer
+from orders.models import Order
+from orders.serializers import CompiledOrderSerializer, OrderSerializer
+from .benchmark_api import current_commit
+
+
+class Command(BaseCommand):
+    """
+    Compares the DRF list serializers with their compiled counterparts.
+    - Both sides fetch and serialize the same rows: model instances through
+      the DRF serializer, values_list() tuples through the compiled one.
+    - Fails if the JSON of the two differs.
+    - Reports rows per second, the median of `--repeat` runs.
+    """
+    help = "Benchmarks the DRF list serializers against the compiled serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Rows per list (default: 1000).")
+        parser.add_argument('--repeat', type=int, default=10, help="Runs per serializer (default: 10).")
+        parser.add_argument('--output', default='bench_serializers.json', help="JSON report file.")
+
+    def get_cases(self):
+        request = Request(APIRequestFactory().get('/api/offers/', HTTP_HOST='localhost'))
+        return [
+            ('offers', Offer.objects.for_listing().order_by('-created_at', '-pk'),
+             OfferListSerializer, CompiledOfferListSerializer, {'request': request}),
+            ('orders', Order.objects.order_by('-created_at', '-pk'),
+             OrderSerializer, CompiledOrderSerializer, {'request': request}),
+            ('profiles', User.objects.select_related('business_stats').order_by('pk'),
+             ProfileListSerializer, CompiledProfileListSerializer, {}),
+        ]
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = run()
+            timings.append(time.perf_counter() - start)
+        return data, statistics.median(timings)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        results = {}
+        for name, queryset, serializer_class, compiled_class, context in self.get_cases():
+            compiled = compiled_class(context=context)
+            before, before_time = self.measure(
+                lambda: serializer_class(queryset[:rows], many=True, context=context).data, repeat
+            )
+            after, after_time = self.measure(lambda: compiled.serialize(compiled.select(queryset)[:rows]), repeat)
+            if dumps(before) != dumps(after):
+                raise CommandError(f"The compiled {name} serializer produced different JSON.")
+            count = len(after)
+            results[name] = {
+                'rows': count,
+                'drf_rows_per_s': count / before_time if before_time else None,
+                'compiled_rows_per_s': count / after_time if after_time else None,
+                'speedup': before_time / after_time if after_time else None,
+            }
+
+        report = {
+            'commit': current_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'vendor': connection.vendor,
+            'repeat': repeat,
+            'dataset': dataset_size(),
+            'serializers': results,
+        }
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        self.stdout.write(f"{'serializer':<12}{'rows':>8}{'drf rows/s':>14}{'compiled rows/s':>18}{'speedup':>10}")
+        for name, result in results.items():
+            if not result['rows']:
+                self.stdout.write(f"{name:<12}{0:>8}  no rows, run seed_data first")
+                continue
+            self.stdout.write(
+                f"{name:<12}{result['rows']:>8}{result['drf_rows_per_s']:>14.0f}"
+                f"{result['compiled_rows_per_s']:>18.0f}{result['speedup']:>9.1f}x"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from benchmarks.seed import seed_dataset
+
+
+class Command(BaseCommand):
+    """
+    Seeds a realistic dataset for benchmarks and load tests.
+    """
+    help = "Seeds users, offers, offer details, orders and reviews at a configurable scale."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help="Multiplier for all row counts (default: 1 = 5000 orders).")
+        parser.add_argument('--business-users', type=int, default=50)
+        parser.add_argument('--customers', type=int, default=500)
+        parser.add_argument('--offers', type=int, default=500)
+        parser.add_argument('--orders', type=int, default=5000)
+        parser.add_argument('--reviews', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--random-seed', type=int, default=None, help="Seed for reproducible datasets.")
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        counts = seed_dataset(
+            business_users=max(1, int(options['business_users'] * scale)),
+            customers=max(1, int(options['customers'] * scale)),
+            offers=max(1, int(options['offers'] * scale)),
+            orders=int(options['orders'] * scale),
+            reviews=int(options['reviews'] * scale),
+            batch_size=options['batch_size'],
+            random_seed=options['random_seed'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "Seeded " + ', '.join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items()) + "."
+        ))
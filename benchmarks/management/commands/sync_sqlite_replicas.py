@@ -0,0 +1,34 @@
+import sqlite3
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    """
+    Copies the SQLite primary into the SQLite replica files (`SQLITE_REPLICAS`).
+    - Stands in for replication when testing the replica routing locally.
+    - Uses the SQLite backup API, so the primary may be in use meanwhile.
+    """
+    help = "Copies the primary SQLite database into the configured replica files."
+
+    def handle(self, *args, **options):
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError("The primary database is not SQLite.")
+        replicas = [alias for alias in settings.DATABASE_REPLICAS if connections[alias].vendor == 'sqlite']
+        if not replicas:
+            raise CommandError("No SQLite replicas configured, set SQLITE_REPLICAS.")
+
+        source = sqlite3.connect(primary.settings_dict['NAME'])
+        try:
+            for alias in replicas:
+                connections[alias].close()
+                target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: {connections[alias].settings_dict['NAME']}")
+        finally:
+            source.close()
@@ -0,0 +1,145 @@
+import random
+import uuid
+from django.contrib.auth.hashers import make_password
+from accounts.base_info import invalidate_base_info
+from accounts.models import Review, User
+from accounts.stats import rebuild_stats
+from offers.facets import detail_facets
+from offers.models import Offer, OfferDetail
+from offers.search import get_search_backend
+from orders.models import Order, OrderChange
+from orders.sync import order_change
+
+OFFER_TIERS = (
+    ('basic', 1, 1),
+    ('standard', 2, 0.7),
+    ('premium', 4, 0.4),
+)
+FEATURES = ['Logo Design', 'Visitenkarte', 'Briefpapier', 'Flyer', 'Social Media Kit', 'Quellcode']
+WORDS = ['Website', 'Logo', 'App', 'Shop', 'Design', 'Backend', 'Landingpage', 'SEO', 'Branding', 'API']
+# Weighted order status distribution
+ORDER_STATUSES = ['in_progress'] * 3 + ['completed'] * 6 + ['cancelled']
+
+
+def chunked(total, batch_size):
+    """
+    Yields the sizes of consecutive batches adding up to `total`.
+    """
+    while total > 0:
+        yield min(batch_size, total)
+        total -= batch_size
+
+
+def seed_dataset(business_users=50, customers=500, offers=500, orders=5000, reviews=1000,
+                 batch_size=5000, random_seed=None, log=print):
+    """
+    Seeds a realistic dataset with bulk inserts.
+    - Offers always get the three detail tiers, orders copy their offer detail.
+    - Reviews use distinct (business user, reviewer) pairs.
+    - Rebuilds the business statistics and the search index afterwards,
+      since bulk inserts skip signals; the orders are added to the change
+      log, so delta syncs see them, but not pushed to connected clients.
+    Returns the number of created rows per model.
+    """
+    rng = random.Random(random_seed)
+    prefix = uuid.uuid4().hex[:6]
+    password = make_password('benchmark')
+
+    def create_users(count, user_type):
+        ids = []
+        for offset, size in enumerate(chunked(count, batch_size)):
+            start = offset * batch_size
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{prefix}_{user_type}_{start + index}',
+                    email=f'{prefix}_{user_type}_{start + index}@example.com',
+                    password=password, type=user_type,
+                    first_name=rng.choice(['Anna', 'Ben', 'Clara', 'David', 'Eva', '']),
+                    last_name=rng.choice(['Meier', 'Müller', 'Schmid', 'Keller', '']),
+                    location=rng.choice(['Zürich', 'Bern', 'Basel', None]),
+                )
+                for index in range(size)
+            ])
+            ids += [user.pk for user in users]
+        log(f"Created {len(ids)} {user_type} users.")
+        return ids
+
+    business_ids = create_users(business_users, 'business')
+    customer_ids = create_users(customers, 'customer')
+
+    details = []
+    for size in chunked(offers, batch_size):
+        offer_rows = []
+        tier_rows = []
+        for _ in range(size):
+            base_price = rng.randint(5, 500) * 10
+            base_days = rng.randint(3, 30)
+            tiers = [
+                (offer_type, base_price * factor, max(1, int(base_days * speed)))
+                for offer_type, factor, speed in OFFER_TIERS
+            ]
+            offer_rows.append(Offer(
+                user_id=rng.choice(business_ids),
+                title=f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+                description=' '.join(rng.choices(WORDS, k=20)),
+                **detail_facets({'price': price, 'delivery_time_in_days': days} for _, price, days in tiers),
+            ))
+            tier_rows.append(tiers)
+        Offer.objects.bulk_create(offer_rows)
+
+        detail_rows = [
+            OfferDetail(
+                offer=offer, title=f"{offer.title} {offer_type}", revisions=rng.choice([-1, 1, 2, 3]),
+                delivery_time_in_days=days, price=price,
+                features=rng.sample(FEATURES, k=rng.randint(1, 4)), offer_type=offer_type,
+            )
+            for offer, tiers in zip(offer_rows, tier_rows)
+            for offer_type, price, days in tiers
+        ]
+        OfferDetail.objects.bulk_create(detail_rows)
+        details += detail_rows
+    log(f"Created {offers} offers with {len(details)} details.")
+
+    for size in chunked(orders, batch_size):
+        order_rows = []
+        for _ in range(size):
+            detail = rng.choice(details)
+            order_rows.append(Order(
+                customer_user_id=rng.choice(customer_ids), business_user_id=detail.offer.user_id,
+                offer_detail=detail, title=detail.title, revisions=detail.revisions,
+                delivery_time_in_days=detail.delivery_time_in_days, price=detail.price,
+                features=detail.features, offer_type=detail.offer_type,
+                status=rng.choice(ORDER_STATUSES),
+            ))
+        Order.objects.bulk_create(order_rows)
+        OrderChange.objects.bulk_create([order_change(order, OrderChange.CREATED) for order in order_rows])
+    log(f"Created {orders} orders.")
+
+    reviews = min(reviews, len(business_ids) * len(customer_ids))
+    pairs = set()
+    while len(pairs) < reviews:
+        pairs.add((rng.choice(business_ids), rng.choice(customer_ids)))
+    pairs = list(pairs)
+    for offset, size in enumerate(chunked(reviews, batch_size)):
+        start = offset * batch_size
+        Review.objects.bulk_create([
+            Review(
+                business_user_id=business_id, reviewer_id=reviewer_id,
+                rating=rng.choice([1, 2, 3, 4, 4, 5, 5, 5]),
+                description=' '.join(rng.choices(WORDS, k=8)),
+            )
+            for business_id, reviewer_id in pairs[start:start + size]
+        ])
+    log(f"Created {reviews} reviews.")
+
+    rebuild_stats()
+    get_search_backend().rebuild()
+    invalidate_base_info()
+    return {
+        'business_users': len(business_ids),
+        'customers': len(customer_ids),
+        'offers': offers,
+        'offer_details': len(details),
+        'orders': orders,
+        'reviews': reviews,
+    }
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections, connection
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from accounts.models import Review, User
+from offers.models import Offer, OfferDetail
+from orders.models import Order
+
+
+class Route:
+    """
+    A request of the workload.
+    - `build` returns (path, body) from the workload context.
+    - `user` is the user type that sends the request, or None for anonymous requests.
+    """
+
+    def __init__(self, name, method, build, weight=1, user=None):
+        self.name = name
+        self.method = method
+        self.build = build
+        self.weight = weight
+        self.user = user
+
+
+ROUTES = [
+    Route('offers list', 'get', lambda ctx: ('/api/offers/', None), weight=10),
+    Route('offers search', 'get', lambda ctx: (f'/api/offers/?search={ctx.rng.choice(ctx.words)}', None), weight=5),
+    Route('offers filter', 'get', lambda ctx: (
+        '/api/offers/?min_price=100&max_delivery_time=7&ordering=min_price', None), weight=5),
+    Route('offers facets', 'get', lambda ctx: (
+        '/api/offers/?price_min=500&price_max=2000&delivery_max=14&facets=true', None), weight=3),
+    Route('offers by rating', 'get', lambda ctx: ('/api/offers/?ordering=-avg_rating', None), weight=2),
+    Route('offers cursor', 'get', lambda ctx: ('/api/offers/?pagination=cursor', None), weight=2),
+    Route('offer detail', 'get', lambda ctx: (f'/api/offers/{ctx.rng.choice(ctx.offer_ids)}/', None), weight=5),
+    Route('offerdetail', 'get', lambda ctx: (f'/api/offerdetails/{ctx.rng.choice(ctx.detail_ids)}/', None), weight=3),
+    Route('order create', 'post', lambda ctx: (
+        '/api/orders/', {'offer_detail_id': ctx.rng.choice(ctx.detail_ids)}), weight=2, user='customer'),
+    Route('order bulk create', 'post', lambda ctx: (
+        '/api/orders/bulk/', [{'offer_detail_id': ctx.rng.choice(ctx.detail_ids)} for _ in range(5)]),
+        weight=1, user='customer'),
+    Route('order patch', 'patch', lambda ctx: (
+        f'/api/orders/{ctx.rng.choice(ctx.business_order_ids)}/',
+        {'status': ctx.rng.choice(['in_progress', 'completed'])}), weight=1, user='business'),
+    Route('orders list', 'get', lambda ctx: ('/api/orders/?pagination=cursor', None), weight=3, user='customer'),
+    Route('order count', 'get', lambda ctx: (f'/api/order-count/{ctx.business.pk}/', None), weight=2),
+    Route('completed order count', 'get', lambda ctx: (
+        f'/api/completed-order-count/{ctx.business.pk}/', None), weight=2),
+    Route('reviews', 'get', lambda ctx: (
+        f'/api/reviews/?business_user_id={ctx.business.pk}&pagination=cursor', None), weight=3, user='customer'),
+    Route('profile', 'get', lambda ctx: (f'/api/profile/{ctx.business.pk}/', None), weight=2, user='customer'),
+    Route('profiles business', 'get', lambda ctx: ('/api/profiles/business/', None), weight=1, user='customer'),
+    Route('base-info', 'get', lambda ctx: ('/api/base-info/', None), weight=5),
+]
+
+
+# Read routes served by async views under ASGI (searches and cursor pages fall back to sync views)
+ASYNC_ROUTES = [route for route in ROUTES if route.name in {
+    'offers list', 'offers search', 'offers filter', 'offers facets', 'offers by rating', 'offers cursor',
+    'offer detail', 'offerdetail', 'order count', 'completed order count', 'reviews', 'base-info',
+}]
+
+
+class WorkloadContext:
+    """
+    IDs and credentials the routes draw their requests from.
+    """
+    words = ['logo', 'web', 'app', 'design', 'shop', 'seo']
+
+    def __init__(self, random_seed=None):
+        self.rng = random.Random(random_seed)
+        order = Order.objects.order_by('-id').first()
+        if order is None:
+            raise ValueError("The database has no orders, seed it with `manage.py seed_data` first.")
+        self.business = User.objects.get(pk=order.business_user_id)
+        self.customer = User.objects.get(pk=order.customer_user_id)
+        self.offer_ids = list(Offer.objects.order_by('-id').values_list('id', flat=True)[:1000])
+        self.detail_ids = list(OfferDetail.objects.filter(offer_id__in=self.offer_ids).values_list('id', flat=True))
+        self.business_order_ids = list(
+            Order.objects.filter(business_user=self.business).order_by('-id').values_list('id', flat=True)[:1000]
+        )
+        self.tokens = {
+            'business': Token.objects.get_or_create(user=self.business)[0].key,
+            'customer': Token.objects.get_or_create(user=self.customer)[0].key,
+        }
+
+    def sample(self, requests, routes=ROUTES):
+        """
+        Returns `requests` routes drawn according to their weights.
+        """
+        return self.rng.choices(routes, weights=[route.weight for route in routes], k=requests)
+
+
+def percentile(values, percent):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not values:
+        return None
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+    Aggregates (route, latency ms, status, queries) samples per route.
+    """
+    per_route = {}
+    for name, latency, status, queries in samples:
+        entry = per_route.setdefault(name, {'latencies': [], 'queries': [], 'errors': 0})
+        entry['latencies'].append(latency)
+        if queries is not None:
+            entry['queries'].append(queries)
+        if status >= 400:
+            entry['errors'] += 1
+
+    routes = {}
+    for name, entry in sorted(per_route.items()):
+        latencies = sorted(entry['latencies'])
+        routes[name] = {
+            'requests': len(latencies),
+            'errors': entry['errors'],
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'mean_queries': sum(entry['queries']) / len(entry['queries']) if entry['queries'] else None,
+            'max_queries': max(entry['queries']) if entry['queries'] else None,
+        }
+    return {
+        'requests': len(samples),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(samples) / elapsed if elapsed else None,
+        'routes': routes,
+    }
+
+
+def run_in_process(context, requests, warmup=0):
+    """
+    Replays the workload through the DRF test client and counts queries per request.
+    """
+    clients = {None: APIClient(HTTP_HOST='localhost')}
+    for user_type, key in context.tokens.items():
+        clients[user_type] = APIClient(HTTP_HOST='localhost')
+        clients[user_type].credentials(HTTP_AUTHORIZATION=f'Token {key}')
+
+    def send(route):
+        path, body = route.build(context)
+        client = clients[route.user]
+        if route.method == 'get':
+            return client.get(path)
+        return getattr(client, route.method)(path, body, format='json')
+
+    for route in context.sample(warmup):
+        send(route)
+
+    samples = []
+    started = time.perf_counter()
+    for route in context.sample(requests):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = send(route)
+            latency = (time.perf_counter() - start) * 1000
+        samples.append((route.name, latency, response.status_code, len(queries)))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_http(context, base_url, requests, concurrency=1, warmup=0, routes=ROUTES):
+    """
+    Replays the workload against a running server with `concurrency` client threads.
+    - Query counts are not visible from outside the server and reported as null.
+    """
+    base_url = base_url.rstrip('/')
+    lock = threading.Lock()
+    samples = []
+
+    def send(route, path, body, record=True):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(base_url + path, data=data, method=route.method.upper())
+        request.add_header('Accept', 'application/json')
+        if data is not None:
+            request.add_header('Content-Type', 'application/json')
+        if route.user:
+            request.add_header('Authorization', f'Token {context.tokens[route.user]}')
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            status = error.code
+        latency = (time.perf_counter() - start) * 1000
+        if record:
+            with lock:
+                samples.append((route.name, latency, status, None))
+
+    for route in context.sample(warmup, routes):
+        send(route, *route.build(context), record=False)
+
+    planned = [(route, *route.build(context)) for route in context.sample(requests, routes)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda args: send(*args), planned))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_wsgi(context, requests, concurrency=1, warmup=0, routes=ASYNC_ROUTES, close_connections=False):
+    """
+    Replays read routes through Django's WSGI handler with `concurrency` threads.
+    - With `close_connections` the connections are closed around each request
+      according to CONN_MAX_AGE, like a WSGI server does (the test client doesn't).
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    samples = []
+
+    def send(route, path, record=True):
+        if not hasattr(local, 'client'):
+            local.client = Client(HTTP_HOST='localhost')
+        headers = {'HTTP_AUTHORIZATION': f'Token {context.tokens[route.user]}'} if route.user else {}
+        start = time.perf_counter()
+        if close_connections:
+            close_old_connections()
+        response = local.client.get(path, **headers)
+        if close_connections:
+            close_old_connections()
+        latency = (time.perf_counter() - start) * 1000
+        if record:
+            with lock:
+                samples.append((route.name, latency, response.status_code, None))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda route: send(route, route.build(context)[0], False), context.sample(warmup, routes)))
+        planned = [(route, route.build(context)[0]) for route in context.sample(requests, routes)]
+        started = time.perf_counter()
+        list(executor.map(lambda args: send(*args), planned))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+def run_asgi(context, requests, concurrency=1, warmup=0, routes=ASYNC_ROUTES):
+    """
+    Replays read routes through Django's ASGI handler with `concurrency` concurrent tasks.
+    - The async test client always sends `testserver` as host, so it must be allowed.
+    """
+    samples = []
+
+    async def send(client, route, path, record=True):
+        headers = {'Authorization': f'Token {context.tokens[route.user]}'} if route.user else {}
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latency = (time.perf_counter() - start) * 1000
+        if record:
+            samples.append((route.name, latency, response.status_code, None))
+
+    async def replay(planned, record):
+        queue = asyncio.Queue()
+        for item in planned:
+            queue.put_nowait(item)
+
+        async def worker():
+            client = AsyncClient()
+            while not queue.empty():
+                route, path = queue.get_nowait()
+                await send(client, route, path, record)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def main():
+        await replay([(route, route.build(context)[0]) for route in context.sample(warmup, routes)], False)
+        planned = [(route, route.build(context)[0]) for route in context.sample(requests, routes)]
+        started = time.perf_counter()
+        await replay(planned, True)
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(main())
+    return summarize(samples, elapsed)
+
+
+def dataset_size():
+    """
+    Returns the row counts the benchmark ran against.
+    """
+    return {
+        'users': User.objects.count(),
+        'offers': Offer.objects.count(),
+        'offer_details': OfferDetail.objects.count(),
+        'orders': Order.objects.count(),
+        'reviews': Review.objects.count(),
+    }
@@ -0,0 +1,121 @@
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db.models import Count, Q
+from rest_framework.filters import BaseFilterBackend
+
+# Per-offer columns aggregated over its detail tiers
+FACET_FIELDS = ('min_price', 'max_price', 'min_delivery_time', 'max_delivery_time')
+
+DEFAULT_BUCKETS = {
+    'price': [0, 50, 100, 250, 500, 1000],
+    'delivery_time': [1, 3, 7, 14, 30],
+}
+
+# Facet name -> column the histogram counts
+BUCKET_FIELDS = {
+    'price': 'min_price',
+    'delivery_time': 'min_delivery_time',
+}
+
+
+def detail_facets(details):
+    """
+    Returns the facet columns of an offer from its details.
+    - Accepts validated detail dicts as well as OfferDetail instances, so
+      every write path computes the columns the same way.
+    """
+    details = [
+        detail if isinstance(detail, dict) else {
+            'price': detail.price, 'delivery_time_in_days': detail.delivery_time_in_days,
+        }
+        for detail in details
+    ]
+    if not details:
+        return dict.fromkeys(FACET_FIELDS)
+    prices = [detail['price'] for detail in details]
+    days = [detail['delivery_time_in_days'] for detail in details]
+    return {
+        'min_price': min(prices),
+        'max_price': max(prices),
+        'min_delivery_time': min(days),
+        'max_delivery_time': max(days),
+    }
+
+
+def get_buckets():
+    return {**DEFAULT_BUCKETS, **getattr(settings, 'OFFER_FACET_BUCKETS', {})}
+
+
+def facet_aggregates():
+    """
+    Returns the aggregates counting the buckets and the layout to read them back.
+    """
+    aggregates, layout = {}, {}
+    for name, bounds in get_buckets().items():
+        field = BUCKET_FIELDS[name]
+        layout[name] = []
+        for index, lower in enumerate(bounds):
+            upper = bounds[index + 1] if index + 1 < len(bounds) else None
+            condition = Q(**{f'{field}__gte': lower})
+            if upper is not None:
+                condition &= Q(**{f'{field}__lt': upper})
+            key = f'{name}_{index}'
+            aggregates[key] = Count('pk', filter=condition)
+            layout[name].append((key, lower, upper))
+    return aggregates, layout
+
+
+def format_facets(counts, layout):
+    return {
+        name: [{'min': lower, 'max': upper, 'count': counts[key]} for key, lower, upper in buckets]
+        for name, buckets in layout.items()
+    }
+
+
+def facet_counts(queryset):
+    """
+    Returns the price and delivery time histograms of the offers in `queryset`.
+    - Counts are taken with one aggregate query over the indexed facet columns.
+    - Each facet is a list of {"min", "max", "count"} buckets, the last bucket
+      is open-ended (`max` is null).
+    """
+    aggregates, layout = facet_aggregates()
+    return format_facets(queryset.order_by().aggregate(**aggregates), layout)
+
+
+async def afacet_counts(queryset):
+    """
+    Async `facet_counts()`.
+    """
+    aggregates, layout = facet_aggregates()
+    return format_facets(await queryset.order_by().aaggregate(**aggregates), layout)
+
+
+def parse(value, cast):
+    try:
+        value = cast(value)
+    except (TypeError, ValueError, InvalidOperation):
+        return None
+    if isinstance(value, Decimal) and not value.is_finite():
+        return None
+    return value
+
+
+class OfferFacetFilter(BaseFilterBackend):
+    """
+    Range filters on the facet columns, without joining the offer details.
+    - `?price_min=` keeps offers with a tier at or above the price (max_price).
+    - `?price_max=` keeps offers with a tier at or below the price (min_price).
+    - `?delivery_max=` keeps offers with a tier delivered within the days (min_delivery_time).
+    - Invalid values are ignored, like the other offer filters.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        filters = {
+            'max_price__gte': parse(params.get('price_min'), Decimal),
+            'min_price__lte': parse(params.get('price_max'), Decimal),
+            'min_delivery_time__lte': parse(params.get('delivery_max'), int),
+        }
+        filters = {lookup: value for lookup, value in filters.items() if value is not None}
+        return queryset.filter(**filters) if filters else queryset
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from offers.models import Offer
+from offers.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full-text search index of all offers.
+    """
+    help = "Rebuilds the offer full-text search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recreate', action='store_true', help="Drop and recreate the index table first.")
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if options['recreate']:
+            backend.uninstall()
+            backend.install()
+        else:
+            backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {Offer.objects.count()} offer(s) with {type(backend).__name__}."
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0002_offer_min_delivery_time_offer_min_price'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['-created_at', '-id'], name='offer_created_id_idx'),
+        ),
+    ]
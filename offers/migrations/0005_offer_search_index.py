@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:24
+
+import django.db.models.deletion
+import offers.search
+from django.db import migrations, models
+
+
+def install_search_index(apps, schema_editor):
+    offers.search.get_search_backend(schema_editor.connection).install()
+
+
+def uninstall_search_index(apps, schema_editor):
+    offers.search.get_search_backend(schema_editor.connection).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferSearchIndex',
+            fields=[
+                ('offer', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='offers.offer')),
+                ('document', offers.search.SearchDocumentField(db_column='offers_offer_fts')),
+            ],
+            options={
+                'db_table': 'offers_offer_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
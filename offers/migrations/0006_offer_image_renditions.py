@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0005_offer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
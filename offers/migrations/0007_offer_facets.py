@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min, OuterRef, Subquery
+
+
+def backfill_facets(apps, schema_editor):
+    Offer = apps.get_model('offers', 'Offer')
+    OfferDetail = apps.get_model('offers', 'OfferDetail')
+    details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+
+    def aggregate(function, field):
+        return Subquery(details.annotate(value=function(field)).values('value'))
+
+    Offer.objects.update(
+        min_price=aggregate(Min, 'price'),
+        max_price=aggregate(Max, 'price'),
+        min_delivery_time=aggregate(Min, 'delivery_time_in_days'),
+        max_delivery_time=aggregate(Max, 'delivery_time_in_days'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0006_offer_image_renditions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='max_delivery_time',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='max_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['max_price'], name='offer_max_price_idx'),
+        ),
+        migrations.RunPython(backfill_facets, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,84 @@
 from django.db import models
+from django.db.models import Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from accounts.models import User
+from .search import SEARCH_TABLE, SearchDocumentField
+
+
+class OfferQuerySet(models.QuerySet):
+    """
+    QuerySet for offers.
+    - Bundles the joins and prefetches each API action needs, so serializers
+      never trigger a query per row.
+    """
+
+    def for_listing(self):
+        """
+        Queryset for the public offer list.
+        - Joins the creator for `user_details` and their statistics row for `rating_summary`.
+        - Prefetches only the detail columns `OfferDetailShortSerializer` emits.
+        - `avg_rating` sorts by the stored average of the creator (0 without reviews).
+        """
+        return self.select_related('user', 'user__business_stats').prefetch_related(
+            models.Prefetch('details', queryset=OfferDetail.objects.only('id', 'offer_id'))
+        ).alias(avg_rating=Coalesce('user__business_stats__avg_rating', 0.0))
+
+    def for_detail(self):
+        """
+        Queryset for retrieving and editing a single offer.
+        - Joins the creator and prefetches the full offer details.
+        """
+        return self.select_related('user').prefetch_related('details')
+
+    def refresh_facets(self):
+        """
+        Recomputes the facet columns (see `offers.facets`) from the details with a single UPDATE.
+        - Used for detail writes that bypass the serializers, e.g. in the admin.
+        - Touches `updated_at`, the version of the offer and its details.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+
+        def aggregate(function, field):
+            return Subquery(details.annotate(value=function(field)).values('value'))
+
+        return self.update(
+            min_price=aggregate(Min, 'price'),
+            max_price=aggregate(Max, 'price'),
+            min_delivery_time=aggregate(Min, 'delivery_time_in_days'),
+            max_delivery_time=aggregate(Max, 'delivery_time_in_days'),
+            updated_at=timezone.now(),
+        )
+
 
 class Offer(models.Model):
     user = models.ForeignKey(User, related_name='offers', on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='offers/', blank=True, null=True)
+    # Rendition name -> storage name, filled by `backend.images`
+    image_renditions = models.JSONField(default=dict, blank=True)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Facets over the detail tiers, written by `offers.facets.detail_facets`
     min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     min_delivery_time = models.IntegerField(null=True, blank=True)
+    max_delivery_time = models.IntegerField(null=True, blank=True)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='offer_created_id_idx'),
+            # Price / delivery time filters and orderings
+            models.Index(fields=['min_price'], name='offer_min_price_idx'),
+            models.Index(fields=['max_price'], name='offer_max_price_idx'),
+            models.Index(fields=['min_delivery_time'], name='offer_min_delivery_idx'),
+            # Offers of a creator, newest first
+            models.Index(fields=['user', '-created_at'], name='offer_user_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -31,3 +100,25 @@ class OfferDetail(models.Model):
 
     def __str__(self):
         return f"{self.offer.title} - {self.title}"
+
+
+class OfferSearchIndex(models.Model):
+    """
+    Full-text index row of an offer.
+    - Backed by an FTS5 table on SQLite and a tsvector table on PostgreSQL,
+      created and kept in sync by `offers.search`.
+    - Only used to join offers against the index, never written through the ORM.
+    """
+    offer = models.OneToOneField(
+        Offer,
+        on_delete=models.DO_NOTHING,
+        related_name='search_index',
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False
+    )
+    document = SearchDocumentField(db_column=SEARCH_TABLE)
+
+    class Meta:
+        managed = False
+        db_table = SEARCH_TABLE
@@ -0,0 +1,215 @@
+import re
+from django.db import connection as default_connection, models
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+SEARCH_TABLE = 'offers_offer_fts'
+
+
+class SearchDocumentField(models.TextField):
+    """
+    Column holding the full-text document of an offer.
+    - The FTS5 hidden column on SQLite, a tsvector column on PostgreSQL.
+    """
+
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    """
+    `search_index__document__match=<query>` - full-text match on the search document.
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ to_tsquery('simple', {rhs})", lhs_params + rhs_params
+
+
+class FullTextRank(models.Func):
+    """
+    Relevance of a full-text match, higher is better.
+    """
+    output_field = models.FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # bm25() is negative, the title weighs more than description and details
+        document_sql, params = compiler.compile(self.get_source_expressions()[0])
+        return f'-bm25({document_sql}, 10.0, 2.0, 1.0)', params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        document, query = self.get_source_expressions()
+        document_sql, document_params = compiler.compile(document)
+        query_sql, query_params = compiler.compile(query)
+        return f"ts_rank({document_sql}, to_tsquery('simple', {query_sql}))", document_params + query_params
+
+
+def search_terms(text):
+    """
+    Splits a search string into word tokens.
+    """
+    return re.findall(r'\w+', text or '')
+
+
+class SearchBackend:
+    """
+    Base class of the offer search backends.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def index(self, offer_ids):
+        pass
+
+    def remove(self, offer_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, text):
+        raise NotImplementedError
+
+
+class LikeSearchBackend(SearchBackend):
+    """
+    Fallback for databases without a full-text engine, matches every term with icontains.
+    """
+
+    def search(self, queryset, text):
+        for term in search_terms(text):
+            queryset = queryset.filter(models.Q(title__icontains=term) | models.Q(description__icontains=term))
+        return queryset
+
+
+class FullTextSearchBackend(SearchBackend):
+    """
+    Base class of backends keeping a full-text table in sync with the offers.
+    - Documents are built in SQL, so indexing single offers and rebuilding
+      the whole table always produce the same document.
+    """
+    create_sql = []
+    drop_sql = []
+    # Inserts the documents of all offers matching the WHERE clause `%s`
+    insert_sql = ''
+
+    def execute(self, statements, params=None):
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement, params)
+
+    def install(self):
+        self.execute(self.create_sql)
+        self.rebuild()
+
+    def uninstall(self):
+        self.execute(self.drop_sql)
+
+    def index(self, offer_ids):
+        offer_ids = [int(offer_id) for offer_id in offer_ids]
+        if offer_ids:
+            self.remove(offer_ids)
+            placeholders = ', '.join(['%s'] * len(offer_ids))
+            self.execute([self.insert_sql % f'o.id IN ({placeholders})'], offer_ids)
+
+    def remove(self, offer_ids):
+        offer_ids = [int(offer_id) for offer_id in offer_ids]
+        if offer_ids:
+            placeholders = ', '.join(['%s'] * len(offer_ids))
+            self.execute([f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})'], offer_ids)
+
+    def rebuild(self):
+        self.execute([f'DELETE FROM {SEARCH_TABLE}', self.insert_sql % '1 = 1'])
+
+    def build_query(self, terms):
+        raise NotImplementedError
+
+    def search(self, queryset, text):
+        terms = search_terms(text)
+        if not terms:
+            return queryset
+        query = self.build_query(terms)
+        return queryset.filter(search_index__document__match=query).annotate(
+            search_rank=FullTextRank('search_index__document', models.Value(query))
+        ).order_by('-search_rank', '-pk')
+
+
+class SQLiteSearchBackend(FullTextSearchBackend):
+    """
+    SQLite FTS5 virtual table with prefix indexes, ranked with bm25().
+    """
+    create_sql = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "title, description, details, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    ]
+    drop_sql = [f'DROP TABLE IF EXISTS {SEARCH_TABLE}']
+    insert_sql = (
+        f'INSERT INTO {SEARCH_TABLE} (rowid, title, description, details) '
+        'SELECT o.id, o.title, o.description, '
+        "(SELECT group_concat(d.title || ' ' || d.features, ' ') FROM offers_offerdetail d WHERE d.offer_id = o.id) "
+        'FROM offers_offer o WHERE %s'
+    )
+
+    def build_query(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+
+class PostgresSearchBackend(FullTextSearchBackend):
+    """
+    PostgreSQL tsvector table with a GIN index, ranked with ts_rank().
+    """
+    create_sql = [
+        f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (rowid bigint PRIMARY KEY, {SEARCH_TABLE} tsvector NOT NULL)',
+        f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_gin ON {SEARCH_TABLE} USING GIN ({SEARCH_TABLE})',
+    ]
+    drop_sql = [f'DROP TABLE IF EXISTS {SEARCH_TABLE}']
+    insert_sql = (
+        f'INSERT INTO {SEARCH_TABLE} (rowid, {SEARCH_TABLE}) '
+        "SELECT o.id, setweight(to_tsvector('simple', o.title), 'A') "
+        "|| setweight(to_tsvector('simple', o.description), 'B') "
+        "|| setweight(to_tsvector('simple', coalesce((SELECT string_agg(d.title || ' ' || d.features::text, ' ') "
+        "FROM offers_offerdetail d WHERE d.offer_id = o.id), '')), 'C') "
+        'FROM offers_offer o WHERE %s'
+    )
+
+    def build_query(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(connection=None):
+    """
+    Returns the search backend matching the database vendor.
+    """
+    connection = connection or default_connection
+    return BACKENDS.get(connection.vendor, LikeSearchBackend)(connection)
+
+
+class OfferSearchFilter(BaseFilterBackend):
+    """
+    Filters offers by the `search` query parameter using the full-text backend.
+    - Results are ordered by relevance unless `ordering` is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(api_settings.SEARCH_PARAM, '')
+        if not text.strip():
+            return queryset
+        return get_search_backend().search(queryset, text)
@@ -1,10 +1,21 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from accounts.base_info import invalidate_base_info
+from accounts.stats import RATING_SUMMARY_COLUMNS, adjust_stats, rating_summary, rating_summary_values
+from backend.compiled_serializers import CompiledSerializer
+from backend.images import RenditionImageField, rendition_url
+from backend.response_cache import invalidate_tags
+from .facets import FACET_FIELDS, detail_facets
 from .models import Offer, OfferDetail
+from .search import get_search_backend
 
 User = get_user_model()
 
+# Upper bound of offers in a single batch request
+MAX_OFFER_BATCH_SIZE = 100
+
 
 class OfferDetailShortSerializer(serializers.ModelSerializer):
     """
@@ -58,16 +69,20 @@ class OfferListSerializer(serializers.ModelSerializer):
     """
     Serializer for listing offers.
     - Includes user details and a short representation of associated OfferDetails.
+    - Returns the card rendition of the image unless `?image_size=` says otherwise.
     """
 
     user_details = serializers.SerializerMethodField()
+    rating_summary = serializers.SerializerMethodField()
     details = OfferDetailShortSerializer(many=True, read_only=True)
+    image = RenditionImageField('image_renditions', default_size='card', read_only=True)
 
     class Meta:
         model = Offer
         fields = [
             'id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at',
-            'details', 'min_price', 'min_delivery_time', 'user_details'
+            'details', 'min_price', 'max_price', 'min_delivery_time', 'max_delivery_time', 'user_details',
+            'rating_summary'
         ]
 
     def get_user_details(self, obj):
@@ -82,6 +97,118 @@ class OfferListSerializer(serializers.ModelSerializer):
             "username": user.username
         }
 
+    def get_rating_summary(self, obj):
+        """
+        Returns the rating summary of the offer creator, joined by the listing queryset.
+        """
+        return rating_summary(getattr(obj.user, 'business_stats', None))
+
+
+class CompiledOfferListSerializer(CompiledSerializer):
+    """
+    Compiled `OfferListSerializer` for the offer list.
+    - The creator and their statistics row are joined into the row, the
+      detail IDs of a page are loaded with one query.
+    """
+    serializer_class = OfferListSerializer
+    columns = (
+        'id', 'user', 'title', 'image', 'image_renditions', 'description', 'created_at', 'updated_at',
+        'min_price', 'max_price', 'min_delivery_time', 'max_delivery_time',
+        'user__first_name', 'user__last_name', 'user__username',
+        *(f'user__business_stats__{column}' for column in RATING_SUMMARY_COLUMNS),
+    )
+
+    def details_queryset(self, rows):
+        return OfferDetail.objects.filter(offer_id__in=[row[0] for row in rows]).order_by('pk').values_list(
+            'offer_id', 'id'
+        )
+
+    def group_details(self, details):
+        grouped = {}
+        for offer_id, detail_id in details:
+            grouped.setdefault(offer_id, []).append({'id': detail_id, 'url': f"/offerdetails/{detail_id}/"})
+        return grouped
+
+    def prefetch(self, rows):
+        return self.group_details(self.details_queryset(rows)) if rows else {}
+
+    async def aprefetch(self, rows):
+        return self.group_details([detail async for detail in self.details_queryset(rows)]) if rows else {}
+
+    def compile(self, details):
+        storage = Offer._meta.get_field('image').storage
+        request = self.context.get('request')
+        size = self.fields['image'].get_size(request)
+        created_at, updated_at = self.converter('created_at'), self.converter('updated_at')
+        min_price, max_price = self.converter('min_price'), self.converter('max_price')
+
+        def build(row):
+            offer_id, user, title, image, renditions, description, created, updated, low, high, \
+                min_delivery_time, max_delivery_time, first_name, last_name, username = row[:15]
+            return {
+                'id': offer_id,
+                'user': user,
+                'title': title,
+                'image': rendition_url(storage, image, renditions, size, request) if image else None,
+                'description': description,
+                'created_at': created_at(created),
+                'updated_at': updated_at(updated),
+                'details': details.get(offer_id, []),
+                'min_price': None if low is None else min_price(low),
+                'max_price': None if high is None else max_price(high),
+                'min_delivery_time': min_delivery_time,
+                'max_delivery_time': max_delivery_time,
+                'user_details': {
+                    "first_name": first_name or "Unbekannt",
+                    "last_name": last_name or "Unbekannt",
+                    "username": username,
+                },
+                'rating_summary': rating_summary_values(row[15:]),
+            }
+        return build
+
+
+class OfferBatchSerializer(serializers.ListSerializer):
+    """
+    List serializer for creating many offers in one request.
+    - Inserts all offers and all of their details with one query each.
+    - Bulk inserts skip model signals, so the business statistics, the search
+      index, the cached base info and the cached responses are updated here.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', MAX_OFFER_BATCH_SIZE)
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+
+    @transaction.atomic
+    def create(self, validated_data):
+        offers, details_per_offer = [], []
+        for item in validated_data:
+            details_data = item.pop('details', [])
+            item.update(detail_facets(details_data))
+            offers.append(Offer(**item))
+            details_per_offer.append(details_data)
+
+        Offer.objects.bulk_create(offers)
+        OfferDetail.objects.bulk_create([
+            OfferDetail(offer=offer, **detail_data)
+            for offer, details_data in zip(offers, details_per_offer)
+            for detail_data in details_data
+        ])
+
+        offer_counts = {}
+        for offer in offers:
+            offer_counts[offer.user_id] = offer_counts.get(offer.user_id, 0) + 1
+        for user_id, count in offer_counts.items():
+            adjust_stats(user_id, {'offer_count': count})
+
+        offer_ids = [offer.pk for offer in offers]
+        transaction.on_commit(lambda: get_search_backend().index(offer_ids))
+        transaction.on_commit(invalidate_base_info)
+        invalidate_tags('offers')
+        return offers
+
 
 class OfferSerializer(serializers.ModelSerializer):
     """
@@ -92,13 +219,16 @@ class OfferSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
     user_details = serializers.SerializerMethodField()
     details = OfferDetailFullSerializer(many=True)
+    image = RenditionImageField('image_renditions', required=False, allow_null=True)
 
     class Meta:
         model = Offer
         fields = [
             'id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at',
-            'details', 'min_price', 'min_delivery_time', 'user_details'
+            'details', 'min_price', 'max_price', 'min_delivery_time', 'max_delivery_time', 'user_details'
         ]
+        read_only_fields = FACET_FIELDS
+        list_serializer_class = OfferBatchSerializer
 
     def get_user_details(self, obj):
         """
@@ -126,61 +256,57 @@ class OfferSerializer(serializers.ModelSerializer):
             raise ValidationError(f"Offer must contain exactly one of each type: {', '.join(required_types)}.")
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         """
         Creates a new offer with associated details.
-        - Calculates and sets the minimum price and delivery time.
+        - Calculates the price and delivery time facets before inserting.
+        - Inserts all details with a single query.
         """
         details_data = validated_data.pop('details', [])
+        validated_data.update(detail_facets(details_data))
         offer = Offer.objects.create(**validated_data)
-
-        min_price = None
-        min_delivery_time = None
-
-        for detail_data in details_data:
-            detail = OfferDetail.objects.create(offer=offer, **detail_data)
-            if min_price is None or detail.price < min_price:
-                min_price = detail.price
-            if min_delivery_time is None or detail.delivery_time_in_days < min_delivery_time:
-                min_delivery_time = detail.delivery_time_in_days
-
-        offer.min_price = min_price
-        offer.min_delivery_time = min_delivery_time
-        offer.save()
+        OfferDetail.objects.bulk_create([OfferDetail(offer=offer, **detail_data) for detail_data in details_data])
         return offer
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """
         Updates an existing offer and its associated details.
-        - Ensures details are updated or created as needed.
-        - Recalculates the minimum price and delivery time.
+        - Ensures details are updated or created as needed, with one query each.
+        - Recalculates the price and delivery time facets.
         """
         details_data = validated_data.pop('details', None)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
         if details_data is not None:
+            details = {detail.offer_type: detail for detail in instance.details.all()}
+            updated, created, fields = [], [], set()
+
             for detail_data in details_data:
                 offer_type = detail_data.get('offer_type')
                 if not offer_type:
                     raise ValidationError("Each detail must include an 'offer_type' field.")
 
-                try:
-                    detail = instance.details.get(offer_type=offer_type)
-                    for key, val in detail_data.items():
-                        setattr(detail, key, val)
-                    detail.save()
-                except OfferDetail.DoesNotExist:
-                    OfferDetail.objects.create(offer=instance, **detail_data)
-
-           
-            prices = [d.price for d in instance.details.all()]
-            times = [d.delivery_time_in_days for d in instance.details.all()]
-            instance.min_price = min(prices)
-            instance.min_delivery_time = min(times)
-            instance.save()
+                detail = details.get(offer_type)
+                if detail is None:
+                    details[offer_type] = OfferDetail(offer=instance, **detail_data)
+                    created.append(details[offer_type])
+                    continue
+                for key, val in detail_data.items():
+                    setattr(detail, key, val)
+                updated.append(detail)
+                fields.update(detail_data)
 
-        return instance
+            if updated:
+                OfferDetail.objects.bulk_update(updated, sorted(fields))
+                invalidate_tags(*(f'offerdetail:{detail.pk}' for detail in updated))
+            OfferDetail.objects.bulk_create(created)
+
+            for field, value in detail_facets(details.values()).items():
+                setattr(instance, field, value)
 
+        instance.save()
+        return instance
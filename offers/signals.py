@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from backend.images import renditions_ready, track_renditions
+from backend.response_cache import invalidate_tags
+from .models import Offer, OfferDetail
+from .search import get_search_backend
+
+
+def reindex_offer(offer_id):
+    """
+    Updates the search document of an offer once the write is committed.
+    """
+    transaction.on_commit(lambda: get_search_backend().index([offer_id]))
+
+
+@receiver(post_save, sender=Offer, dispatch_uid='search_offer_saved')
+def offer_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reindex_offer(instance.pk)
+
+
+@receiver(post_delete, sender=Offer, dispatch_uid='search_offer_deleted')
+def offer_deleted(sender, instance, **kwargs):
+    offer_id = instance.pk
+    transaction.on_commit(lambda: get_search_backend().remove([offer_id]))
+
+
+@receiver(post_save, sender=OfferDetail, dispatch_uid='search_detail_saved')
+@receiver(post_delete, sender=OfferDetail, dispatch_uid='search_detail_deleted')
+def offer_detail_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reindex_offer(instance.offer_id)
+
+
+@receiver(post_save, sender=OfferDetail, dispatch_uid='facets_detail_saved')
+@receiver(post_delete, sender=OfferDetail, dispatch_uid='facets_detail_deleted')
+def refresh_offer_facets(sender, instance, raw=False, origin=None, **kwargs):
+    """
+    Keeps the facet columns current for detail writes outside `OfferSerializer`.
+    - Skipped when the details are deleted together with their offer.
+    """
+    if raw or isinstance(origin, Offer):
+        return
+    Offer.objects.filter(pk=instance.offer_id).refresh_facets()
+
+
+track_renditions(Offer, 'image', 'image_renditions')
+
+
+@receiver(post_save, sender=Offer, dispatch_uid='response_cache_offer_saved')
+@receiver(post_delete, sender=Offer, dispatch_uid='response_cache_offer_deleted')
+def invalidate_offer_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_tags('offers', f'offer:{instance.pk}')
+
+
+@receiver(post_save, sender=OfferDetail, dispatch_uid='response_cache_detail_saved')
+@receiver(post_delete, sender=OfferDetail, dispatch_uid='response_cache_detail_deleted')
+def invalidate_offer_detail_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_tags('offers', f'offer:{instance.offer_id}', f'offerdetail:{instance.pk}')
+
+
+@receiver(renditions_ready, sender=Offer, dispatch_uid='response_cache_offer_renditions')
+def invalidate_offer_renditions(sender, pk, **kwargs):
+    invalidate_tags('offers', f'offer:{pk}')
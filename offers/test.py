@@ -1,3 +1,577 @@
-from django.test import TestCase
+import tempfile
+from unittest.mock import patch
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from io import BytesIO
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, TestCase, override_settings
+from PIL import Image
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+from accounts.models import Review, User
+from backend.images import run_in_worker, schedule_renditions
+from .models import Offer, OfferDetail
 
-# Create your tests here.
+
+def create_offer(user, index=0):
+    """
+    Creates an offer with the three required detail tiers.
+    """
+    offer = Offer.objects.create(
+        user=user, title=f"Offer {index}", description="Test offer",
+        min_price=50, min_delivery_time=3,
+    )
+    for offer_type, price, days in (('basic', 50, 7), ('standard', 100, 5), ('premium', 200, 3)):
+        OfferDetail.objects.create(
+            offer=offer, title=f"{offer_type} {index}", revisions=1,
+            delivery_time_in_days=days, price=price, features=['Logo'], offer_type=offer_type,
+        )
+    return offer
+
+
+class OfferQueryCountTests(TestCase):
+    """
+    Ensures the offer endpoints run a fixed number of queries regardless of page size.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+
+    def test_list_query_count_is_constant(self):
+        create_offer(self.business)
+        # COUNT for pagination, offers joined with users, prefetched details
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, 200)
+
+        for index in range(1, 12):
+            create_offer(self.business, index)
+        for page_size in (1, 5, 10):
+            with patch.object(PageNumberPagination, 'page_size', page_size), self.assertNumQueries(3):
+                response = self.client.get('/api/offers/', {'page_size': page_size, 'ordering': 'min_price'})
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertEqual(response.data['results'][0]['user_details']['username'], 'business')
+            self.assertEqual(len(response.data['results'][0]['details']), 3)
+            # Keyset pages: offers joined with users, prefetched details
+            with self.assertNumQueries(2):
+                response = self.client.get('/api/offers/', {'pagination': 'cursor', 'page_size': page_size})
+            self.assertEqual(len(response.data['results']), page_size)
+
+    def test_retrieve_query_count(self):
+        offer = create_offer(self.business)
+        # Version of the offer, offer joined with user, prefetched details
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/offers/{offer.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['details']), 3)
+
+    def test_offerdetail_retrieve_query_count(self):
+        offer = create_offer(self.business)
+        detail = offer.details.first()
+        # Version of the offer detail, the detail
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/offerdetails/{detail.id}/')
+        self.assertEqual(response.status_code, 200)
+
+
+class OfferKeysetPaginationTests(TestCase):
+    """
+    Ensures cursor pages of offers neither skip nor repeat offers, also with equal creation times.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.offers = [create_offer(self.business, index) for index in range(5)]
+        # Ties on the sort key are broken by the primary key
+        Offer.objects.filter(pk__in=[offer.pk for offer in self.offers[1:4]]).update(created_at=self.offers[1].created_at)
+
+    def walk(self, url):
+        seen, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [offer['id'] for offer in response.data['results']]
+            url, pages = response.data['next'], pages + 1
+        return seen, pages
+
+    def test_walks_all_offers(self):
+        expected = [offer.pk for offer in Offer.objects.order_by('-created_at', '-pk')]
+        for page_size in (1, 2, 3, 5):
+            seen, pages = self.walk(f'/api/offers/?pagination=cursor&page_size={page_size}')
+            self.assertEqual(seen, expected)
+            # A last page ending exactly on the boundary has no next link
+            self.assertEqual(pages, -(-len(expected) // page_size))
+
+    def test_ascending(self):
+        seen, _ = self.walk('/api/offers/?pagination=cursor&page_size=2&ordering=created_at')
+        self.assertEqual(seen, [offer.pk for offer in Offer.objects.order_by('created_at', 'pk')])
+
+    def test_unsupported_ordering(self):
+        response = self.client.get('/api/offers/?pagination=cursor&ordering=min_price')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.data)
+        self.assertEqual(self.client.get('/api/offers/?ordering=min_price').status_code, 200)
+
+
+class OfferSearchTests(TestCase):
+    """
+    Ensures the full-text search stays in sync with offer writes and ranks results.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+
+    def search(self, text):
+        return [offer['id'] for offer in self.client.get('/api/offers/', {'search': text}).data['results']]
+
+    def test_prefix_search_and_ranking(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            logo = create_offer(self.business, 1)
+            logo.title = "Logo Design"
+            logo.save()
+            website = create_offer(self.business, 2)
+            website.title = "Website"
+            website.description = "Inklusive Logo"
+            website.save()
+
+        self.assertEqual(self.search('log'), [logo.id, website.id])
+        self.assertEqual(self.search('web'), [website.id])
+        self.assertEqual(self.search('logo website'), [website.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = create_offer(self.business)
+        self.assertEqual(self.search('premium'), [offer.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.description = "Umgebaut"
+            offer.save()
+        self.assertEqual(self.search('umgebaut'), [offer.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.delete()
+        self.assertEqual(self.search('umgebaut'), [])
+
+
+def offer_payload(title="Logo"):
+    return {
+        'title': title,
+        'description': "Logo design",
+        'details': [
+            {'title': offer_type, 'revisions': 1, 'delivery_time_in_days': days, 'price': price,
+             'features': ['Logo'], 'offer_type': offer_type}
+            for offer_type, price, days in (('basic', 100, 7), ('standard', 200, 5), ('premium', 50, 3))
+        ],
+    }
+
+
+class OfferWriteTests(TestCase):
+    """
+    Ensures offer writes are bulk, transactional and keep the min aggregates current.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.client.force_authenticate(self.business)
+
+    def test_create_computes_min_aggregates(self):
+        response = self.client.post('/api/offers/', offer_payload(), format='json')
+        self.assertEqual(response.status_code, 201)
+        offer = Offer.objects.get(pk=response.data['id'])
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (50, 3))
+        self.assertEqual(offer.details.count(), 3)
+
+    def test_update_details(self):
+        offer_id = self.client.post('/api/offers/', offer_payload(), format='json').data['id']
+        payload = offer_payload()
+        payload['details'][2].update({'price': 500, 'delivery_time_in_days': 10})
+        response = self.client.patch(f'/api/offers/{offer_id}/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        offer = Offer.objects.get(pk=offer_id)
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (100, 5))
+        self.assertEqual(offer.details.get(offer_type='premium').price, 500)
+
+    def test_batch_create(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/offers/batch/', [offer_payload("Logo"), offer_payload("Website")], format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([offer['title'] for offer in response.data], ["Logo", "Website"])
+        self.assertEqual(OfferDetail.objects.count(), 6)
+        self.assertEqual(self.business.business_stats.offer_count, 2)
+        self.assertEqual(len(self.client.get('/api/offers/', {'search': 'website'}).data['results']), 1)
+
+    def test_batch_create_keeps_input_order(self):
+        titles = ["Website", "App", "Logo", "Branding"]
+        response = self.client.post('/api/offers/batch/', [offer_payload(title) for title in titles], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([offer['title'] for offer in response.data], titles)
+        self.assertEqual(
+            [offer['id'] for offer in response.data],
+            [Offer.objects.get(title=title).pk for title in titles],
+        )
+
+    def test_batch_create_is_atomic(self):
+        invalid = offer_payload("Invalid")
+        invalid['details'] = invalid['details'][:2]
+        response = self.client.post('/api/offers/batch/', [offer_payload(), invalid], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Offer.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_PROCESSING_WORKERS=0)
+class OfferImageTests(TestCase):
+    """
+    Ensures uploaded offer images get WebP renditions without EXIF data.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+
+    def test_upload_creates_renditions(self):
+        image = Image.new('RGB', (2000, 1000), 'red')
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera'
+        upload = BytesIO()
+        image.save(upload, 'JPEG', exif=exif)
+
+        offer = create_offer(self.business)
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.image = SimpleUploadedFile('logo.jpg', upload.getvalue(), content_type='image/jpeg')
+            offer.save()
+
+        offer.refresh_from_db()
+        self.assertEqual(set(offer.image_renditions), {'thumbnail', 'card', 'full'})
+        with default_storage.open(offer.image_renditions['card']) as file:
+            card = Image.open(file)
+            self.assertEqual((card.format, card.size), ('WEBP', (480, 240)))
+            self.assertFalse(card.getexif())
+
+        response = self.client.get('/api/offers/')
+        self.assertTrue(response.data['results'][0]['image'].endswith('logo_card.webp'))
+        response = self.client.get('/api/offers/', {'image_size': 'original'})
+        self.assertTrue(response.data['results'][0]['image'].endswith('.jpg'))
+
+    def test_worker_jobs_close_connections(self):
+        def failing_job():
+            raise ValueError
+
+        with patch('backend.images.connections') as connections:
+            with self.assertRaises(ValueError):
+                run_in_worker(failing_job)
+        connections.close_all.assert_called_once_with()
+
+        with override_settings(IMAGE_PROCESSING_WORKERS=1), patch('backend.images.get_executor') as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_renditions(Offer, 1, 'image', 'image_renditions', 'offers/logo.jpg')
+        self.assertIs(get_executor().submit.call_args.args[0], run_in_worker)
+
+
+class OfferFacetTests(TestCase):
+    """
+    Ensures the facet columns stay current and drive the range filters and histograms.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+
+    def test_facet_columns(self):
+        offer = Offer.objects.get(pk=create_offer(self.business).pk)
+        self.assertEqual(
+            (offer.min_price, offer.max_price, offer.min_delivery_time, offer.max_delivery_time), (50, 200, 3, 7)
+        )
+
+        detail = offer.details.get(offer_type='premium')
+        detail.price = 900
+        detail.save()
+        offer.refresh_from_db()
+        self.assertEqual(offer.max_price, 900)
+
+    def test_range_filters(self):
+        cheap = create_offer(self.business, 0)
+        expensive = create_offer(self.business, 1)
+        expensive.details.update(price=1000)
+        Offer.objects.filter(pk=expensive.pk).refresh_facets()
+
+        def ids(query):
+            return {offer['id'] for offer in self.client.get(f'/api/offers/?{query}').data['results']}
+
+        self.assertEqual(ids('price_max=100'), {cheap.id})
+        self.assertEqual(ids('price_min=500'), {expensive.id})
+        self.assertEqual(ids('price_min=100&price_max=300'), {cheap.id})
+        self.assertEqual(ids('delivery_max=2'), set())
+        self.assertEqual(ids('price_max=invalid'), {cheap.id, expensive.id})
+
+    def test_facet_histograms(self):
+        create_offer(self.business, 0)
+        create_offer(self.business, 1)
+        response = self.client.get('/api/offers/?facets=true')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['facets']['price'][1], {'min': 50, 'max': 100, 'count': 2})
+        self.assertEqual(response.data['facets']['delivery_time'][1], {'min': 3, 'max': 7, 'count': 2})
+        self.assertNotIn('facets', self.client.get('/api/offers/').data)
+
+
+class OfferResponseCacheTests(TestCase):
+    """
+    Ensures cached offer responses are invalidated by offer, detail and creator writes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.offer = create_offer(self.business)
+
+    def test_list_is_invalidated_by_new_offers(self):
+        self.assertEqual(self.client.get('/api/offers/').data['count'], 1)
+        self.assertEqual(self.client.get('/api/offers/')['X-Cache'], 'HIT')
+        create_offer(self.business, 1)
+        self.assertEqual(self.client.get('/api/offers/').data['count'], 2)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get('/api/offers/')
+        self.assertEqual(self.client.get('/api/offers/?price_max=10')['X-Cache'], 'MISS')
+
+    def test_rating_order_is_invalidated_by_reviews_of_businesses_not_shown(self):
+        rising = User.objects.create_user(username='rising', email='rising@example.com', password='pass', type='business')
+        customer = User.objects.create_user(username='customer', email='customer@example.com', password='pass')
+        rising_offer = create_offer(rising, 1)
+        Review.objects.create(business_user=self.business, reviewer=customer, rating=3)
+        url = '/api/offers/?ordering=-avg_rating&page_size=1'
+        with patch.object(PageNumberPagination, 'page_size', 1):
+            self.assertEqual(self.client.get(url).data['results'][0]['id'], self.offer.pk)
+            etag = self.client.get(url)['ETag']
+
+            # Lifts a business that isn't on the cached page to the top
+            Review.objects.create(business_user=rising, reviewer=customer, rating=5)
+            response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual((response.status_code, response['X-Cache']), (200, 'MISS'))
+        self.assertEqual(response.data['results'][0]['id'], rising_offer.pk)
+
+    def test_retrieve_is_invalidated_by_creator_and_details(self):
+        url = f'/api/offers/{self.offer.pk}/'
+        self.client.get(url)
+        self.business.first_name = 'Anna'
+        self.business.save()
+        self.assertEqual(self.client.get(url).data['user_details']['first_name'], 'Anna')
+
+        detail = self.offer.details.first()
+        detail_url = f'/api/offerdetails/{detail.pk}/'
+        self.client.get(detail_url)
+        self.client.force_authenticate(self.business)
+        payload = offer_payload()
+        payload['details'][0]['title'] = 'Changed'
+        self.client.patch(url, payload, format='json')
+        self.assertEqual(self.client.get(detail_url).data['title'], 'Changed')
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False})
+class OfferAsyncViewTests(TestCase):
+    """
+    Ensures the async views served under ASGI answer like the sync views.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.async_client = AsyncClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.offers = [create_offer(self.business, index) for index in range(3)]
+
+    async def assert_same_response(self, url):
+        expected = await sync_to_async(self.client.get)(url)
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    async def test_list(self):
+        await self.assert_same_response('/api/offers/')
+        await self.assert_same_response('/api/offers/?page=2&ordering=min_price')
+        await self.assert_same_response('/api/offers/?price_max=100&facets=true')
+        await self.assert_same_response('/api/offers/?page=9')
+
+    async def test_retrieve(self):
+        await self.assert_same_response(f'/api/offers/{self.offers[0].pk}/')
+        await self.assert_same_response('/api/offers/999/')
+        detail = await self.offers[0].details.afirst()
+        await self.assert_same_response(f'/api/offerdetails/{detail.pk}/')
+
+    async def test_list_runs_async(self):
+        response = await self.async_client.get('/api/offers/')
+        self.assertTrue(iscoroutinefunction(response.resolver_match.func))
+
+    async def test_fallback_to_sync_view(self):
+        response = await self.assert_same_response(f'/api/offers/?user={self.business.pk}')
+        self.assertEqual(response.json()['count'], 3)
+        response = await self.async_client.get('/api/offers/?format=api')
+        self.assertContains(response, 'Offer List')
+
+
+class OfferConditionalGetTests(TestCase):
+    """
+    Ensures offers and offer details answer conditional GETs with 304 until they change.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.offer = create_offer(self.business)
+        self.url = f'/api/offers/{self.offer.pk}/'
+
+    def test_retrieve(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response['ETag'].startswith('W/'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(not_modified.content, b'')
+
+        not_modified = self.client.get(self.url, headers={'If-Modified-Since': response['Last-Modified']})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_changes_give_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.force_authenticate(self.business)
+        self.client.patch(self.url, {'title': 'Changed'}, format='json')
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Changed')
+
+        etag = response['ETag']
+        self.business.first_name = 'Anna'
+        self.business.save()
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_offer_detail(self):
+        detail_url = f'/api/offerdetails/{self.offer.details.first().pk}/'
+        etag = self.client.get(detail_url)['ETag']
+        self.assertEqual(self.client.get(detail_url, headers={'If-None-Match': etag}).status_code, 304)
+
+        self.client.force_authenticate(self.business)
+        payload = offer_payload()
+        payload['details'][0]['title'] = 'Changed'
+        self.client.patch(self.url, payload, format='json')
+        self.assertEqual(self.client.get(detail_url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_list_uses_weak_etag(self):
+        response = self.client.get('/api/offers/')
+        self.assertTrue(response['ETag'].startswith('W/'))
+        # Answered from the version of the cached response, without a query over the offers
+        with self.assertNumQueries(0):
+            not_modified = self.client.get('/api/offers/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertNotEqual(self.client.get('/api/offers/?price_max=10')['ETag'], response['ETag'])
+
+        create_offer(self.business, 1)
+        response = self.client.get('/api/offers/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual((response.status_code, response.data['count']), (200, 2))
+
+        etag = response['ETag']
+        self.business.first_name = 'Anna'
+        self.business.save()
+        response = self.client.get('/api/offers/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/api/offers/', headers={'If-None-Match': response['ETag']}).status_code, 304)
+
+    @override_settings(RESPONSE_CACHE={'ENABLED': False})
+    def test_list_without_response_cache(self):
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+    def test_unknown_offer(self):
+        self.assertEqual(self.client.get('/api/offers/999/', headers={'If-None-Match': '*'}).status_code, 404)
+        self.assertNotIn('ETag', self.client.get('/api/offers/999/'))
+
+    async def test_async_views(self):
+        response = await AsyncClient().get(self.url)
+        not_modified = await AsyncClient().get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        response = await AsyncClient().get('/api/offers/')
+        not_modified = await AsyncClient().get('/api/offers/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        response = await AsyncClient().get(f'/api/offers/?user={self.business.pk}')
+        not_modified = await AsyncClient().get(f'/api/offers/?user={self.business.pk}', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': False})
+class CompiledOfferListTests(TestCase):
+    """
+    Ensures the compiled offer list produces the same JSON as the DRF serializer.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.async_client = AsyncClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business',
+            first_name='Jürgen',
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass', type='business'
+        )
+        customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        Review.objects.create(business_user=self.business, reviewer=customer, rating=4)
+        offers = [create_offer(self.business, index) for index in range(3)] + [create_offer(self.other, 3)]
+        Offer.objects.filter(pk=offers[0].pk).update(
+            image='offers/logo.jpg', image_renditions={'card': 'offers/renditions/logo_card.webp'}
+        )
+        Offer.objects.filter(pk=offers[1].pk).update(image='offers/original.png', max_price=None)
+
+    def assert_same_response(self, url):
+        response = self.client.get(url)
+        with override_settings(COMPILED_LIST_SERIALIZERS=False):
+            expected = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_list(self):
+        response = self.assert_same_response('/api/offers/')
+        self.assertEqual(response.data['count'], 4)
+        self.assert_same_response('/api/offers/?ordering=-avg_rating&page_size=2')
+        self.assert_same_response('/api/offers/?image_size=full&search=offer')
+        self.assert_same_response('/api/offers/?price_max=100&facets=true')
+
+    def test_keyset_pagination_uses_drf_serializer(self):
+        self.assert_same_response('/api/offers/?pagination=cursor')
+
+    async def test_async_list(self):
+        expected = await sync_to_async(self.client.get)('/api/offers/?ordering=min_price')
+        response = await self.async_client.get('/api/offers/?ordering=min_price')
+        self.assertEqual(response.content, expected.content)
@@ -1,24 +1,96 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from backend.authentication import CachedTokenAuthentication
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
+from backend.async_views import FALLBACK, AsyncReadMixin
+from backend.conditional import Version, conditional_get
+from backend.compiled_serializers import CompiledListMixin
+from backend.db_router import ReplicaReadMixin
+from backend.metrics import SerializerTimingMixin
+from backend.pagination import KeysetPaginationMixin
+from backend.response_cache import CachedVersion, cache_response
 from .models import Offer, OfferDetail
-from .serializers import OfferSerializer, OfferDetailFullSerializer, OfferListSerializer
+from .facets import OfferFacetFilter, afacet_counts, facet_counts
+from .search import OfferSearchFilter
+from .serializers import CompiledOfferListSerializer, OfferSerializer, OfferDetailFullSerializer, OfferListSerializer
 
 
-class OfferViewSet(viewsets.ModelViewSet):
+def offer_list_tags(view, data):
+    """
+    Tags of an offer list: the collection and the creators shown in `user_details`.
+    - Lists sorted by rating also depend on the ratings of businesses not
+      shown yet, a review can move them onto the page (`ratings`).
+    """
+    offers = data['results'] if isinstance(data, dict) else data
+    tags = ['offers', *{f"user:{offer['user']}" for offer in offers}]
+    ordering = view.request.query_params.get('ordering', '')
+    if 'avg_rating' in (field.strip().lstrip('-') for field in ordering.split(',')):
+        tags.append('ratings')
+    return tags
+
+
+def offer_tags(view, data):
+    return [f"offer:{data['id']}", f"user:{data['user']}"]
+
+
+def offer_detail_tags(view, data):
+    return [f"offerdetail:{data['id']}"]
+
+
+def offer_list_version(view, request):
+    """
+    Version of an offer list: the time its cached response was computed, see `CachedVersion`.
+    - Invalidated with the `offers` tag and the tags of the creators shown,
+      so a 304 needs no query over the matching offers.
+    """
+    return CachedVersion(request)
+
+
+def filters_query_database(request):
+    """
+    Whether the list filters of a request query the database while filtering:
+    full-text searches and `?user=`.
+    """
+    params = request.query_params
+    return bool(params.get('search', '').strip() or params.get('user'))
+
+
+def offer_version(view, request):
+    return Version(Offer.objects.filter(pk=view.kwargs['pk']), 'updated_at', 'user__updated_at')
+
+
+def offer_detail_version(view, request):
+    return Version(OfferDetail.objects.filter(pk=view.kwargs['pk']), 'offer__updated_at')
+
+
+class OfferViewSet(SerializerTimingMixin, ReplicaReadMixin, CompiledListMixin, AsyncReadMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for offers.
+    - Page number pagination by default, keyset pagination on (created_at, id)
+      with `?pagination=cursor`.
+    - `?search=` runs a ranked full-text search, see `offers.search`.
+    - `?price_min=`, `?price_max=` and `?delivery_max=` filter on the facet
+      columns, see `offers.facets`.
+    - `?ordering=-avg_rating` sorts by the stored average rating of the creator.
+    - List and retrieve responses are cached, see `backend.response_cache`.
+    - List and retrieve answer conditional GETs with 304, see `backend.conditional`.
+    - List and retrieve run natively async under ASGI, see `backend.async_views`.
+    - Lists are built from values_list() rows, see `backend.compiled_serializers`.
+    """
     queryset = Offer.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['user', 'details__price']
-    search_fields = ['title', 'description']
-    ordering_fields = ['min_price', 'min_delivery_time']
+    filter_backends = [DjangoFilterBackend, OfferFacetFilter, OfferSearchFilter, OrderingFilter]
+    filterset_fields = ['user']
+    ordering_fields = ['min_price', 'max_price', 'min_delivery_time', 'max_delivery_time', 'avg_rating']
     pagination_class = PageNumberPagination
+    keyset_ordering_field = 'created_at'
+    compiled_serializer_class = CompiledOfferListSerializer
 
     def get_serializer_class(self):
         """
@@ -53,9 +125,13 @@ class OfferViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Customizes the queryset for filtering offers based on query parameters.
+        - Uses the listing queryset for list() and the detail queryset otherwise.
         - Filters offers based on creator, minimum price, and maximum delivery time.
         """
-        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = Offer.objects.for_listing()
+        else:
+            queryset = Offer.objects.for_detail()
         params = self.request.query_params
 
         creator_id = params.get('creator_id')
@@ -79,19 +155,72 @@ class OfferViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @conditional_get(offer_list_version, weak=True)
+    @cache_response(offer_list_tags)
+    def list(self, request, *args, **kwargs):
+        """
+        Lists offers.
+        - `?facets=true` adds the price and delivery time histograms of all
+          matching offers next to the results.
+        """
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get('facets') in ('1', 'true') and isinstance(response.data, dict):
+            response.data['facets'] = facet_counts(self.filter_queryset(self.get_queryset()))
+        return response
+
+    @conditional_get(offer_list_version, weak=True)
+    @cache_response(offer_list_tags)
+    async def alist(self, request, *args, **kwargs):
+        """
+        Async `list()` for ASGI.
+        - Full-text searches and `?user=` run through the sync action, their
+          filters query the database while filtering.
+        """
+        if filters_query_database(request):
+            return FALLBACK
+        response = await super().alist(request, *args, **kwargs)
+        if response is not FALLBACK and request.query_params.get('facets') in ('1', 'true') and isinstance(response.data, dict):
+            response.data['facets'] = await afacet_counts(self.filter_queryset(self.get_queryset()))
+        return response
+
+    @conditional_get(offer_version)
+    @cache_response(offer_tags)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @conditional_get(offer_version)
+    @cache_response(offer_tags)
+    async def aretrieve(self, request, *args, **kwargs):
+        return await super().aretrieve(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         """
         Overrides the default create method to validate and create a new offer.
         - Handles request data validation and returns appropriate error messages if invalid.
         """
-        print("Request Data:", request.data)
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            print("Validation Errors:", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch_create(self, request):
+        """
+        POST /offers/batch/ - Creates many offers in one request, e.g. for catalog imports.
+        - Only business users can create offers.
+        - All offers are created in a single transaction, or none at all.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        self.perform_create(serializer)
+
+        # Re-read with the detail annotations, answered in the order of the input
+        offers = Offer.objects.for_detail().in_bulk([offer.pk for offer in serializer.instance])
+        offers = [offers[offer.pk] for offer in serializer.instance]
+        return Response(self.get_serializer(offers, many=True).data, status=status.HTTP_201_CREATED)
+
     def partial_update(self, request, *args, **kwargs):
         """
         Overrides the default partial update behavior.
@@ -109,7 +238,7 @@ class OfferViewSet(viewsets.ModelViewSet):
         """
         Overrides the default destroy method.
         - Ensures that only the offer creator can delete the offer.
-        - Deletes associated offer details before deleting the offer itself.
+        - Associated offer details are deleted by the cascade.
         """
         instance = self.get_object()
         if instance.user != request.user:  # Ensures that only the creator can delete
@@ -117,20 +246,21 @@ class OfferViewSet(viewsets.ModelViewSet):
                 {"detail": "Only the creator can delete this offer."},
                 status=status.HTTP_403_FORBIDDEN
             )
-        instance.details.all().delete()  # Delete all offer details
-        instance.delete()  # Delete the offer itself
+        instance.delete()
         return Response({}, status=status.HTTP_204_NO_CONTENT)
 
-class OfferDetailViewSet(viewsets.ReadOnlyModelViewSet):
+class OfferDetailViewSet(SerializerTimingMixin, ReplicaReadMixin, AsyncReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailFullSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = []  # No authentication required for OfferDetail view
 
+    @conditional_get(offer_detail_version)
+    @cache_response(offer_detail_tags)
     def retrieve(self, request, *args, **kwargs):
-        """
-        Retrieves a specific offer detail by ID.
-        - This method is intended for reading offer details.
-        """
-        print("Offer ID:", kwargs.get('pk'))
         return super().retrieve(request, *args, **kwargs)
+
+    @conditional_get(offer_detail_version)
+    @cache_response(offer_detail_tags)
+    async def aretrieve(self, request, *args, **kwargs):
+        return await super().aretrieve(request, *args, **kwargs)
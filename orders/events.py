@@ -0,0 +1,52 @@
+from django.db.models import Q
+from backend.events import Event, publish
+from .models import Order, OrderChange
+from .serializers import OrderSerializer
+
+# Server-sent event names of the pushed changes; deletions are only synced (see `orders.sync`)
+EVENT_NAMES = {
+    OrderChange.CREATED: 'order_created',
+    OrderChange.STATUS: 'order_status_changed',
+}
+
+# Missed events replayed on reconnect; clients further behind get a `resync` event
+REPLAY_LIMIT = 500
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def order_event(change, order):
+    """
+    Returns the event of a change, carrying the order like the order list; its ID is the change sequence.
+    """
+    return Event(EVENT_NAMES[change.kind], OrderSerializer(order).data, change.pk)
+
+
+def publish_order_changes(changes, orders):
+    """
+    Pushes new orders and status changes to their customer and business user.
+    """
+    for change, order in zip(changes, orders):
+        if change.kind in EVENT_NAMES:
+            publish(
+                {user_channel(change.customer_user_id), user_channel(change.business_user_id)},
+                order_event(change, order),
+            )
+
+
+async def missed_events(user_id, last_event_id):
+    """
+    Returns the events of a user after `last_event_id`, read from the change log.
+    - The orders are loaded in their current state, so a replayed
+      `order_created` may already show a later status.
+    """
+    changes = OrderChange.objects.filter(
+        Q(customer_user_id=user_id) | Q(business_user_id=user_id), pk__gt=last_event_id, kind__in=EVENT_NAMES,
+    ).order_by('pk')
+    changes = [change async for change in changes[:REPLAY_LIMIT + 1]]
+    if len(changes) > REPLAY_LIMIT:
+        return [Event('resync', {'since': last_event_id})]
+    orders = await Order.objects.ain_bulk({change.order_id for change in changes})
+    return [order_event(change, orders[change.order_id]) for change in changes if change.order_id in orders]
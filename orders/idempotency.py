@@ -0,0 +1,96 @@
+import functools
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def get_key_ttl():
+    """
+    Returns how long a key is replayed, in seconds (`ORDER_IDEMPOTENCY_KEY_TTL`).
+    """
+    return getattr(settings, 'ORDER_IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+
+
+def request_fingerprint(request):
+    """
+    Hash of the method, path and body of a request, so a key can't be reused for another request.
+    """
+    raw = json.dumps([request.method, request.path, request.data], sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def claim_key(user, key, fingerprint):
+    """
+    Inserts the key of a request, returns the existing row if it was already used.
+    - Runs in a savepoint; a concurrent request with the same key blocks on
+      the unique constraint until the first one commits or rolls back.
+    - Expired keys are taken over by the new request.
+    """
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint), None
+    except IntegrityError:
+        pass
+    existing = IdempotencyKey.objects.get(user=user, key=key)
+    if existing.created_at < timezone.now() - timedelta(seconds=get_key_ttl()):
+        existing.fingerprint, existing.created_at = fingerprint, timezone.now()
+        existing.status_code = existing.response = None
+        existing.save()
+        return existing, None
+    return None, existing
+
+
+def replay(existing, fingerprint):
+    if existing.fingerprint != fingerprint:
+        return Response(
+            {"detail": f"The {HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(existing.response, status=existing.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(method):
+    """
+    Runs a create action in one transaction and dedupes retries by `Idempotency-Key`.
+    - Without the header the request just runs atomically.
+    - With the header the key is stored together with the response in the
+      same transaction, so a retried request never inserts twice; it gets the
+      stored response with an `Idempotent-Replayed` header instead.
+    - Failed requests roll back their key and can be retried with it.
+    - Keys are scoped to the authenticated user.
+    """
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            with transaction.atomic():
+                return method(view, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({"detail": f"The {HEADER} header must have 1 to {MAX_KEY_LENGTH} characters."})
+
+        fingerprint = request_fingerprint(request)
+        with transaction.atomic():
+            record, existing = claim_key(request.user, key, fingerprint)
+            if existing is not None:
+                return replay(existing, fingerprint)
+            response = method(view, request, *args, **kwargs)
+            if not status.is_success(response.status_code):
+                transaction.set_rollback(True)
+                return response
+            record.status_code, record.response = response.status_code, response.data
+            record.save(update_fields=['status_code', 'response'])
+            return response
+    return wrapper
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def log_existing_orders(apps, schema_editor):
+    """
+    Logs every existing order as created, so a full sync from 0 returns them.
+    """
+    Order = apps.get_model('orders', 'Order')
+    OrderChange = apps.get_model('orders', 'OrderChange')
+    orders = Order.objects.order_by('created_at', 'pk').values_list(
+        'pk', 'customer_user_id', 'business_user_id', 'created_at'
+    )
+    batch = []
+    for order_id, customer_user_id, business_user_id, created_at in orders.iterator(chunk_size=2000):
+        batch.append(OrderChange(
+            order_id=order_id, customer_user_id=customer_user_id, business_user_id=business_user_id,
+            kind='created', created_at=created_at,
+        ))
+        if len(batch) >= 2000:
+            OrderChange.objects.bulk_create(batch)
+            batch = []
+    OrderChange.objects.bulk_create(batch)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_id', models.BigIntegerField()),
+                ('customer_user_id', models.BigIntegerField()),
+                ('business_user_id', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('created', 'Created'), ('status', 'Status changed'), ('deleted', 'Deleted')], max_length=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['customer_user_id', 'id'], name='order_change_customer_idx'), models.Index(fields=['business_user_id', 'id'], name='order_change_business_idx')],
+            },
+        ),
+        migrations.RunPython(log_existing_orders, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from offers.models import OfferDetail
 
@@ -24,5 +26,70 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='order_created_id_idx'),
+            # Order counts per business user and status
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            # Order lists of a customer / business user, newest first
+            models.Index(fields=['customer_user', '-created_at'], name='order_customer_created_idx'),
+            models.Index(fields=['business_user', '-created_at'], name='order_business_created_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.id} - {self.title}"
+
+
+class OrderChange(models.Model):
+    """
+    Change log of the orders, read by the delta sync (see `orders.sync`).
+    - The primary key is the change sequence clients sync from.
+    - Rows of deleted orders stay as tombstones, so order and user IDs are
+      plain columns instead of foreign keys.
+    """
+    CREATED = 'created'
+    STATUS = 'status'
+    DELETED = 'deleted'
+    KIND_CHOICES = [
+        (CREATED, 'Created'),
+        (STATUS, 'Status changed'),
+        (DELETED, 'Deleted'),
+    ]
+
+    order_id = models.BigIntegerField()
+    customer_user_id = models.BigIntegerField()
+    business_user_id = models.BigIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Changes of a customer / business user after a sequence number
+            models.Index(fields=['customer_user_id', 'id'], name='order_change_customer_idx'),
+            models.Index(fields=['business_user_id', 'id'], name='order_change_business_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.pk}: order {self.order_id} {self.kind}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Response of an order request sent with an `Idempotency-Key` header,
+    replayed when the client retries the request with the same key.
+    """
+    user = models.ForeignKey(User, related_name='idempotency_keys', on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_user_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
@@ -1,7 +1,97 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import Order
+from .models import Order, OrderChange
+from .sync import record_changes
+from accounts.stats import ORDER_STATUS_FIELDS, adjust_stats
+from backend.compiled_serializers import CompiledSerializer
 from offers.models import OfferDetail
 
+MAX_ORDER_BATCH_SIZE = 50
+
+# OfferDetail fields copied into an order when it is placed
+SNAPSHOT_FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type')
+
+
+def order_values(offer_detail, customer_user):
+    """
+    Returns the values of a new order for an OfferDetail loaded with its offer.
+    """
+    values = {field: getattr(offer_detail, field) for field in SNAPSHOT_FIELDS}
+    values.update(
+        offer_detail=offer_detail,
+        customer_user=customer_user,
+        business_user_id=offer_detail.offer.user_id,
+    )
+    return values
+
+
+class OfferDetailField(serializers.PrimaryKeyRelatedField):
+    """
+    OfferDetail an order is placed for.
+    - Loads the detail and its offer (holding the business user ID) with one joined query.
+    - Locks the detail inside a transaction, so the copied snapshot can't
+      change before the order is committed.
+    - Takes details prefetched by `OrderListSerializer` from the context.
+    """
+
+    def get_queryset(self):
+        queryset = OfferDetail.objects.select_related('offer').only(*SNAPSHOT_FIELDS, 'offer__user')
+        if transaction.get_connection().in_atomic_block:
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get('offer_details')
+        if prefetched is not None:
+            try:
+                return prefetched[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class OrderListSerializer(serializers.ListSerializer):
+    """
+    List serializer for placing many orders in one request, e.g. a cart.
+    - Loads all offer details with one query and inserts all orders with one query.
+    - Bulk inserts skip model signals, so the business statistics and the
+      change log (see `orders.sync`) are updated here.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', MAX_ORDER_BATCH_SIZE)
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            ids = set()
+            for item in data:
+                try:
+                    ids.add(int(item['offer_detail_id']))
+                except (KeyError, TypeError, ValueError):
+                    pass
+            field = self.child.fields['offer_detail_id']
+            self.context['offer_details'] = field.get_queryset().in_bulk(ids)
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        customer_user = self.context['request'].user
+        orders = Order.objects.bulk_create([
+            Order(**order_values(item['offer_detail_id'], customer_user)) for item in validated_data
+        ])
+        record_changes(orders, OrderChange.CREATED)
+
+        order_counts = {}
+        for order in orders:
+            field = ORDER_STATUS_FIELDS[order.status]
+            counts = order_counts.setdefault(order.business_user_id, {})
+            counts[field] = counts.get(field, 0) + 1
+        for user_id, counts in order_counts.items():
+            adjust_stats(user_id, counts)
+        return orders
+
+
 class OrderSerializer(serializers.ModelSerializer):
     """
     Serializer for managing orders.
@@ -9,7 +99,7 @@ class OrderSerializer(serializers.ModelSerializer):
     - Ensures that most fields are read-only by default to preserve offer data integrity.
     """
 
-    offer_detail_id = serializers.PrimaryKeyRelatedField(queryset=OfferDetail.objects.all())  # User only provides the ID of the OfferDetail
+    offer_detail_id = OfferDetailField()  # User only provides the ID of the OfferDetail
     customer_user = serializers.PrimaryKeyRelatedField(read_only=True)  # Automatically set based on the authenticated user
     business_user = serializers.PrimaryKeyRelatedField(read_only=True)  # Automatically set based on the related OfferDetail's creator
 
@@ -28,31 +118,20 @@ class OrderSerializer(serializers.ModelSerializer):
             'delivery_time_in_days', 'price', 'features', 'offer_type',
             'status', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'customer_user', 'business_user', 'status', 'created_at', 'updated_at']
+        # The status is changed by the business user, see `OrderViewSet.partial_update`
+        read_only_fields = ['id', 'customer_user', 'business_user', 'created_at', 'updated_at']
+        list_serializer_class = OrderListSerializer
 
     def create(self, validated_data):
         """
         Creates a new order based on the selected OfferDetail.
         - Automatically fills in all related offer attributes into the order.
+        - The business user is taken from the already loaded offer, without fetching the user.
+        - New orders always start in progress.
         """
-        offer_detail = validated_data.pop('offer_detail_id')  
-        print("OfferDetail:", offer_detail)  
-
-        customer_user = self.context['request'].user
-        business_user = offer_detail.offer.user
-
-        validated_data.update({
-            'customer_user': customer_user,
-            'business_user': business_user,
-            'title': offer_detail.title,
-            'revisions': offer_detail.revisions,
-            'delivery_time_in_days': offer_detail.delivery_time_in_days,
-            'price': offer_detail.price,
-            'features': offer_detail.features,
-            'offer_type': offer_detail.offer_type,
-        })
-
-        validated_data['offer_detail_id'] = offer_detail.id
+        validated_data.pop('status', None)
+        offer_detail = validated_data.pop('offer_detail_id')
+        validated_data.update(order_values(offer_detail, self.context['request'].user))
         return super().create(validated_data)
 
     def to_representation(self, instance):
@@ -64,3 +143,38 @@ class OrderSerializer(serializers.ModelSerializer):
         representation['features'] = representation.get('features') or []
         representation['status'] = representation.get('status') or 'in_progress'  # Default status
         return representation
+
+
+class CompiledOrderSerializer(CompiledSerializer):
+    """
+    Compiled `OrderSerializer` for the order lists.
+    """
+    serializer_class = OrderSerializer
+    columns = (
+        'id', 'customer_user', 'business_user', 'offer_detail_id', 'title', 'revisions',
+        'delivery_time_in_days', 'price', 'features', 'offer_type', 'status', 'created_at', 'updated_at',
+    )
+
+    def compile(self, related):
+        price = self.converter('price')
+        created_at, updated_at = self.converter('created_at'), self.converter('updated_at')
+
+        def build(row):
+            order_id, customer_user, business_user, offer_detail_id, title, revisions, \
+                delivery_time_in_days, value, features, offer_type, status, created, updated = row
+            return {
+                'id': order_id,
+                'customer_user': customer_user,
+                'business_user': business_user,
+                'offer_detail_id': offer_detail_id,
+                'title': title,
+                'revisions': revisions,
+                'delivery_time_in_days': delivery_time_in_days,
+                'price': None if value is None else price(value),
+                'features': features or [],
+                'offer_type': offer_type,
+                'status': status or 'in_progress',
+                'created_at': created_at(created),
+                'updated_at': updated_at(updated),
+            }
+        return build
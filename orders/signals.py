@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from .events import publish_order_changes
+from .models import Order, OrderChange
+from .sync import changes_committed, record_changes
+
+
+@receiver(post_init, sender=Order, dispatch_uid='sync_order_init')
+def remember_status(sender, instance, **kwargs):
+    """
+    Stores the loaded status so saves can tell whether it changed.
+    """
+    instance._synced_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Order, dispatch_uid='sync_order_saved')
+def record_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Logs new orders and status changes for the delta sync.
+    """
+    if raw:
+        return
+    if created:
+        kind = OrderChange.CREATED
+    elif instance.status != instance._synced_status:
+        kind = OrderChange.STATUS
+    else:
+        return
+    record_changes([instance], kind)
+    instance._synced_status = instance.status
+
+
+@receiver(post_delete, sender=Order, dispatch_uid='sync_order_deleted')
+def record_delete(sender, instance, **kwargs):
+    """
+    Leaves a tombstone of deleted orders, including cascading deletes.
+    """
+    record_changes([instance], OrderChange.DELETED)
+
+
+@receiver(changes_committed, sender=OrderChange, dispatch_uid='events_changes_committed')
+def push_changes(sender, changes, orders, **kwargs):
+    publish_order_changes(changes, orders)
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from django.db import connections, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import OrderChange
+
+# Changes returned per sync request by default and at most
+DEFAULT_SYNC_LIMIT = 100
+MAX_SYNC_LIMIT = 1000
+
+# On PostgreSQL, changes younger than this aren't synced yet: a transaction
+# still in flight may commit a lower sequence number later
+IN_FLIGHT_WINDOW = timedelta(seconds=5)
+
+# Sent once recorded changes are committed, with the `changes` and their `orders`
+changes_committed = Signal()
+
+
+def order_change(order, kind):
+    return OrderChange(
+        order_id=order.pk, customer_user_id=order.customer_user_id,
+        business_user_id=order.business_user_id, kind=kind,
+    )
+
+
+def record_changes(orders, kind):
+    """
+    Appends a change of `kind` for each order to the change log.
+    - Sends `changes_committed` after the commit, e.g. to push the changes
+      to connected clients (see `orders.events`).
+    """
+    changes = OrderChange.objects.bulk_create([order_change(order, kind) for order in orders])
+    transaction.on_commit(
+        lambda: changes_committed.send(sender=OrderChange, changes=changes, orders=orders), robust=True,
+    )
+    return changes
+
+
+def integer_param(params, name, default=None, minimum=0):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: ["A valid integer is required."]})
+    if value < minimum:
+        raise ValidationError({name: [f"Ensure this value is greater than or equal to {minimum}."]})
+    return value
+
+
+def changes_since(user, params):
+    """
+    Reads the changes of the user's orders (as customer or business user)
+    following the `since` sequence number of a sync request.
+    - `?customer_user_id=` and `?business_user_id=` narrow the changes like
+      the order list; the indexes on (user, sequence) keep a poll at
+      O(changes), not O(orders).
+    - Several changes of one order collapse into its last one.
+    - On PostgreSQL sequence numbers are taken before the commit, so a
+      slower transaction can commit a lower one after a later one is
+      visible. Changes younger than `IN_FLIGHT_WINDOW` are held back, and
+      the cursor stops before the first of them so nothing is skipped.
+    - Returns the IDs of the changed and of the deleted orders, the
+      sequence number to sync from next and whether more changes follow.
+    """
+    since = integer_param(params, 'since', default=0)
+    limit = min(integer_param(params, 'limit', default=DEFAULT_SYNC_LIMIT, minimum=1), MAX_SYNC_LIMIT)
+    changes = OrderChange.objects.filter(Q(customer_user_id=user.pk) | Q(business_user_id=user.pk), pk__gt=since)
+    for field in ('customer_user_id', 'business_user_id'):
+        user_id = integer_param(params, field)
+        if user_id is not None:
+            changes = changes.filter(**{field: user_id})
+
+    rows = list(changes.order_by('pk').values_list('pk', 'order_id', 'kind', 'created_at')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if connections[changes.db].vendor == 'postgresql':
+        settled = timezone.now() - IN_FLIGHT_WINDOW
+        for index, (_, _, _, created_at) in enumerate(rows):
+            if created_at > settled:
+                rows, has_more = rows[:index], False
+                break
+    last_kinds = {order_id: kind for _, order_id, kind, _ in rows}
+    changed = sorted(order_id for order_id, kind in last_kinds.items() if kind != OrderChange.DELETED)
+    deleted = sorted(order_id for order_id, kind in last_kinds.items() if kind == OrderChange.DELETED)
+    return changed, deleted, rows[-1][0] if rows else since, has_more
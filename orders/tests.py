@@ -1,3 +1,441 @@
-from django.test import TestCase
+import asyncio
+import json
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone as dt_timezone
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from accounts.models import User
+from offers.models import Offer, OfferDetail
+from .models import IdempotencyKey, Order, OrderChange
+from .views import OrderViewSet
 
-# Create your tests here.
+
+class OrderTestCase(TestCase):
+    """
+    Base class with a business user, a customer and an offer detail to order.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(
+            username='business', email='business@example.com', password='pass', type='business'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', email='customer@example.com', password='pass', type='customer'
+        )
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=['Logo'], offer_type='basic',
+        )
+        self.client.force_authenticate(self.customer)
+
+    def create_order(self, status='in_progress'):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=self.business, offer_detail=self.detail,
+            title="Basic", revisions=1, delivery_time_in_days=5, price=100,
+            features=['Logo'], offer_type='basic', status=status,
+        )
+
+
+class OrderPaginationTests(OrderTestCase):
+    """
+    Ensures the order list supports opt-in keyset pagination.
+    """
+
+    def test_list_without_pagination_returns_array(self):
+        self.create_order()
+        response = self.client.get('/api/orders/')
+        self.assertIsInstance(response.data, list)
+
+    def test_cursor_pagination_walks_all_orders(self):
+        orders = [self.create_order() for _ in range(5)]
+
+        seen = []
+        url = '/api/orders/?pagination=cursor&page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [order['id'] for order in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(seen, [order.id for order in reversed(orders)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/orders/?cursor=invalid')
+        self.assertEqual(response.status_code, 404)
+
+
+class OrderStreamingTests(OrderTestCase):
+    """
+    Ensures the streamed order list matches the regular list.
+    """
+
+    def test_stream_json_matches_list(self):
+        for _ in range(3):
+            self.create_order()
+        expected = self.client.get('/api/orders/').content
+
+        response = self.client.get('/api/orders/', {'stream': 'json'})
+        self.assertEqual(b''.join(response.streaming_content), expected)
+
+    def test_stream_ndjson(self):
+        orders = [self.create_order() for _ in range(3)]
+        response = self.client.get('/api/orders/', {'stream': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [order.id for order in reversed(orders)])
+
+    def test_invalid_stream_format(self):
+        self.assertEqual(self.client.get('/api/orders/', {'stream': 'xml'}).status_code, 400)
+
+    async def test_asgi_stream_is_sent_in_chunks(self):
+        for _ in range(5):
+            await sync_to_async(self.create_order)()
+        token = await sync_to_async(Token.objects.create)(user=self.customer)
+        with patch.object(OrderViewSet, 'stream_chunk_size', 2):
+            response = await AsyncClient().get(
+                '/api/orders/', {'stream': 'ndjson'}, headers={'Authorization': f'Token {token.key}'},
+            )
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [2, 2, 1])
+
+
+class CompiledOrderListTests(OrderTestCase):
+    """
+    Ensures the compiled order lists produce the same JSON as the DRF serializer.
+    """
+
+    def assert_same_response(self, url):
+        response = self.client.get(url)
+        with override_settings(COMPILED_LIST_SERIALIZERS=False):
+            expected = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_lists(self):
+        self.create_order()
+        self.create_order(status='completed')
+        order = self.create_order(status='cancelled')
+        Order.objects.filter(pk=order.pk).update(price='19.5', features=[], title='Größe')
+
+        response = self.assert_same_response('/api/orders/')
+        self.assertEqual(len(response.data), 3)
+        self.assert_same_response('/api/orders/?status=completed&ordering=created_at')
+        self.assert_same_response('/api/orders/?pagination=cursor&page_size=2')
+
+    def test_list_queries(self):
+        for _ in range(3):
+            self.create_order()
+        with self.assertNumQueries(1):
+            self.client.get('/api/orders/')
+
+
+class OrderSyncTests(OrderTestCase):
+    """
+    Ensures the delta sync returns new orders, status changes and deletions since a sequence number.
+    """
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get('/api/orders/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_changes_since(self):
+        first, second = self.create_order(), self.create_order()
+        data = self.sync()
+        self.assertEqual([order['id'] for order in data['changes']], [first.id, second.id])
+        self.assertEqual((data['deleted'], data['has_more']), ([], False))
+
+        since = data['since']
+        self.assertEqual(self.sync(since)['changes'], [])
+        self.assertEqual(self.sync(since)['since'], since)
+
+        second.status = 'completed'
+        second.save()
+        first.title = 'Renamed'
+        first.save()
+        data = self.sync(since)
+        self.assertEqual([(order['id'], order['status']) for order in data['changes']], [(second.id, 'completed')])
+
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='pass', is_staff=True)
+        self.client.force_authenticate(staff)
+        self.client.delete(f'/api/orders/{second.id}/')
+        self.client.force_authenticate(self.customer)
+        data = self.sync(data['since'])
+        self.assertEqual((data['changes'], data['deleted']), ([], [second.id]))
+
+    def test_bulk_orders_and_filters(self):
+        self.client.post('/api/orders/bulk/', [{'offer_detail_id': self.detail.id}] * 2, format='json')
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass')
+        Order.objects.create(
+            customer_user=other, business_user=self.business, offer_detail=self.detail,
+            title="Basic", revisions=1, delivery_time_in_days=5, price=100, features=[], offer_type='basic',
+        )
+        self.assertEqual(len(self.sync()['changes']), 2)
+        self.client.force_authenticate(self.business)
+        self.assertEqual(len(self.sync()['changes']), 3)
+        self.assertEqual(len(self.sync(customer_user_id=self.customer.id)['changes']), 2)
+
+    def test_only_own_orders(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass')
+        self.create_order()
+        self.client.force_authenticate(other)
+        data = self.sync()
+        self.assertEqual((data['changes'], data['since']), ([], 0))
+
+    def test_postgres_holds_back_recent_changes(self):
+        orders = [self.create_order() for _ in range(3)]
+        OrderChange.objects.filter(order_id__in=[orders[0].id, orders[1].id]).update(
+            created_at=datetime.now(dt_timezone.utc) - timedelta(minutes=1),
+        )
+        with patch.object(connection, 'vendor', 'postgresql'):
+            data = self.sync(limit=2)
+            self.assertEqual([order['id'] for order in data['changes']], [orders[0].id, orders[1].id])
+            # The cursor stays before the recent change, which may be followed by a lower one
+            data = self.sync(data['since'])
+            self.assertEqual((data['changes'], data['has_more']), ([], False))
+            OrderChange.objects.filter(order_id=orders[2].id).update(
+                created_at=datetime.now(dt_timezone.utc) - timedelta(minutes=1),
+            )
+            data = self.sync(data['since'])
+            self.assertEqual([order['id'] for order in data['changes']], [orders[2].id])
+
+    def test_limit(self):
+        orders = [self.create_order() for _ in range(3)]
+        data = self.sync(limit=2)
+        self.assertEqual([order['id'] for order in data['changes']], [orders[0].id, orders[1].id])
+        self.assertTrue(data['has_more'])
+        data = self.sync(data['since'], limit=2)
+        self.assertEqual(([order['id'] for order in data['changes']], data['has_more']), ([orders[2].id], False))
+
+    def test_query_count_and_serializers(self):
+        for _ in range(5):
+            self.create_order()
+        # Changes after the sequence number, the changed orders
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/orders/changes/?since=1')
+        with override_settings(COMPILED_LIST_SERIALIZERS=False):
+            expected = self.client.get('/api/orders/changes/?since=1')
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(len(response.data['changes']), 4)
+
+    def test_invalid_params(self):
+        for params in ({'since': 'abc'}, {'since': -1}, {'limit': 0}, {'business_user_id': 'x'}):
+            self.assertEqual(self.client.get('/api/orders/changes/', params).status_code, 400)
+        self.assertEqual(OrderChange.objects.count(), 0)
+
+
+class OrderEventTests(OrderTestCase):
+    """
+    Ensures order changes are pushed as server-sent events and missed ones are replayed.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.business).key
+        self.headers = {'Authorization': f'Token {self.token}'}
+
+    def create_committed_order(self, status='in_progress'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.create_order(status)
+
+    def save_committed(self, order):
+        with self.captureOnCommitCallbacks(execute=True):
+            order.save()
+
+    async def read_events(self, stream, count):
+        events = []
+        while len(events) < count:
+            chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+            fields = dict(line.split(': ', 1) for line in chunk.strip().splitlines() if not line.startswith(':'))
+            if 'event' in fields:
+                events.append((fields['event'], json.loads(fields['data']), fields.get('id')))
+        return events
+
+    async def test_pushes_created_and_status_changed(self):
+        response = await AsyncClient().get('/api/orders/events/', headers=self.headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+
+        order = await sync_to_async(self.create_committed_order)()
+        await sync_to_async(self.create_committed_order)()
+        order.status = 'completed'
+        await sync_to_async(self.save_committed)(order)
+        events = await self.read_events(stream, 3)
+        self.assertEqual([name for name, _, _ in events], ['order_created', 'order_created', 'order_status_changed'])
+        self.assertEqual((events[2][1]['id'], events[2][1]['status']), (order.id, 'completed'))
+        await stream.aclose()
+
+    async def test_replays_missed_events(self):
+        first = await sync_to_async(self.create_order)()
+        second = await sync_to_async(self.create_order)()
+        last_event_id = await OrderChange.objects.filter(order_id=first.id).values_list('pk', flat=True).aget()
+        response = await AsyncClient().get(
+            f'/api/orders/events/?token={self.token}', headers={'Last-Event-ID': str(last_event_id)},
+        )
+        stream = aiter(response.streaming_content)
+        [(name, data, event_id)] = await self.read_events(stream, 1)
+        self.assertEqual((name, data['id'], int(event_id)), ('order_created', second.id, last_event_id + 1))
+        await stream.aclose()
+
+    async def test_requires_authentication(self):
+        self.assertEqual((await AsyncClient().get('/api/orders/events/')).status_code, 401)
+        response = await AsyncClient().get('/api/orders/events/?token=invalid', headers={'Accept': 'text/event-stream'})
+        self.assertEqual(response.status_code, 401)
+
+
+class AsyncOrderCountTests(OrderTestCase):
+    """
+    Ensures the async order count views answer like the sync views.
+    """
+
+    async def test_order_counts(self):
+        await sync_to_async(self.create_order)('in_progress')
+        await sync_to_async(self.create_order)('completed')
+        client = AsyncClient()
+        response = await client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.json(), {'order_count': 1})
+        response = await client.get(f'/api/completed-order-count/{self.business.pk}/')
+        self.assertEqual(response.json(), {'completed_order_count': 1})
+        self.assertEqual((await client.get('/api/order-count/999/')).status_code, 404)
+
+
+class OrderCreateTests(OrderTestCase):
+    """
+    Ensures orders are placed from a snapshot of the offer detail, once per idempotency key.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other_detail = OfferDetail.objects.create(
+            offer=self.offer, title="Premium", revisions=3, delivery_time_in_days=2,
+            price=300, features=['Logo', 'Flyer'], offer_type='premium',
+        )
+
+    def order_count(self):
+        return self.client.get(f'/api/order-count/{self.business.pk}/').json()['order_count']
+
+    def test_create_copies_offer_detail(self):
+        data = {'offer_detail_id': self.detail.pk}
+        response = self.client.post('/api/orders/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['customer_user'], self.customer.pk)
+        self.assertEqual(response.data['business_user'], self.business.pk)
+        self.assertEqual(response.data['price'], '100.00')
+        self.assertEqual(response.data['features'], ['Logo'])
+        self.assertEqual(data, {'offer_detail_id': self.detail.pk})
+
+    def test_create_unknown_offer_detail(self):
+        response = self.client.post('/api/orders/', {'offer_detail_id': 999}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('offer_detail_id', response.data)
+
+    def test_idempotency_key_replays_response(self):
+        headers = {'Idempotency-Key': 'order-1'}
+        first = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        second = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(self.order_count(), 1)
+
+    def test_idempotency_key_is_bound_to_request(self):
+        headers = {'Idempotency-Key': 'order-1'}
+        self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        response = self.client.post(
+            '/api/orders/', {'offer_detail_id': self.other_detail.pk}, format='json', headers=headers
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_idempotency_key_of_failed_request_is_released(self):
+        headers = {'Idempotency-Key': 'order-1'}
+        self.client.post('/api/orders/', {'offer_detail_id': 999}, format='json', headers=headers)
+        response = self.client.post('/api/orders/', {'offer_detail_id': 999}, format='json', headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_idempotency_keys_are_per_user(self):
+        headers = {'Idempotency-Key': 'order-1'}
+        self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', type='customer')
+        self.client.force_authenticate(other)
+        response = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    @override_settings(ORDER_IDEMPOTENCY_KEY_TTL=0)
+    def test_expired_idempotency_key(self):
+        headers = {'Idempotency-Key': 'order-1'}
+        self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        response = self.client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_bulk_create(self):
+        data = [{'offer_detail_id': self.detail.pk}, {'offer_detail_id': self.other_detail.pk}]
+        with self.assertNumQueries(6):
+            # Savepoint, details, insert, change log, statistics, release
+            response = self.client.post('/api/orders/bulk/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([order['title'] for order in response.data], ['Basic', 'Premium'])
+        self.assertTrue(all(order['id'] for order in response.data))
+        self.assertEqual(self.order_count(), 2)
+
+    def test_bulk_create_is_atomic(self):
+        data = [{'offer_detail_id': self.detail.pk}, {'offer_detail_id': 999}]
+        response = self.client.post('/api/orders/bulk/', data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[1]['offer_detail_id'][0].code, 'does_not_exist')
+        self.assertFalse(Order.objects.exists())
+
+    def test_bulk_create_idempotency_key(self):
+        headers = {'Idempotency-Key': 'cart-1'}
+        data = [{'offer_detail_id': self.detail.pk}, {'offer_detail_id': self.other_detail.pk}]
+        self.client.post('/api/orders/bulk/', data, format='json', headers=headers)
+        response = self.client.post('/api/orders/bulk/', data, format='json', headers=headers)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class OrderUpdateTests(OrderTestCase):
+    """
+    Ensures the business user changes the status of an order and the change is logged for clients.
+    """
+
+    def test_business_completes_order(self):
+        order = self.create_order()
+        self.client.force_authenticate(self.business)
+        with patch('orders.events.publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/orders/{order.id}/', {'status': 'completed'}, format='json')
+        self.assertEqual((response.status_code, response.data['status']), (200, 'completed'))
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'completed')
+        change = OrderChange.objects.filter(order_id=order.id).latest('pk')
+        self.assertEqual(change.kind, OrderChange.STATUS)
+        [(channels, event)] = [call.args for call in publish.call_args_list]
+        self.assertEqual((event.name, event.data['status'], int(event.id)), ('order_status_changed', 'completed', change.pk))
+
+    def test_customer_cannot_change_status(self):
+        order = self.create_order()
+        response = self.client.patch(f'/api/orders/{order.id}/', {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'in_progress')
+        self.assertFalse(OrderChange.objects.filter(kind=OrderChange.STATUS).exists())
+
+    def test_create_ignores_status(self):
+        response = self.client.post('/api/orders/', {'offer_detail_id': self.detail.id, 'status': 'completed'}, format='json')
+        self.assertEqual((response.status_code, response.data['status']), (201, 'in_progress'))
@@ -1,25 +1,71 @@
 from django.shortcuts import render, get_object_or_404
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.authentication import TokenAuthentication
+from backend.authentication import CachedTokenAuthentication, QueryTokenAuthentication
 from rest_framework.decorators import action
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from .events import missed_events, user_channel
+from .idempotency import idempotent
 from .models import Order
-from .serializers import OrderSerializer
+from .serializers import CompiledOrderSerializer, OrderSerializer
+from .sync import changes_since
 from accounts.models import User
+from accounts.stats import aget_business_stats, get_business_stats
+from backend.async_views import AsyncReadMixin
+from backend.compiled_serializers import CompiledListMixin, compiled_serializers_enabled
+from backend.db_router import ReplicaReadMixin
+from backend.metrics import SerializerTimingMixin
+from backend.events import event_stream, subscribe
+from backend.renderers import EventStreamRenderer, FastJSONRenderer
+from backend.pagination import KeysetPaginationMixin
+from backend.streaming import StreamingListMixin
 
-class OrderViewSet(viewsets.ModelViewSet):
+
+def business_stats_or_404(business_user_id):
+    """
+    Returns the statistics row of a business user or raises Http404.
+    """
+    stats = get_business_stats(business_user_id)
+    if stats is None:
+        raise Http404("No User matches the given query.")
+    return stats
+
+
+async def abusiness_stats_or_404(business_user_id):
+    """
+    Async `business_stats_or_404()`.
+    """
+    stats = await aget_business_stats(business_user_id)
+    if stats is None:
+        raise Http404("No User matches the given query.")
+    return stats
+
+
+class OrderViewSet(SerializerTimingMixin, ReplicaReadMixin, CompiledListMixin, StreamingListMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for orders.
+    - Returns a plain array by default, keyset pagination on (created_at, id)
+      with `?pagination=cursor`.
+    - Streams the list with `?stream=json` or `?stream=ndjson`.
+    - Lists are built from values_list() rows, see `backend.compiled_serializers`.
+    - `changes/` returns the orders changed since a previous sync, see `orders.sync`.
+    """
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
-    authentication_classes = [TokenAuthentication]  # TokenAuthentication verwenden
+    authentication_classes = [CachedTokenAuthentication]  # TokenAuthentication verwenden
     permission_classes = [IsAuthenticated]  # Authentifizierung erforderlich
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['customer_user', 'business_user', 'status']
     search_fields = ['title']
     ordering_fields = ['created_at', 'updated_at']
+    pagination_class = None
+    keyset_ordering_field = 'created_at'
+    compiled_serializer_class = CompiledOrderSerializer
+    replica_actions = ('list', 'retrieve', 'order_count', 'completed_order_count', 'changes')
 
     def get_queryset(self):
         """
@@ -41,28 +87,46 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         """
         Creates a new order.
+        - Runs in one transaction, retries with the same `Idempotency-Key` header
+          get the original response instead of a second order.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    @idempotent
+    def bulk_create(self, request):
+        """
+        POST /orders/bulk/ - Places many orders in one request, e.g. a cart.
+        - Expects a list of {"offer_detail_id": ...} objects.
+        - All orders are placed in a single transaction, or none at all.
+        - Supports the `Idempotency-Key` header like single orders.
         """
-        data = request.data
-        data['customer_user'] = request.user.id 
-        serializer = self.get_serializer(data=data)
+        serializer = self.get_serializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def partial_update(self, request, *args, **kwargs):
+        """
+        Updates an order.
+        - Only the business user (or staff) can change the status, e.g. to
+          "completed"; the change is pushed to clients, see `orders.events`.
+        """
         instance = self.get_object()
-        print(f"Aktuelle Anfrage von Benutzer ID {request.user.id}")
-        order = Order.objects.get(id=6)
-        print(f"customer_user: {order.customer_user.id}, business_user: {order.business_user.id}")
-
         if instance.customer_user != request.user and instance.business_user != request.user and not request.user.is_staff:
-            print("Permission denied: User is not the customer, business user, or an admin.")
             return Response({"detail": "You do not have permission to edit this order."}, status=status.HTTP_403_FORBIDDEN)
-    
-        print(f"Updating order {instance.id} to status {request.data.get('status')}")
+        if 'status' in request.data and instance.business_user != request.user and not request.user.is_staff:
+            return Response(
+                {"detail": "Only the business user can change the status of this order."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
         return super().partial_update(request, *args, **kwargs)
 
 
@@ -79,29 +143,57 @@ class OrderViewSet(viewsets.ModelViewSet):
         """
         Returns the number of ongoing orders (status: in_progress) for a business user.
         """
-        business_user = get_object_or_404(User, pk=business_user_id)
-        order_count = Order.objects.filter(business_user=business_user, status='in_progress').count()
-        return Response({"order_count": order_count})
+        stats = business_stats_or_404(business_user_id)
+        return Response({"order_count": stats.in_progress_order_count})
 
     @action(detail=False, methods=['get'], url_path='completed-order-count/(?P<business_user_id>[^/.]+)')
     def completed_order_count(self, request, business_user_id=None):
         """
         Returns the number of completed orders (status: completed) for a business user.
         """
-        business_user = get_object_or_404(User, pk=business_user_id)
-        completed_order_count = Order.objects.filter(business_user=business_user, status='completed').count()
-        return Response({"completed_order_count": completed_order_count})
+        stats = business_stats_or_404(business_user_id)
+        return Response({"completed_order_count": stats.completed_order_count})
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """
+        GET /orders/changes/?since=<sequence> - Orders of the user created or with a new status since a previous sync.
+        - Only orders the user is the customer or business user of.
+        - Deleted orders are returned as IDs in `deleted`.
+        - `since` is the `since` of the previous response, 0 or missing for a full sync.
+        - At most `?limit=` changes per response (default 100, max 1000);
+          `has_more` asks the client to sync again right away.
+        """
+        changed, deleted, since, has_more = changes_since(request.user, request.query_params)
+        orders = Order.objects.filter(pk__in=changed).order_by('pk')
+        if compiled_serializers_enabled():
+            data = CompiledOrderSerializer(context=self.get_serializer_context()).data(orders)
+        else:
+            data = self.get_serializer(orders, many=True).data
+        return Response({'since': since, 'has_more': has_more, 'changes': data, 'deleted': deleted})
 
     def list(self, request, *args, **kwargs):
         """
         Overrides the default list method to ensure the response is always an array.
+        - Unless keyset pagination was requested with `?pagination=cursor`.
+        - Streams the orders with `?stream=json|ndjson`.
         """
         queryset = self.filter_queryset(self.get_queryset())
+        stream_format = self.get_stream_format()
+        if stream_format:
+            return self.streaming_response(queryset, stream_format)
+        response = self.compiled_list(queryset)
+        if response is not None:
+            return response
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
 class CustomerOrdersView(APIView):
-    authentication_classes = [TokenAuthentication]  
+    authentication_classes = [CachedTokenAuthentication]  
     permission_classes = [IsAuthenticated]
     """
     Returns all orders placed by the currently authenticated customer.
@@ -114,25 +206,69 @@ class CustomerOrdersView(APIView):
         return Response({"orders": serializer.data})
 
 
-class OrderCountView(APIView):
-    authentication_classes = [TokenAuthentication]  
+class OrderCountView(ReplicaReadMixin, AsyncReadMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication]  
     permission_classes = [AllowAny]
     """
     Returns the number of active orders (status: in_progress) for a given business user.
     """
     def get(self, request, business_user_id):
-        business_user = get_object_or_404(User, pk=business_user_id)
-        order_count = Order.objects.filter(business_user=business_user, status='in_progress').count()
-        return Response({"order_count": order_count})
+        stats = business_stats_or_404(business_user_id)
+        return Response({"order_count": stats.in_progress_order_count})
 
+    async def aget(self, request, business_user_id):
+        stats = await abusiness_stats_or_404(business_user_id)
+        return Response({"order_count": stats.in_progress_order_count})
 
-class CompletedOrderCountView(APIView):
-    authentication_classes = [TokenAuthentication] 
+
+class CompletedOrderCountView(ReplicaReadMixin, AsyncReadMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication] 
     permission_classes = [AllowAny]
     """
     #Returns the number of completed orders (status: completed) for a given business user.
     """
     def get(self, request, business_user_id):
-        business_user = get_object_or_404(User, pk=business_user_id)
-        completed_order_count = Order.objects.filter(business_user=business_user, status='completed').count()
-        return Response({"completed_order_count": completed_order_count})
+        stats = business_stats_or_404(business_user_id)
+        return Response({"completed_order_count": stats.completed_order_count})
+
+    async def aget(self, request, business_user_id):
+        stats = await abusiness_stats_or_404(business_user_id)
+        return Response({"completed_order_count": stats.completed_order_count})
+
+
+class OrderEventsView(AsyncReadMixin, APIView):
+    """
+    API endpoint pushing the order changes of the authenticated user as server-sent events.
+    - ASGI only, see `backend.urls_async`.
+    - Sends `order_created` and `order_status_changed` events with the order
+      as data; event IDs are the sequence numbers of `orders/changes/`.
+    - Reconnecting clients send `Last-Event-ID` and get the events they
+      missed, or a `resync` event asking them to use `orders/changes/`.
+    - Slow clients are disconnected instead of buffering, see `backend.events`.
+    - EventSource can't send headers, so the token may be passed as `?token=`.
+    """
+    authentication_classes = [QueryTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+
+    async def aget(self, request):
+        """
+        GET /orders/events/ - Opens the event stream.
+        """
+        user_id = request.user.pk
+        # Subscribe first, so no event is lost between the replay and the stream
+        subscription = subscribe([user_channel(user_id)])
+        try:
+            last_event_id = int(request.headers.get('Last-Event-ID', ''))
+        except ValueError:
+            last_event_id = None
+        try:
+            events = [] if last_event_id is None else await missed_events(user_id, last_event_id)
+        except BaseException:
+            subscription.close()
+            raise
+        response = StreamingHttpResponse(event_stream(subscription, events), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Disables response buffering in nginx
+        response['X-Accel-Buffering'] = 'no'
+        return response